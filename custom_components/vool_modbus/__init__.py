@@ -4,15 +4,46 @@ from __future__ import annotations
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
-
-from .const import DOMAIN
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from .allocator import VoolCurrentAllocator
+from .capabilities import VoolCapabilityStore
+from .const import (
+    CONF_ALLOCATOR_WEIGHT,
+    CONF_ENERGY_STATISTICS,
+    CONF_LB_MAIN_FUSE,
+    CONF_LB_METER_ENTITIES,
+    CONF_PROXY_HOST,
+    CONF_PROXY_PORT,
+    CONF_SURPLUS_GRID_POWER,
+    DATA_ALLOCATOR,
+    DATA_SITE,
+    DEFAULT_ALLOCATOR_WEIGHT,
+    DEFAULT_LB_MAIN_FUSE,
+    DEFAULT_PROXY_HOST,
+    DEVICE_TYPE_CHARGER,
+    DOMAIN,
+)
 from .coordinator import VoolModbusCoordinator
+from .energy_statistics import VoolEnergyStatistics
+from .load_balancer import VoolLoadBalancer
+from .metrics import VoolMetricsView
+from .proxy import VoolModbusProxy
+from .schedule import VoolScheduleExecutor, async_remove_schedules
+from .services import async_setup_services
+from .session import VoolSessionTracker
+from .site import VoolSiteAggregator
+from .surplus import VoolSurplusController
+from .websocket_api import async_setup_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 PLATFORMS: list[Platform] = [
     Platform.SENSOR,
     Platform.BINARY_SENSOR,
@@ -23,6 +54,21 @@ PLATFORMS: list[Platform] = [
 ]
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the parts of VOOL Modbus shared by all config entries."""
+    allocator = VoolCurrentAllocator(hass)
+    await allocator.async_load()
+    hass.data[DATA_ALLOCATOR] = allocator
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, allocator.async_shutdown)
+    site = VoolSiteAggregator(hass)
+    hass.data[DATA_SITE] = site
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, site.async_shutdown)
+    async_setup_websocket_api(hass)
+    async_setup_services(hass)
+    hass.http.register_view(VoolMetricsView(hass))
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up VOOL Modbus from a config entry."""
     coordinator = VoolModbusCoordinator(hass, entry)
@@ -36,8 +82,65 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
+    meter_entities = entry.options.get(CONF_LB_METER_ENTITIES)
+    if not meter_entities and (grid_power := entry.options.get(CONF_SURPLUS_GRID_POWER)):
+        # Created before the platforms so the solar mode switch can find it
+        coordinator.surplus = VoolSurplusController(hass, coordinator, grid_power)
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if coordinator.aligned:
+        if coordinator.device_type == DEVICE_TYPE_CHARGER:
+            site: VoolSiteAggregator = hass.data[DATA_SITE]
+            entry.async_on_unload(site.async_add_coordinator(coordinator))
+        entry.async_on_unload(coordinator.async_start_aligned_polling())
+
+    if coordinator.device_type == DEVICE_TYPE_CHARGER:
+        # Load balancing and solar charging own 501/502, schedules only start and stop charging.
+        # The site allocator leaves out the chargers whose schedule sets them instead.
+        coordinator.scheduler = VoolScheduleExecutor(
+            hass, coordinator, command_only=bool(meter_entities) or coordinator.surplus is not None
+        )
+        await coordinator.scheduler.async_start()
+        entry.async_on_unload(coordinator.scheduler.async_stop)
+
+    if meter_entities:
+        balancer = VoolLoadBalancer(
+            hass,
+            coordinator,
+            meter_entities,
+            float(entry.options.get(CONF_LB_MAIN_FUSE, DEFAULT_LB_MAIN_FUSE)),
+        )
+        balancer.async_start()
+        entry.async_on_unload(balancer.async_stop)
+    elif coordinator.surplus is not None:
+        coordinator.surplus.async_start()
+        entry.async_on_unload(coordinator.surplus.async_stop)
+    elif (
+        coordinator.device_type == DEVICE_TYPE_CHARGER
+        and (weight := float(entry.options.get(CONF_ALLOCATOR_WEIGHT, DEFAULT_ALLOCATOR_WEIGHT))) > 0
+    ):
+        # Chargers without their own load balancer share the site budget
+        allocator: VoolCurrentAllocator = hass.data[DATA_ALLOCATOR]
+        entry.async_on_unload(allocator.async_add_coordinator(coordinator, weight))
+
+    if entry.options.get(CONF_ENERGY_STATISTICS):
+        if "recorder" in hass.config.components:
+            energy_statistics = VoolEnergyStatistics(hass, coordinator)
+            await energy_statistics.async_start()
+            entry.async_on_unload(energy_statistics.async_stop)
+        else:
+            _LOGGER.warning("Energy statistics import needs the recorder, which is not loaded")
+
+    if proxy_port := int(entry.options.get(CONF_PROXY_PORT) or 0):
+        proxy = VoolModbusProxy(coordinator, proxy_port, entry.options.get(CONF_PROXY_HOST) or DEFAULT_PROXY_HOST)
+        try:
+            await proxy.async_start()
+        except OSError as err:
+            _LOGGER.error("Could not start the Modbus TCP proxy on port %s: %s", proxy_port, err)
+        else:
+            entry.async_on_unload(proxy.async_stop)
+
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
@@ -52,7 +155,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove stored data of a deleted config entry."""
+    await VoolCapabilityStore(hass, entry.entry_id).async_remove()
+    await VoolSessionTracker(hass, entry.entry_id).async_remove()
+    await async_remove_schedules(hass, entry.entry_id)
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    """Reload config entry, running the unload callbacks of the previous setup."""
+    await hass.config_entries.async_reload(entry.entry_id)
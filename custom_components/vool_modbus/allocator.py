@@ -0,0 +1,339 @@
+"""Site-level current allocation across VOOL chargers.
+
+Chargers sharing one feeder get a weighted fair share of a per-phase current
+budget. The allocation is phase aware: a charger draws its current on every
+phase it uses, so a 3-phase charger consumes budget on L1, L2 and L3 while a
+1-phase charger only consumes L1.
+
+Only chargers with a vehicle connected are written. Idle chargers keep the
+limit they had, so clearing the budget does not leave them at 0 A. The
+budget is stored, so a restart continues allocating with it.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    ALLOCATOR_ACTIVE_STATES,
+    ALLOCATOR_INTERVAL,
+    ALLOCATOR_MAX_CURRENT,
+    ALLOCATOR_MIN_CURRENT,
+    DOMAIN,
+    PHASES_L1,
+    PHASES_L1_L2_L3,
+    REG_EXTERNAL_ALLOWED_PHASES,
+    REG_EXTERNAL_CURRENT_LIMIT,
+    STORAGE_VERSION,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import VoolModbusCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+PHASE_BITS = (0b001, 0b010, 0b100)
+SAVE_DELAY = 10
+
+
+@dataclass(frozen=True)
+class ChargerDemand:
+    """Inputs of the allocation for one charger."""
+
+    active: bool
+    phases: int
+    weight: float
+
+
+@dataclass(frozen=True)
+class Allocation:
+    """Current limit and phases assigned to one charger."""
+
+    current: float
+    phases: int
+
+
+def _fair_shares(
+    demands: dict[str, ChargerDemand],
+    phases: dict[str, int],
+    budget: tuple[float, float, float],
+) -> dict[str, float]:
+    """Weighted max-min fair water filling under per-phase budgets."""
+    shares: dict[str, float] = {}
+    remaining = list(budget)
+    open_keys = set(phases)
+
+    while open_keys:
+        # Level at which the first phase or charger maximum saturates
+        level = math.inf
+        for index, bit in enumerate(PHASE_BITS):
+            weight = sum(demands[key].weight for key in open_keys if phases[key] & bit)
+            if weight > 0:
+                level = min(level, max(remaining[index], 0.0) / weight)
+        level = min(level, min(ALLOCATOR_MAX_CURRENT / demands[key].weight for key in open_keys))
+
+        saturated: set[str] = set()
+        for key in open_keys:
+            if demands[key].weight * level >= ALLOCATOR_MAX_CURRENT - 1e-9:
+                saturated.add(key)
+        for index, bit in enumerate(PHASE_BITS):
+            members = [key for key in open_keys if phases[key] & bit]
+            used = sum(demands[key].weight * level for key in members)
+            if members and used >= remaining[index] - 1e-9:
+                saturated.update(members)
+
+        for key in saturated:
+            shares[key] = min(demands[key].weight * level, ALLOCATOR_MAX_CURRENT)
+            for index, bit in enumerate(PHASE_BITS):
+                if phases[key] & bit:
+                    remaining[index] -= shares[key]
+        open_keys -= saturated
+
+    return shares
+
+
+def allocate(
+    demands: dict[str, ChargerDemand],
+    budget: tuple[float, float, float],
+) -> dict[str, Allocation]:
+    """Divide a per-phase budget among chargers.
+
+    Every active charger gets at least the minimum charging current or is
+    paused. When the budget is too small, the lowest weighted charger is first
+    moved from three phases to L1 and, if that is still not enough, paused.
+    """
+    phases = {
+        key: demand.phases or PHASES_L1_L2_L3
+        for key, demand in demands.items()
+        if demand.active and demand.weight > 0
+    }
+    result = {
+        key: Allocation(0.0, demand.phases or PHASES_L1_L2_L3)
+        for key, demand in demands.items()
+        if key not in phases
+    }
+
+    while True:
+        shares = _fair_shares(demands, phases, budget)
+        short = [key for key, share in shares.items() if share < ALLOCATOR_MIN_CURRENT - 1e-9]
+        if not short:
+            break
+        # Lowest weight gives way first, key keeps the choice deterministic
+        victim = min(short, key=lambda key: (demands[key].weight, key))
+        if phases[victim] != PHASES_L1:
+            phases[victim] = PHASES_L1
+        else:
+            del phases[victim]
+            result[victim] = Allocation(0.0, demands[victim].phases or PHASES_L1_L2_L3)
+
+    for key, share in shares.items():
+        result[key] = Allocation(math.floor(share * 10) / 10, phases[key])
+    return result
+
+
+class VoolCurrentAllocator:
+    """Allocate a site budget across every registered charger.
+
+    Inputs are collected on every coordinator update but the allocation is
+    only solved again when one of them changed, at most once per interval,
+    and only the registers of chargers whose share moved are written.
+
+    The solve itself is not incremental: water filling is global, one
+    charger arriving or leaving moves the level of every charger on its
+    phases. A full solve of 100 chargers takes about 30 ms at worst.
+
+    Writes are applied one batch at a time against the latest target, so a
+    solve while a batch is in flight does not send its changes twice.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the allocator."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.allocator")
+        self._budget: tuple[float, float, float] | None = None
+        self._members: dict[str, tuple[VoolModbusCoordinator, int, float]] = {}
+        self._demands: dict[str, ChargerDemand] = {}
+        self._applied: dict[str, Allocation] = {}
+        # Latest solution, written by _async_apply
+        self._target: dict[str, Allocation] = {}
+        self._apply_lock = asyncio.Lock()
+        # Bumped when _applied is reset, writes started before are not recorded
+        self._generation = 0
+        self._listeners: dict[VoolModbusCoordinator, CALLBACK_TYPE] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._dirty = False
+        self.solves = 0
+        self.writes = 0
+
+    async def async_load(self) -> None:
+        """Restore the budget set before the last restart."""
+        data = await self._store.async_load() or {}
+        if (budget := data.get("budget")) is not None:
+            self._budget = (float(budget[0]), float(budget[1]), float(budget[2]))
+
+    @callback
+    def async_add_coordinator(self, coordinator: VoolModbusCoordinator, weight: float) -> CALLBACK_TYPE:
+        """Register the chargers of a coordinator. Return a callback to remove them."""
+        for slave_id in coordinator.slave_ids:
+            self._members[coordinator.device_key(slave_id)] = (coordinator, slave_id, weight)
+
+        @callback
+        def handle_update() -> None:
+            self._async_collect(coordinator)
+
+        self._listeners[coordinator] = coordinator.async_add_listener(handle_update)
+        self._async_collect(coordinator)
+
+        @callback
+        def remove() -> None:
+            if (unsub := self._listeners.pop(coordinator, None)) is not None:
+                unsub()
+            for slave_id in coordinator.slave_ids:
+                key = coordinator.device_key(slave_id)
+                self._members.pop(key, None)
+                self._demands.pop(key, None)
+                self._applied.pop(key, None)
+                self._target.pop(key, None)
+            self._async_mark_dirty()
+
+        return remove
+
+    @callback
+    def async_set_budget(self, budget: tuple[float, float, float] | None) -> None:
+        """Set the per-phase site budget, or None to stop allocating."""
+        if budget == self._budget:
+            return
+        self._budget = budget
+        self._applied.clear()
+        self._generation += 1
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        self._async_mark_dirty()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"budget": None if self._budget is None else list(self._budget)}
+
+    @callback
+    def async_shutdown(self, _event: Event | None = None) -> None:
+        """Stop all listeners and timers, called when Home Assistant stops."""
+        for unsub in self._listeners.values():
+            unsub()
+        self._listeners.clear()
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_collect(self, coordinator: VoolModbusCoordinator) -> None:
+        """Update the demands of one coordinator's chargers from its snapshot."""
+        for slave_id in coordinator.slave_ids:
+            key = coordinator.device_key(slave_id)
+            if key not in self._members:
+                continue
+            if coordinator.scheduler is not None and coordinator.scheduler.sets_current(slave_id):
+                # The charging schedule owns the current limit and phases
+                if self._demands.pop(key, None) is not None:
+                    self._applied.pop(key, None)
+                    self._target.pop(key, None)
+                    self._async_mark_dirty()
+                continue
+            data = (coordinator.data or {}).get(slave_id)
+            if data is None:
+                # Unreachable chargers keep their last demand
+                continue
+            demand = ChargerDemand(
+                active=data.get("charger_state") in ALLOCATOR_ACTIVE_STATES,
+                phases=data.get("requested_phases") or PHASES_L1_L2_L3,
+                weight=self._members[key][2],
+            )
+            if self._demands.get(key) != demand:
+                self._demands[key] = demand
+                self._async_mark_dirty()
+
+    @callback
+    def _async_mark_dirty(self) -> None:
+        """Schedule a solve, coalescing bursts of changes."""
+        self._dirty = True
+        if self._unsub_timer is None and self._budget is not None:
+            self._unsub_timer = async_call_later(self.hass, ALLOCATOR_INTERVAL, self._async_solve)
+
+    @callback
+    def _async_solve(self, _now: Any = None) -> None:
+        """Solve the allocation and write the changes."""
+        self._unsub_timer = None
+        if not self._dirty or self._budget is None:
+            return
+        self._dirty = False
+        self.solves += 1
+
+        allocation = allocate(self._demands, self._budget)
+        # Idle chargers still count in the solve, but keep their own limit
+        self._target = {
+            key: target
+            for key, target in allocation.items()
+            if key in self._members and self._demands[key].active
+        }
+        if any(self._applied.get(key) != target for key, target in self._target.items()):
+            self.hass.async_create_task(self._async_apply())
+
+    async def _async_apply(self) -> None:
+        """Write the allocations that differ from the applied ones, all chargers concurrently."""
+        async with self._apply_lock:
+            # A batch queued behind another one only writes what is still missing
+            changes = {
+                key: target
+                for key, target in self._target.items()
+                if key in self._members and self._applied.get(key) != target
+            }
+            if not changes:
+                return
+            _LOGGER.debug("Applying site allocation changes: %s", changes)
+            generation = self._generation
+            await asyncio.gather(
+                *(self._async_apply_one(key, target, generation) for key, target in changes.items())
+            )
+
+    async def _async_apply_one(self, key: str, target: Allocation, generation: int) -> None:
+        """Write the current limit and phases of one charger, in one request if both changed."""
+        if (member := self._members.get(key)) is None:
+            return
+        coordinator, slave_id, _ = member
+        previous = self._applied.get(key)
+        if previous is None:
+            # Compare against what the charger currently reports
+            data = (coordinator.data or {}).get(slave_id, {})
+            if "external_current_limit" in data and "external_allowed_phases" in data:
+                previous = Allocation(round(data["external_current_limit"], 1), data["external_allowed_phases"])
+        current = round(target.current * 100)
+        if previous is None or (previous.phases != target.phases and previous.current != target.current):
+            ok = await coordinator.async_write_registers(
+                REG_EXTERNAL_CURRENT_LIMIT, [current, target.phases], slave_id, refresh=False
+            )
+        elif previous.phases != target.phases:
+            ok = await coordinator.async_write_register(
+                REG_EXTERNAL_ALLOWED_PHASES, target.phases, slave_id, refresh=False
+            )
+        elif previous.current != target.current:
+            ok = await coordinator.async_write_register(
+                REG_EXTERNAL_CURRENT_LIMIT, current, slave_id, refresh=False
+            )
+        else:
+            ok = True
+        if ok and previous != target:
+            self.writes += 1
+
+        if generation != self._generation or key not in self._members:
+            # The budget changed or the charger left while writing
+            return
+        if ok:
+            self._applied[key] = target
+        else:
+            # Retry on the next solve
+            self._applied.pop(key, None)
+            self._async_mark_dirty()
@@ -13,7 +13,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import DEVICE_TYPE_LMC, DOMAIN
 from .coordinator import VoolModbusCoordinator
 from .entity import VoolModbusEntity
 
@@ -61,8 +61,13 @@ async def async_setup_entry(
     """Set up VOOL Modbus binary sensors."""
     coordinator: VoolModbusCoordinator = hass.data[DOMAIN][entry.entry_id]
 
+    if coordinator.device_type == DEVICE_TYPE_LMC:
+        # Charging session controls and states only exist on chargers
+        return
+
     async_add_entities(
-        VoolBinarySensor(coordinator, description)
+        VoolBinarySensor(coordinator, description, slave_id)
+        for slave_id in coordinator.slave_ids
         for description in CHARGER_BINARY_SENSORS
     )
 
@@ -76,15 +81,16 @@ class VoolBinarySensor(VoolModbusEntity, BinarySensorEntity):
         self,
         coordinator: VoolModbusCoordinator,
         description: VoolBinarySensorEntityDescription,
+        slave_id: int,
     ) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator, description.key)
+        super().__init__(coordinator, description.key, slave_id)
         self.entity_description = description
 
     @property
     def is_on(self) -> bool | None:
         """Return true if the binary sensor is on."""
-        if self.coordinator.data is None:
+        if (data := self.device_data) is None:
             return None
         
-        return self.entity_description.value_fn(self.coordinator.data)
+        return self.entity_description.value_fn(data)
@@ -10,6 +10,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
     DOMAIN,
+    DEVICE_TYPE_LMC,
     REG_CHARGING_COMMAND,
     CHARGING_CMD_START,
     CHARGING_CMD_STOP,
@@ -52,8 +53,13 @@ async def async_setup_entry(
     """Set up VOOL Modbus buttons."""
     coordinator: VoolModbusCoordinator = hass.data[DOMAIN][entry.entry_id]
 
+    if coordinator.device_type == DEVICE_TYPE_LMC:
+        # Charging session controls and states only exist on chargers
+        return
+
     async_add_entities(
-        VoolButton(coordinator, description)
+        VoolButton(coordinator, description, slave_id)
+        for slave_id in coordinator.slave_ids
         for description in CHARGER_BUTTONS
     )
 
@@ -67,9 +73,10 @@ class VoolButton(VoolModbusEntity, ButtonEntity):
         self,
         coordinator: VoolModbusCoordinator,
         description: VoolButtonEntityDescription,
+        slave_id: int,
     ) -> None:
         """Initialize the button."""
-        super().__init__(coordinator, description.key)
+        super().__init__(coordinator, description.key, slave_id)
         self.entity_description = description
 
     async def async_press(self) -> None:
@@ -77,4 +84,5 @@ class VoolButton(VoolModbusEntity, ButtonEntity):
         await self.coordinator.async_write_register(
             self.entity_description.register,
             self.entity_description.value,
+            self._slave_id,
         )
@@ -0,0 +1,223 @@
+"""Register capability probing for VOOL Modbus integration.
+
+Firmware differs between VOOL units and not every unit answers every register
+block. Each device is probed once, the result is cached in storage and the read
+planner skips blocks the device reported as unsupported.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    CAPABILITY_READABLE,
+    CAPABILITY_REPROBE_INTERVAL,
+    CAPABILITY_UNSUPPORTED,
+    CAPABILITY_WRITABLE,
+    DOMAIN,
+    LMC_ALLOCATION_STRIDE,
+    LMC_MAX_CHARGERS,
+    REG_CHARGER_STATE,
+    REG_CHARGING_COMMAND,
+    REG_ENERGY_IMPORTED,
+    REG_EXTERNAL_CURRENT_LIMIT,
+    REG_LMC_ALLOCATION_BASE,
+    STORAGE_VERSION,
+)
+from .pymodbus_compat import async_read_holding_registers, async_read_input_registers
+
+_LOGGER = logging.getLogger(__name__)
+
+# Delay before a capability change learned at runtime is flushed to storage
+SAVE_DELAY = 10
+
+
+class RegisterBlock(NamedTuple):
+    """A contiguous range of registers read with a single request."""
+
+    key: str
+    address: int
+    count: int
+    input_registers: bool = False
+
+    def contains(self, address: int) -> bool:
+        """Return True if the register address falls inside this block."""
+        return self.address <= address < self.address + self.count
+
+
+BLOCK_STATUS = RegisterBlock("status", REG_CHARGER_STATE, 12)
+BLOCK_ENERGY = RegisterBlock("energy", REG_ENERGY_IMPORTED, 2)
+BLOCK_CONTROL = RegisterBlock("control", REG_CHARGING_COMMAND, 3)
+# Register 500 is write only and some firmware rejects reads that include it
+BLOCK_CONTROL_RW = RegisterBlock("control_rw", REG_EXTERNAL_CURRENT_LIMIT, 2)
+
+BLOCK_LMC_ALLOCATIONS = RegisterBlock(
+    "lmc_allocations",
+    REG_LMC_ALLOCATION_BASE,
+    LMC_ALLOCATION_STRIDE * LMC_MAX_CHARGERS,
+    input_registers=True,
+)
+
+CHARGER_BLOCKS: tuple[RegisterBlock, ...] = (
+    BLOCK_STATUS,
+    BLOCK_ENERGY,
+    BLOCK_CONTROL,
+    BLOCK_CONTROL_RW,
+)
+
+LMC_BLOCKS: tuple[RegisterBlock, ...] = (
+    BLOCK_STATUS,
+    BLOCK_ENERGY,
+    BLOCK_CONTROL_RW,
+)
+
+# The allocation table layout is assumed, see const.py
+LMC_ALLOCATION_BLOCKS: tuple[RegisterBlock, ...] = (*LMC_BLOCKS, BLOCK_LMC_ALLOCATIONS)
+
+
+async def async_read_block(client: Any, block: RegisterBlock, slave_id: int) -> Any:
+    """Read a register block with the function code it requires."""
+    if block.input_registers:
+        return await async_read_input_registers(client, block.address, block.count, slave_id)
+    return await async_read_holding_registers(client, block.address, block.count, slave_id)
+
+
+class CapabilityProbeError(Exception):
+    """Raised when a probe could not complete because of a communication error."""
+
+
+@dataclass
+class DeviceCapabilities:
+    """Register blocks supported by a single device."""
+
+    blocks: dict[str, str] = field(default_factory=dict)
+    fingerprint: str = ""
+    probed_at: float = 0.0
+
+    def is_readable(self, block: RegisterBlock) -> bool:
+        """Return True unless the block is known to be unsupported."""
+        return self.blocks.get(block.key, CAPABILITY_READABLE) != CAPABILITY_UNSUPPORTED
+
+    def is_stale(self, now: float | None = None) -> bool:
+        """Return True if the device should be probed again."""
+        if now is None:
+            now = time.time()
+        return now - self.probed_at >= CAPABILITY_REPROBE_INTERVAL
+
+    def mark_unsupported(self, block: RegisterBlock) -> bool:
+        """Record that a block can not be read. Return True if this is new."""
+        if self.blocks.get(block.key) == CAPABILITY_UNSUPPORTED:
+            return False
+        self.blocks[block.key] = CAPABILITY_UNSUPPORTED
+        return True
+
+    def mark_written(self, address: int, blocks: tuple[RegisterBlock, ...]) -> bool:
+        """Record a successful write. Return True if any block changed."""
+        changed = False
+        for block in blocks:
+            if block.contains(address) and self.blocks.get(block.key) == CAPABILITY_READABLE:
+                self.blocks[block.key] = CAPABILITY_WRITABLE
+                changed = True
+        return changed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serialisable representation."""
+        return {
+            "blocks": dict(self.blocks),
+            "fingerprint": self.fingerprint,
+            "probed_at": self.probed_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DeviceCapabilities:
+        """Restore capabilities from storage."""
+        return cls(
+            blocks=dict(data.get("blocks", {})),
+            fingerprint=data.get("fingerprint", ""),
+            probed_at=float(data.get("probed_at", 0.0)),
+        )
+
+
+async def async_probe_capabilities(
+    client: Any,
+    slave_id: int,
+    device_type: str,
+    blocks: tuple[RegisterBlock, ...] = CHARGER_BLOCKS,
+    previous: DeviceCapabilities | None = None,
+) -> DeviceCapabilities:
+    """Probe which register blocks a device answers.
+
+    A Modbus exception response (e.g. illegal data address) marks a block as
+    unsupported. Anything else, such as a timeout, aborts the probe so a flaky
+    link never gets cached as missing registers.
+    """
+    statuses: dict[str, str] = {}
+    parts: list[str] = [device_type]
+
+    for block in blocks:
+        result = await async_read_block(client, block, slave_id)
+
+        if not result.isError():
+            status = CAPABILITY_READABLE
+            # Keep writability learned from earlier writes across re-probes
+            if previous is not None and previous.blocks.get(block.key) == CAPABILITY_WRITABLE:
+                status = CAPABILITY_WRITABLE
+            parts.append(f"{block.key}:ok")
+        else:
+            exception_code = getattr(result, "exception_code", None)
+            if exception_code is None:
+                raise CapabilityProbeError(f"Probe of {block.key} registers failed: {result}")
+            status = CAPABILITY_UNSUPPORTED
+            parts.append(f"{block.key}:x{exception_code:02x}")
+
+        statuses[block.key] = status
+
+    return DeviceCapabilities(
+        blocks=statuses,
+        fingerprint="|".join(parts),
+        probed_at=time.time(),
+    )
+
+
+class VoolCapabilityStore:
+    """Persist probed capabilities of the devices behind a config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.capabilities"
+        )
+        self._devices: dict[int, DeviceCapabilities] = {}
+
+    async def async_load(self) -> dict[int, DeviceCapabilities]:
+        """Load capabilities of all devices from storage."""
+        data = await self._store.async_load() or {}
+        self._devices = {
+            int(slave_id): DeviceCapabilities.from_dict(caps)
+            for slave_id, caps in data.get("devices", {}).items()
+        }
+        return self._devices
+
+    def async_schedule_save(self) -> None:
+        """Save capabilities to storage after a short delay."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def async_save(self) -> None:
+        """Save capabilities to storage now."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove the stored capabilities."""
+        await self._store.async_remove()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "devices": {
+                str(slave_id): caps.as_dict() for slave_id, caps in self._devices.items()
+            }
+        }
@@ -0,0 +1,115 @@
+"""High-rate register capture for VOOL Modbus integration.
+
+For commissioning and fault analysis the raw status and energy registers of
+a device can be sampled every few hundred milliseconds into a ring file in
+the configuration directory (see capture_file for the format). Samples never
+become entity states, and the file size is fixed when the capture starts.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from homeassistant.util import slugify
+
+from .capabilities import BLOCK_ENERGY, BLOCK_STATUS
+from .capture_file import CaptureFile
+from .const import CAPTURE_DIRECTORY
+
+if TYPE_CHECKING:
+    from .coordinator import VoolModbusCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Together these are the REGISTER_COUNT registers of a capture record
+CAPTURE_BLOCKS = (BLOCK_STATUS, BLOCK_ENERGY)
+
+
+@dataclass
+class _Capture:
+    """A running capture of one device."""
+
+    file: CaptureFile
+    task: asyncio.Task[None]
+    interval: float
+
+
+class VoolCaptureManager:
+    """Run captures for the devices of a coordinator."""
+
+    def __init__(self, coordinator: VoolModbusCoordinator) -> None:
+        """Initialize the manager."""
+        self._coordinator = coordinator
+        self._captures: dict[int, _Capture] = {}
+
+    def path(self, slave_id: int) -> str:
+        """Return the capture file of a device."""
+        name = slugify(self._coordinator.device_key(slave_id))
+        return self._coordinator.hass.config.path(CAPTURE_DIRECTORY, f"capture_{name}.bin")
+
+    def is_capturing(self, slave_id: int) -> bool:
+        """Return True if a capture of the device is running."""
+        return slave_id in self._captures
+
+    async def async_start(self, slave_id: int, interval: float, max_bytes: int) -> str:
+        """Start capturing a device into a new ring file. Return its path."""
+        await self.async_stop(slave_id)
+
+        hass = self._coordinator.hass
+        path = self.path(slave_id)
+        capture_file = await hass.async_add_executor_job(CaptureFile.create, path, max_bytes)
+        task = hass.async_create_background_task(
+            self._async_run(slave_id, capture_file, interval),
+            f"{self._coordinator.name}_capture_{slave_id}",
+        )
+        self._captures[slave_id] = _Capture(capture_file, task, interval)
+        _LOGGER.info(
+            "Capturing %s every %.1f s into %s (%d records)",
+            self._coordinator.device_name(slave_id),
+            interval,
+            path,
+            capture_file.capacity,
+        )
+        return path
+
+    async def async_stop(self, slave_id: int | None = None) -> None:
+        """Stop the capture of a device, or all captures."""
+        slave_ids = list(self._captures) if slave_id is None else [slave_id]
+        for key in slave_ids:
+            if (capture := self._captures.pop(key, None)) is None:
+                continue
+            capture.task.cancel()
+            try:
+                await capture.task
+            except asyncio.CancelledError:
+                pass
+
+            def close(capture_file: CaptureFile = capture.file) -> None:
+                capture_file.flush()
+                capture_file.close()
+
+            await self._coordinator.hass.async_add_executor_job(close)
+            _LOGGER.info(
+                "Stopped capture of %s after %d records", self._coordinator.device_name(key), capture.file.count
+            )
+
+    async def _async_run(self, slave_id: int, capture_file: CaptureFile, interval: float) -> None:
+        """Sample the device on a fixed schedule."""
+        loop = asyncio.get_running_loop()
+        next_sample = loop.time()
+
+        while True:
+            registers = await self._coordinator.async_read_raw_blocks(slave_id, CAPTURE_BLOCKS)
+            if registers is not None:
+                capture_file.append(time.time(), registers)
+
+            next_sample += interval
+            delay = next_sample - loop.time()
+            if delay < 0:
+                # The bus is slower than the interval: skip ahead instead of bursting
+                next_sample = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
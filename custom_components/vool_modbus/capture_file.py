@@ -0,0 +1,143 @@
+"""Ring file format of the VOOL Modbus high-rate capture.
+
+The file is a fixed header followed by a preallocated ring of fixed-size
+records. Every record is a timestamp and the raw status (100-111) and energy
+(200-201) registers as uint16. Once the ring is full the oldest records are
+overwritten, so disk usage never grows past the size chosen at start.
+
+This module only uses the standard library so captures can be read on any
+machine. Run it as a script to print a capture as CSV:
+
+    python3 capture_file.py /config/vool_modbus/capture_192_168_1_10_1.bin
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Iterator
+from datetime import UTC, datetime
+
+MAGIC = b"VOOLCAP1"
+# magic, record size, register count, capacity, next write index, record count
+HEADER = struct.Struct("<8sHHIQQ")
+HEADER_SIZE = 64
+REGISTER_COUNT = 14
+RECORD = struct.Struct(f"<d{REGISTER_COUNT}H")
+
+COLUMNS = (
+    "time",
+    "charger_state",
+    "requested_phases",
+    "current_l1",
+    "current_l2",
+    "current_l3",
+    "voltage_l1",
+    "voltage_l2",
+    "voltage_l3",
+    "active_power",
+    "l1_power",
+    "l2_power",
+    "l3_power",
+    "energy_imported",
+)
+
+# Scale of every status register, signed registers are int16 on the wire
+_STATUS_SCALES = (None, None, 0.01, 0.01, 0.01, 0.1, 0.1, 0.1, 0.01, 0.01, 0.01, 0.01)
+
+
+class CaptureFile:
+    """A memory-mapped capture ring file."""
+
+    def __init__(self, path: str, mapping: mmap.mmap, capacity: int) -> None:
+        """Initialize from an open mapping; use create() or open()."""
+        self.path = path
+        self._mmap = mapping
+        self.capacity = capacity
+        _, _, _, _, self._index, self.count = HEADER.unpack_from(mapping, 0)
+
+    @classmethod
+    def create(cls, path: str, max_bytes: int) -> CaptureFile:
+        """Create (or replace) a capture file of at most max_bytes."""
+        capacity = max((max_bytes - HEADER_SIZE) // RECORD.size, 1)
+        size = HEADER_SIZE + capacity * RECORD.size
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w+b") as file:
+            file.truncate(size)
+            mapping = mmap.mmap(file.fileno(), size)
+        HEADER.pack_into(mapping, 0, MAGIC, RECORD.size, REGISTER_COUNT, capacity, 0, 0)
+        return cls(path, mapping, capacity)
+
+    @classmethod
+    def open(cls, path: str) -> CaptureFile:
+        """Open an existing capture file read-only."""
+        with open(path, "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, record_size, register_count, capacity, _, _ = HEADER.unpack_from(mapping, 0)
+        if magic != MAGIC or record_size != RECORD.size or register_count != REGISTER_COUNT:
+            mapping.close()
+            raise ValueError(f"{path} is not a VOOL capture file")
+        return cls(path, mapping, capacity)
+
+    def append(self, timestamp: float, registers: list[int]) -> None:
+        """Write one record in place, overwriting the oldest when full."""
+        RECORD.pack_into(self._mmap, HEADER_SIZE + self._index * RECORD.size, timestamp, *registers)
+        self._index = (self._index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        HEADER.pack_into(
+            self._mmap, 0, MAGIC, RECORD.size, REGISTER_COUNT, self.capacity, self._index, self.count
+        )
+
+    def records(self) -> Iterator[tuple]:
+        """Yield the raw records, oldest first."""
+        start = self._index - self.count if self.count < self.capacity else self._index
+        for offset in range(self.count):
+            index = (start + offset) % self.capacity
+            yield RECORD.unpack_from(self._mmap, HEADER_SIZE + index * RECORD.size)
+
+    def rows(self) -> Iterator[tuple]:
+        """Yield decoded rows matching COLUMNS, oldest first."""
+        for record in self.records():
+            timestamp, *registers = record
+            row: list = [datetime.fromtimestamp(timestamp, UTC).isoformat()]
+            for value, scale in zip(registers, _STATUS_SCALES):
+                if scale is None:
+                    row.append(value)
+                else:
+                    signed = value - 0x10000 if value >= 0x8000 else value
+                    row.append(round(signed * scale, 2))
+            # uint32 Wh, MSB first
+            row.append((registers[12] << 16 | registers[13]) / 1000)
+            yield tuple(row)
+
+    def flush(self) -> None:
+        """Flush written records to disk."""
+        self._mmap.flush()
+
+    def close(self) -> None:
+        """Close the mapping."""
+        self._mmap.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print a capture file as CSV."""
+    parser = argparse.ArgumentParser(description="Print a VOOL Modbus capture file as CSV")
+    parser.add_argument("path", help="capture file")
+    args = parser.parse_args(argv)
+
+    capture = CaptureFile.open(args.path)
+    try:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(COLUMNS)
+        writer.writerows(capture.rows())
+    finally:
+        capture.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
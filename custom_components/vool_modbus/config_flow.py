@@ -15,32 +15,87 @@ from homeassistant.helpers import selector
 
 from .const import (
     DOMAIN,
+    CONF_ALLOCATOR_WEIGHT,
+    CONF_CHARGERS,
     CONF_DEVICE_TYPE,
+    CONF_LB_MAIN_FUSE,
+    CONF_LMC_ALLOCATIONS,
+    CONF_SURPLUS_GRID_POWER,
+    CONF_ENERGY_STATISTICS,
+    CONF_PROXY_HOST,
+    CONF_PROXY_PORT,
+    CONF_ALIGNED_POLLING,
+    CONF_LB_METER_ENTITIES,
+    CONF_NETWORK,
     CONF_SLAVE_ID,
+    CONF_SLAVE_IDS,
+    CONF_TRANSPORT,
+    CONF_BAUDRATE,
+    BAUDRATES,
+    TRANSPORTS,
     DEVICE_TYPE_CHARGER,
+    DEVICE_TYPE_LMC,
+    DEVICE_TYPE_NAMES,
+    DEFAULT_ALLOCATOR_WEIGHT,
+    DEFAULT_BAUDRATE,
+    DEFAULT_LB_MAIN_FUSE,
     DEFAULT_MODBUS_PORT,
+    DEFAULT_PROXY_HOST,
     DEFAULT_SLAVE_ID,
+    DEFAULT_TRANSPORT,
     REG_CHARGER_STATE,
 )
 
+from .discovery import (
+    DiscoveredCharger,
+    InvalidNetwork,
+    async_scan_network,
+    parse_slave_ids,
+)
 from .pymodbus_compat import async_read_holding_registers
+from .transport import create_client
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _transport_schema(transport: str, baudrate: int) -> dict[Any, Any]:
+    """Return the transport fields of a connection form."""
+    return {
+        vol.Optional(CONF_TRANSPORT, default=transport): selector.SelectSelector(
+            selector.SelectSelectorConfig(options=list(TRANSPORTS), translation_key=CONF_TRANSPORT),
+        ),
+        # Only used by RTU-over-TCP, for the timing of the serial bus behind the converter
+        vol.Optional(CONF_BAUDRATE, default=str(baudrate)): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=[str(baudrate) for baudrate in BAUDRATES],
+                mode=selector.SelectSelectorMode.DROPDOWN,
+            ),
+        ),
+    }
+
+
+def _clean_transport(cleaned: dict[str, Any]) -> None:
+    """Convert the transport fields of submitted form data."""
+    if cleaned.get(CONF_BAUDRATE) is not None:
+        cleaned[CONF_BAUDRATE] = int(cleaned[CONF_BAUDRATE])
+
+
 async def validate_connection(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
-    from pymodbus.client import AsyncModbusTcpClient
-    
     host = data[CONF_HOST]
     port = int(data.get(CONF_PORT, DEFAULT_MODBUS_PORT))
-    slave_id = int(data.get(CONF_SLAVE_ID, DEFAULT_SLAVE_ID))
+    if CONF_SLAVE_IDS in data:
+        slave_ids = [int(slave_id) for slave_id in data[CONF_SLAVE_IDS]]
+    else:
+        slave_ids = [int(data.get(CONF_SLAVE_ID, DEFAULT_SLAVE_ID))]
     device_type = data.get(CONF_DEVICE_TYPE, DEVICE_TYPE_CHARGER)
     
-    client = AsyncModbusTcpClient(
-        host=host,
-        port=port,
-        timeout=5,
+    client = create_client(
+        host,
+        port,
+        5,
+        data.get(CONF_TRANSPORT, DEFAULT_TRANSPORT),
+        int(data.get(CONF_BAUDRATE, DEFAULT_BAUDRATE)),
     )
     
     try:
@@ -50,8 +105,15 @@ async def validate_connection(hass: HomeAssistant, data: dict[str, Any]) -> dict
         
         # Try to read register 100 (state) to verify communication
         # Both charger and LMC use the same register addresses (100-111)
-        result = await async_read_holding_registers(client, REG_CHARGER_STATE, 1, slave_id)
-        if result.isError():
+        # A hub is valid as long as at least one of its slaves answers
+        answered = False
+        for slave_id in slave_ids:
+            result = await async_read_holding_registers(client, REG_CHARGER_STATE, 1, slave_id)
+            if result.isError():
+                _LOGGER.debug("Slave %s on %s did not answer: %s", slave_id, host, result)
+            else:
+                answered = True
+        if not answered:
             raise CannotConnect(f"Failed to read from {device_type} at address {REG_CHARGER_STATE}")
             
     except Exception as err:
@@ -60,7 +122,7 @@ async def validate_connection(hass: HomeAssistant, data: dict[str, Any]) -> dict
     finally:
         client.close()
     
-    return {"title": data.get(CONF_NAME, f"VOOL {data[CONF_DEVICE_TYPE].title()}")}
+    return {"title": data.get(CONF_NAME, f"VOOL {DEVICE_TYPE_NAMES[data[CONF_DEVICE_TYPE]]}")}
 
 
 class VoolModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -71,15 +133,209 @@ class VoolModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self) -> None:
         """Initialize the config flow."""
         self._data: dict[str, Any] = {}
+        self._discovered: dict[str, DiscoveredCharger] = {}
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle the initial step - go directly to connection step."""
-        # Set device type to charger (only supported device type)
+        """Handle the initial step - choose a charger, a gateway, discovery or an LMC."""
+        # Every path adds chargers except the LMC step, which overrides the type
         self._data[CONF_DEVICE_TYPE] = DEVICE_TYPE_CHARGER
+        return self.async_show_menu(
+            step_id="user",
+            menu_options=["connection", "discovery", "hub", "lmc"],
+        )
+
+    async def async_step_lmc(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Configure a VOOL Load Management Controller."""
+        self._data[CONF_DEVICE_TYPE] = DEVICE_TYPE_LMC
         return await self.async_step_connection()
 
+    async def async_step_hub(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Configure a Modbus gateway with several chargers behind it."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            cleaned = dict(user_input)
+            cleaned[CONF_PORT] = int(cleaned.get(CONF_PORT, DEFAULT_MODBUS_PORT))
+            _clean_transport(cleaned)
+            try:
+                cleaned[CONF_SLAVE_IDS] = parse_slave_ids(str(cleaned.get(CONF_SLAVE_IDS, "")))
+            except ValueError:
+                errors[CONF_SLAVE_IDS] = "invalid_slave_ids"
+            else:
+                self._data.update(cleaned)
+
+                await self.async_set_unique_id(f"{self._data[CONF_HOST]}_hub")
+                self._abort_if_unique_id_configured()
+
+                try:
+                    info = await validate_connection(self.hass, self._data)
+                except CannotConnect:
+                    errors["base"] = "cannot_connect"
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Unexpected exception")
+                    errors["base"] = "unknown"
+                else:
+                    title = self._data.get(CONF_NAME) or info["title"]
+                    return self.async_create_entry(title=title, data=self._data)
+
+        return self.async_show_form(
+            step_id="hub",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_HOST): selector.TextSelector(
+                        selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT),
+                    ),
+                    vol.Optional(CONF_PORT, default=DEFAULT_MODBUS_PORT): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=65535,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    **_transport_schema(DEFAULT_TRANSPORT, DEFAULT_BAUDRATE),
+                    vol.Required(CONF_SLAVE_IDS): selector.TextSelector(
+                        selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT),
+                    ),
+                    vol.Optional(CONF_NAME, default="VOOL Gateway"): selector.TextSelector(
+                        selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT),
+                    ),
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_discovery(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Scan a network range for VOOL chargers."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            port = int(user_input.get(CONF_PORT, DEFAULT_MODBUS_PORT))
+            try:
+                slave_ids = parse_slave_ids(str(user_input.get(CONF_SLAVE_IDS, DEFAULT_SLAVE_ID)))
+            except ValueError:
+                errors[CONF_SLAVE_IDS] = "invalid_slave_ids"
+            else:
+                # Configured devices keep their connection, do not even open a socket to them
+                configured_hosts = {
+                    entry.data[CONF_HOST]
+                    for entry in self._async_current_entries(include_ignore=False)
+                    if CONF_HOST in entry.data
+                }
+                try:
+                    found = await async_scan_network(
+                        user_input[CONF_NETWORK], port, slave_ids, exclude=configured_hosts
+                    )
+                except InvalidNetwork:
+                    errors[CONF_NETWORK] = "invalid_network"
+                else:
+                    configured = self._async_current_ids()
+                    self._discovered = {
+                        charger.unique_id: charger
+                        for charger in found
+                        if charger.unique_id not in configured
+                    }
+                    if self._discovered:
+                        return await self.async_step_discovery_confirm()
+                    errors["base"] = "no_devices_found"
+
+        return self.async_show_form(
+            step_id="discovery",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_NETWORK): selector.TextSelector(
+                        selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT),
+                    ),
+                    vol.Optional(CONF_PORT, default=DEFAULT_MODBUS_PORT): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=65535,
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Optional(CONF_SLAVE_IDS, default=str(DEFAULT_SLAVE_ID)): selector.TextSelector(
+                        selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT),
+                    ),
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_discovery_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Let the user pick which discovered chargers to add."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            selected = [
+                self._discovered[unique_id]
+                for unique_id in user_input.get(CONF_CHARGERS, [])
+                if unique_id in self._discovered
+            ]
+            if selected:
+                # One entry per flow: add the rest through import flows
+                for charger in selected[1:]:
+                    self.hass.async_create_task(
+                        self.hass.config_entries.flow.async_init(
+                            DOMAIN,
+                            context={"source": config_entries.SOURCE_IMPORT},
+                            data=self._discovered_entry_data(charger),
+                        )
+                    )
+                return await self.async_step_import(self._discovered_entry_data(selected[0]))
+            errors["base"] = "no_devices_selected"
+
+        options = [
+            selector.SelectOptionDict(
+                value=unique_id,
+                label=f"{charger.host}:{charger.port} (slave {charger.slave_id})",
+            )
+            for unique_id, charger in self._discovered.items()
+        ]
+
+        return self.async_show_form(
+            step_id="discovery_confirm",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_CHARGERS, default=list(self._discovered)): selector.SelectSelector(
+                        selector.SelectSelectorConfig(options=options, multiple=True),
+                    ),
+                }
+            ),
+            errors=errors,
+            description_placeholders={"count": str(len(self._discovered))},
+        )
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Create an entry for a charger that was already probed."""
+        await self.async_set_unique_id(
+            f"{import_data[CONF_HOST]}_{import_data.get(CONF_SLAVE_ID, DEFAULT_SLAVE_ID)}"
+        )
+        self._abort_if_unique_id_configured()
+
+        title = import_data.get(CONF_NAME) or f"VOOL {DEVICE_TYPE_NAMES[import_data[CONF_DEVICE_TYPE]]}"
+        return self.async_create_entry(title=title, data=import_data)
+
+    @staticmethod
+    def _discovered_entry_data(charger: DiscoveredCharger) -> dict[str, Any]:
+        """Return config entry data for a discovered charger."""
+        return {
+            CONF_DEVICE_TYPE: DEVICE_TYPE_CHARGER,
+            CONF_HOST: charger.host,
+            CONF_PORT: charger.port,
+            CONF_SLAVE_ID: charger.slave_id,
+            CONF_NAME: f"VOOL Charger {charger.host}"
+            + (f" ({charger.slave_id})" if charger.slave_id != DEFAULT_SLAVE_ID else ""),
+        }
+
     async def async_step_connection(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -92,6 +348,7 @@ class VoolModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 cleaned[CONF_PORT] = int(cleaned[CONF_PORT])
             if CONF_SLAVE_ID in cleaned and cleaned[CONF_SLAVE_ID] is not None:
                 cleaned[CONF_SLAVE_ID] = int(cleaned[CONF_SLAVE_ID])
+            _clean_transport(cleaned)
             self._data.update(cleaned)
             
             # Check if device is already configured
@@ -113,7 +370,7 @@ class VoolModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return self.async_create_entry(title=title, data=self._data)
 
         device_type = self._data.get(CONF_DEVICE_TYPE, DEVICE_TYPE_CHARGER)
-        default_name = f"VOOL {device_type.title()}"
+        default_name = f"VOOL {DEVICE_TYPE_NAMES[device_type]}"
 
         return self.async_show_form(
             step_id="connection",
@@ -129,6 +386,7 @@ class VoolModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                             mode=selector.NumberSelectorMode.BOX,
                         ),
                     ),
+                    **_transport_schema(DEFAULT_TRANSPORT, DEFAULT_BAUDRATE),
                     vol.Optional(CONF_SLAVE_ID, default=DEFAULT_SLAVE_ID): selector.NumberSelector(
                         selector.NumberSelectorConfig(
                             min=1,
@@ -143,7 +401,7 @@ class VoolModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             ),
             errors=errors,
             description_placeholders={
-                "device_type": self._data.get(CONF_DEVICE_TYPE, DEVICE_TYPE_CHARGER).title(),
+                "device_type": DEVICE_TYPE_NAMES[self._data.get(CONF_DEVICE_TYPE, DEVICE_TYPE_CHARGER)],
             },
         )
 
@@ -164,6 +422,7 @@ class VoolModbusOptionsFlowHandler(config_entries.OptionsFlow):
     ) -> FlowResult:
         """Manage the options."""
         errors: dict[str, str] = {}
+        is_hub = CONF_SLAVE_IDS in self.config_entry.data
 
         if user_input is not None:
             cleaned = dict(user_input)
@@ -171,37 +430,175 @@ class VoolModbusOptionsFlowHandler(config_entries.OptionsFlow):
                 cleaned[CONF_PORT] = int(cleaned[CONF_PORT])
             if CONF_SLAVE_ID in cleaned and cleaned[CONF_SLAVE_ID] is not None:
                 cleaned[CONF_SLAVE_ID] = int(cleaned[CONF_SLAVE_ID])
-            return self.async_create_entry(title="", data=cleaned)
+            _clean_transport(cleaned)
+            if cleaned.get(CONF_ALLOCATOR_WEIGHT) is not None:
+                cleaned[CONF_ALLOCATOR_WEIGHT] = float(cleaned[CONF_ALLOCATOR_WEIGHT])
+            if cleaned.get(CONF_PROXY_PORT) is not None:
+                cleaned[CONF_PROXY_PORT] = int(cleaned[CONF_PROXY_PORT])
+            if cleaned.get(CONF_LB_MAIN_FUSE) is not None:
+                cleaned[CONF_LB_MAIN_FUSE] = float(cleaned[CONF_LB_MAIN_FUSE])
+            if CONF_SLAVE_IDS in cleaned:
+                try:
+                    cleaned[CONF_SLAVE_IDS] = parse_slave_ids(str(cleaned[CONF_SLAVE_IDS]))
+                except ValueError:
+                    errors[CONF_SLAVE_IDS] = "invalid_slave_ids"
+            if not errors:
+                return self.async_create_entry(title="", data=cleaned)
 
         current_port = self.config_entry.data.get(CONF_PORT, DEFAULT_MODBUS_PORT)
         current_slave_id = self.config_entry.data.get(CONF_SLAVE_ID, DEFAULT_SLAVE_ID)
-        
+        config = {**self.config_entry.data, **self.config_entry.options}
+        current_slave_ids = self.config_entry.options.get(
+            CONF_SLAVE_IDS, self.config_entry.data.get(CONF_SLAVE_IDS, [])
+        )
+
+        schema: dict[Any, Any] = {
+            vol.Optional(
+                CONF_PORT,
+                default=self.config_entry.options.get(CONF_PORT, current_port),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=65535,
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            ),
+            **_transport_schema(
+                config.get(CONF_TRANSPORT, DEFAULT_TRANSPORT),
+                int(config.get(CONF_BAUDRATE, DEFAULT_BAUDRATE)),
+            ),
+        }
+        if is_hub:
+            schema[
+                vol.Optional(
+                    CONF_SLAVE_IDS,
+                    default=", ".join(str(slave_id) for slave_id in current_slave_ids),
+                )
+            ] = selector.TextSelector(
+                selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT),
+            )
+        else:
+            schema[
+                vol.Optional(
+                    CONF_SLAVE_ID,
+                    default=self.config_entry.options.get(CONF_SLAVE_ID, current_slave_id),
+                )
+            ] = selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=247,
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            )
+
+        # Local Modbus TCP server sharing this connection with other tools, 0 disables it
+        schema[
+            vol.Optional(
+                CONF_PROXY_PORT,
+                default=self.config_entry.options.get(CONF_PROXY_PORT, 0),
+            )
+        ] = selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                max=65535,
+                mode=selector.NumberSelectorMode.BOX,
+            ),
+        )
+        # Loopback by default: the proxy accepts writes without authentication
+        schema[
+            vol.Optional(
+                CONF_PROXY_HOST,
+                default=self.config_entry.options.get(CONF_PROXY_HOST, DEFAULT_PROXY_HOST),
+            )
+        ] = selector.TextSelector(
+            selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT),
+        )
+
+        # Hourly statistics straight from the energy counter instead of a recorded sensor
+        schema[
+            vol.Optional(
+                CONF_ENERGY_STATISTICS,
+                default=self.config_entry.options.get(CONF_ENERGY_STATISTICS, False),
+            )
+        ] = selector.BooleanSelector()
+
+        # Poll on wall-clock boundaries shared with other entries, for coherent site totals
+        schema[
+            vol.Optional(
+                CONF_ALIGNED_POLLING,
+                default=self.config_entry.options.get(CONF_ALIGNED_POLLING, False),
+            )
+        ] = selector.BooleanSelector()
+
+        is_charger = self.config_entry.data.get(CONF_DEVICE_TYPE, DEVICE_TYPE_CHARGER) == DEVICE_TYPE_CHARGER
+
+        if not is_charger:
+            # The allocation table layout is assumed, so it is only read on request
+            schema[
+                vol.Optional(
+                    CONF_LMC_ALLOCATIONS,
+                    default=self.config_entry.options.get(CONF_LMC_ALLOCATIONS, False),
+                )
+            ] = selector.BooleanSelector()
+
+        if is_charger:
+            # Share of the site current budget relative to other chargers
+            schema[
+                vol.Optional(
+                    CONF_ALLOCATOR_WEIGHT,
+                    default=self.config_entry.options.get(CONF_ALLOCATOR_WEIGHT, DEFAULT_ALLOCATOR_WEIGHT),
+                )
+            ] = selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=10,
+                    step=0.1,
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            )
+
+        if is_charger and not is_hub:
+            # Dynamic load balancing against a grid meter
+            schema[
+                vol.Optional(
+                    CONF_LB_METER_ENTITIES,
+                    default=self.config_entry.options.get(CONF_LB_METER_ENTITIES, []),
+                )
+            ] = selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain="sensor",
+                    device_class="current",
+                    multiple=True,
+                ),
+            )
+            schema[
+                vol.Optional(
+                    CONF_LB_MAIN_FUSE,
+                    default=self.config_entry.options.get(CONF_LB_MAIN_FUSE, DEFAULT_LB_MAIN_FUSE),
+                )
+            ] = selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=6,
+                    max=630,
+                    unit_of_measurement="A",
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            )
+            # Solar surplus charging, only used without load balancing
+            schema[
+                vol.Optional(
+                    CONF_SURPLUS_GRID_POWER,
+                    description={
+                        "suggested_value": self.config_entry.options.get(CONF_SURPLUS_GRID_POWER)
+                    },
+                )
+            ] = selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="sensor", device_class="power"),
+            )
+
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema(
-                {
-                    vol.Optional(
-                        CONF_PORT,
-                        default=self.config_entry.options.get(CONF_PORT, current_port),
-                    ): selector.NumberSelector(
-                        selector.NumberSelectorConfig(
-                            min=1,
-                            max=65535,
-                            mode=selector.NumberSelectorMode.BOX,
-                        ),
-                    ),
-                    vol.Optional(
-                        CONF_SLAVE_ID,
-                        default=self.config_entry.options.get(CONF_SLAVE_ID, current_slave_id),
-                    ): selector.NumberSelector(
-                        selector.NumberSelectorConfig(
-                            min=1,
-                            max=247,
-                            mode=selector.NumberSelectorMode.BOX,
-                        ),
-                    ),
-                }
-            ),
+            data_schema=vol.Schema(schema),
             errors=errors,
         )
 
@@ -7,15 +7,175 @@ DOMAIN: Final = "vool_modbus"
 CONF_DEVICE_TYPE: Final = "device_type"
 CONF_MODBUS_PORT: Final = "modbus_port"
 CONF_SLAVE_ID: Final = "slave_id"
+CONF_SLAVE_IDS: Final = "slave_ids"
+CONF_NETWORK: Final = "network"
+CONF_CHARGERS: Final = "chargers"
+CONF_LB_METER_ENTITIES: Final = "lb_meter_entities"
+CONF_LB_MAIN_FUSE: Final = "lb_main_fuse"
+CONF_ALLOCATOR_WEIGHT: Final = "allocator_weight"
+CONF_SURPLUS_GRID_POWER: Final = "surplus_grid_power"
+CONF_ENERGY_STATISTICS: Final = "energy_statistics"
+CONF_PROXY_PORT: Final = "proxy_port"
+CONF_PROXY_HOST: Final = "proxy_host"
+CONF_LMC_ALLOCATIONS: Final = "lmc_allocations"
+CONF_ALIGNED_POLLING: Final = "aligned_polling"
+CONF_TRANSPORT: Final = "transport"
+CONF_BAUDRATE: Final = "baudrate"
 
 # Device Types
 DEVICE_TYPE_CHARGER: Final = "charger"
+DEVICE_TYPE_LMC: Final = "lmc"
+DEVICE_TYPE_NAMES: Final = {
+    DEVICE_TYPE_CHARGER: "Charger",
+    DEVICE_TYPE_LMC: "LMC",
+}
+
+# Transports
+TRANSPORT_TCP: Final = "tcp"
+TRANSPORT_RTU_OVER_TCP: Final = "rtu_over_tcp"  # RS-485 to Ethernet converters
+TRANSPORTS: Final = (TRANSPORT_TCP, TRANSPORT_RTU_OVER_TCP)
+BAUDRATES: Final = (9600, 19200, 38400, 57600, 115200)
 
 # Default values
+DEFAULT_TRANSPORT: Final = TRANSPORT_TCP
+DEFAULT_BAUDRATE: Final = 19200
 DEFAULT_MODBUS_PORT: Final = 502
 DEFAULT_SLAVE_ID: Final = 1
 DEFAULT_SCAN_INTERVAL: Final = 5
 
+# Serial side of RTU-over-TCP converters
+RTU_CHARACTER_BITS: Final = 11         # start, 8 data, parity or 2nd stop, stop
+RTU_FIXED_GAP_BAUDRATE: Final = 19200  # above it t3.5 is fixed at 1.75 ms
+RTU_FIXED_GAP: Final = 0.00175         # s
+RTU_TURNAROUND: Final = 0.005          # s for a converter to switch the RS-485 direction
+RTU_MAX_FRAME: Final = 256             # bytes
+RTU_MAX_READ_GAP: Final = 16           # registers read to save a frame at most
+
+# Network discovery
+DISCOVERY_CONCURRENCY: Final = 64
+DISCOVERY_CONNECT_TIMEOUT: Final = 0.5  # seconds
+DISCOVERY_READ_TIMEOUT: Final = 1.5  # seconds
+DISCOVERY_MAX_HOSTS: Final = 1024
+DISCOVERY_MAX_UNANSWERED: Final = 4  # unanswered probes before a host is given up
+
+# Live telemetry (websocket stream of the status registers 100-111)
+TELEMETRY_MAX_RATE: Final = 5  # Hz
+TELEMETRY_FIELDS: Final = (
+    "charger_state",
+    "requested_phases",
+    "current_l1",
+    "current_l2",
+    "current_l3",
+    "voltage_l1",
+    "voltage_l2",
+    "voltage_l3",
+    "active_power",
+    "l1_power",
+    "l2_power",
+    "l3_power",
+)
+
+# In-memory history per device (websocket vool_modbus/history)
+HISTORY_RAW_SIZE: Final = 3600 // DEFAULT_SCAN_INTERVAL  # one sample per poll for 1 h
+HISTORY_TIERS: Final = (
+    ("1m", 60, 1440),    # name, s per bucket, buckets: 1 min for 24 h
+    ("15m", 900, 672),   # 15 min for 7 days
+)
+HISTORY_FIELDS: Final = (
+    "active_power",
+    "l1_power",
+    "l2_power",
+    "l3_power",
+    "current_l1",
+    "current_l2",
+    "current_l3",
+    "voltage_l1",
+    "voltage_l2",
+    "voltage_l3",
+    "external_current_limit",
+)
+
+# Dynamic load balancing
+DEFAULT_LB_MAIN_FUSE: Final = 25  # A per phase
+LB_MIN_CURRENT: Final = 6.0    # A, lowest current a charger can charge with
+LB_MAX_CURRENT: Final = 32.0   # A
+LB_MARGIN: Final = 1.0         # A kept free below the main fuse
+LB_KP: Final = 0.1             # proportional gain
+LB_KI: Final = 0.5             # integral gain, 1/s
+LB_RAMP_UP: Final = 2.0        # A/s, increases are rate limited, decreases are not
+LB_DEADBAND: Final = 1.0       # A, smallest increase worth a register write
+
+# Site current allocation across chargers
+DEFAULT_ALLOCATOR_WEIGHT: Final = 1.0
+ALLOCATOR_MIN_CURRENT: Final = 6.0   # A
+ALLOCATOR_MAX_CURRENT: Final = 32.0  # A
+ALLOCATOR_INTERVAL: Final = 1.0      # seconds between solves at most
+ALLOCATOR_ACTIVE_STATES: Final = (2, 3, 4)  # Connected, Charging, Charging Paused
+
+# Solar surplus charging
+SURPLUS_VOLTAGE: Final = 230.0         # V, nominal phase voltage
+SURPLUS_MIN_CURRENT: Final = 6.0       # A
+SURPLUS_MAX_CURRENT: Final = 32.0      # A
+SURPLUS_SMOOTHING: Final = 60.0        # s, time constant of the surplus estimate
+SURPLUS_HYSTERESIS: Final = 400.0      # W around the 3-phase and stop thresholds
+SURPLUS_START_DWELL: Final = 120.0     # s a threshold must hold before acting on it
+SURPLUS_PHASE_DWELL: Final = 600.0     # s between two phase switches at least
+SURPLUS_CURRENT_DEADBAND: Final = 1.0  # A, smallest current change worth a write
+
+# Charging session statistics
+SESSION_END_STATES: Final = (1,)       # Not Connected
+SESSION_UNKNOWN_STATE: Final = 0
+SESSION_MAX_GAP: Final = 300.0         # s, longer gaps between polls are not averaged
+SESSION_SAVE_DELAY: Final = 60         # s
+EVENT_SESSION_FINISHED: Final = f"{DOMAIN}_session_finished"
+
+# High-rate capture to ring files in <config>/vool_modbus
+CAPTURE_DIRECTORY: Final = DOMAIN
+CAPTURE_MIN_INTERVAL: Final = 0.2      # s
+CAPTURE_DEFAULT_INTERVAL: Final = 0.5  # s
+CAPTURE_DEFAULT_SIZE: Final = 16       # MB
+CAPTURE_MAX_SIZE: Final = 1024         # MB
+
+# Local Modbus TCP proxy sharing the upstream connection
+PROXY_CACHE_MAX_AGE: Final = 15.0      # s, older cached registers are read upstream
+DEFAULT_PROXY_HOST: Final = "127.0.0.1"  # other hosts only when configured explicitly
+
+# Group commands across many chargers
+GROUP_DEFAULT_CONCURRENCY: Final = 8
+GROUP_MAX_CONCURRENCY: Final = 64
+GROUP_MAX_STAGGER: Final = 60.0        # s between two devices at most
+
+# On-demand profiling of polling cycles
+PROFILE_DEFAULT_CYCLES: Final = 10
+PROFILE_MAX_CYCLES: Final = 100
+PROFILE_TIMEOUT_MARGIN: Final = 30.0   # s added to twice the expected duration
+
+# Charging schedules executed by the coordinator
+SCHEDULE_MAX_SLOTS: Final = 96
+
+# Logging on the polling path
+LOG_RATE_LIMIT_INTERVAL: Final = 300.0  # s between two records of a repeating message
+CYCLE_TRACE_MAX_EVERY: Final = 10000
+
+# Site aggregates of chargers polled on shared wall-clock boundaries
+SITE_GRACE: Final = 2.0                # s to wait for late snapshots of a cycle
+SITE_CHARGING_STATE: Final = 3         # Charging
+
+# hass.data keys for objects shared by all config entries
+DATA_ALLOCATOR: Final = f"{DOMAIN}_allocator"
+DATA_SITE: Final = f"{DOMAIN}_site"
+
+# Storage
+STORAGE_VERSION: Final = 1
+
+# Register capability probing
+# Blocks are probed once per device and re-probed at a low rate so firmware
+# upgrades that add or remove registers are picked up.
+CAPABILITY_READABLE: Final = "readable"
+CAPABILITY_WRITABLE: Final = "writable"
+CAPABILITY_UNSUPPORTED: Final = "unsupported"
+CAPABILITY_REPROBE_INTERVAL: Final = 24 * 60 * 60  # seconds
+
 # =============================================================================
 # Modbus Register Addresses - ALL are Holding Registers (FC03 read, FC06 write)
 # Based on official VOOL Modbus Interface Manual
@@ -43,6 +203,33 @@ REG_CHARGING_COMMAND: Final = 500   # uint, enum, W only
 REG_EXTERNAL_CURRENT_LIMIT: Final = 501  # uint, A × 0.01, R/W
 REG_EXTERNAL_ALLOWED_PHASES: Final = 502  # uint, binary, R/W
 
+# Control registers whose last written value is re-asserted when a poll shows
+# the charger no longer holds it (e.g. after a firmware reset)
+HEARTBEAT_REGISTERS: Final = (REG_EXTERNAL_CURRENT_LIMIT, REG_EXTERNAL_ALLOWED_PHASES)
+# Consecutive polls a re-asserted value may fail to stick before the heartbeat
+# gives up on it (e.g. a limit the charger clamps), until it is written again
+HEARTBEAT_MAX_REASSERTS: Final = 5
+
+# =============================================================================
+# Load Management Controller (LMC)
+# The LMC answers the status (100-111), energy (200-201) and control (501-502)
+# registers with site-level values: grid currents/voltages/power, site energy
+# and the site current limit.
+#
+# ASSUMED, not from the VOOL Modbus Interface Manual: a per-charger allocation
+# table as input registers (FC04), one fixed-size record per managed charger.
+# It is only read when the LMC Allocation Table option is enabled, and a
+# device answering it with an exception response stops being asked.
+# =============================================================================
+REG_LMC_ALLOCATION_BASE: Final = 1000  # input registers, FC04
+LMC_ALLOCATION_STRIDE: Final = 4    # registers per charger record
+LMC_MAX_CHARGERS: Final = 16
+# Offsets within a charger record
+LMC_OFFSET_STATE: Final = 0         # uint, enum (same values as register 100)
+LMC_OFFSET_CURRENT: Final = 1       # uint, allocated A × 0.01
+LMC_OFFSET_PHASES: Final = 2        # uint, binary, allocated phases
+LMC_OFFSET_POWER: Final = 3         # int, kW × 0.01
+
 # Charging Command Values (for register 500)
 # Per spec: 1 = Start, 2 = Stop
 CHARGING_CMD_START: Final = 1
@@ -1,26 +1,42 @@
 """Data coordinator for VOOL Modbus integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
-from typing import Any
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
-from pymodbus.client import AsyncModbusTcpClient
 from pymodbus.exceptions import ModbusException
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
+    CONF_ALIGNED_POLLING,
+    CONF_BAUDRATE,
     CONF_DEVICE_TYPE,
+    CONF_LMC_ALLOCATIONS,
     CONF_SLAVE_ID,
+    CONF_SLAVE_IDS,
+    CONF_TRANSPORT,
     DEVICE_TYPE_CHARGER,
+    DEVICE_TYPE_LMC,
+    DEFAULT_BAUDRATE,
     DEFAULT_MODBUS_PORT,
     DEFAULT_SLAVE_ID,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TRANSPORT,
+    EVENT_SESSION_FINISHED,
+    HEARTBEAT_MAX_REASSERTS,
+    HEARTBEAT_REGISTERS,
+    TRANSPORT_RTU_OVER_TCP,
     # Status registers (100-111)
     REG_CHARGER_STATE,
     REG_REQUESTED_PHASES,
@@ -38,12 +54,54 @@ from .const import (
     REG_ENERGY_IMPORTED,
     # Control registers
     REG_CHARGING_COMMAND,
+    REG_EXTERNAL_CURRENT_LIMIT,
+    REG_EXTERNAL_ALLOWED_PHASES,
+    # Load Management Controller
+    LMC_ALLOCATION_STRIDE,
+    LMC_MAX_CHARGERS,
+    LMC_OFFSET_STATE,
+    LMC_OFFSET_CURRENT,
+    LMC_OFFSET_PHASES,
+    LMC_OFFSET_POWER,
 )
 
+from .capabilities import (
+    BLOCK_CONTROL,
+    BLOCK_CONTROL_RW,
+    BLOCK_ENERGY,
+    BLOCK_LMC_ALLOCATIONS,
+    CHARGER_BLOCKS,
+    LMC_ALLOCATION_BLOCKS,
+    LMC_BLOCKS,
+    CapabilityProbeError,
+    DeviceCapabilities,
+    RegisterBlock,
+    VoolCapabilityStore,
+    async_probe_capabilities,
+    async_read_block,
+)
 from .pymodbus_compat import (
+    VoolPymodbusCompatError,
     async_read_holding_registers,
+    async_read_input_registers,
     async_write_register,
+    async_write_registers,
 )
+from .capture import VoolCaptureManager
+from .history import DeviceHistory
+from .logs import CycleTracer, RateLimitedLogger
+from .metrics import BusLock, CoordinatorStats, MeteredClient
+from .session import VoolSessionTracker
+from .snapshot import DeviceSnapshot
+from .spans import MAX_WRITE_COUNT, coalesce
+from .telemetry import VoolTelemetryStream
+from .trace import RecordingClient, TraceRecorder
+from .transport import create_client, read_gap
+
+if TYPE_CHECKING:
+    from .profiling import VoolProfiler
+    from .schedule import VoolScheduleExecutor
+    from .surplus import VoolSurplusController
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -55,53 +113,386 @@ def _signed16(value: int) -> int:
     return value
 
 
-class VoolModbusCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Coordinator to manage data updates from VOOL device."""
+def decode_status(regs: list[int]) -> dict[str, Any]:
+    """Decode the status registers 100-111."""
+    base = REG_CHARGER_STATE
+
+    return {
+        "charger_state": regs[REG_CHARGER_STATE - base],
+        "requested_phases": regs[REG_REQUESTED_PHASES - base],
+        # Current registers are signed int16, A × 0.01
+        "current_l1": _signed16(regs[REG_CURRENT_L1 - base]) * 0.01,
+        "current_l2": _signed16(regs[REG_CURRENT_L2 - base]) * 0.01,
+        "current_l3": _signed16(regs[REG_CURRENT_L3 - base]) * 0.01,
+        # Voltage registers are signed int16, V × 0.1
+        "voltage_l1": _signed16(regs[REG_VOLTAGE_L1 - base]) * 0.1,
+        "voltage_l2": _signed16(regs[REG_VOLTAGE_L2 - base]) * 0.1,
+        "voltage_l3": _signed16(regs[REG_VOLTAGE_L3 - base]) * 0.1,
+        # Power registers are signed int16, kW × 0.01
+        "active_power": _signed16(regs[REG_ACTIVE_POWER - base]) * 0.01,
+        "l1_power": _signed16(regs[REG_ACTIVE_POWER_L1 - base]) * 0.01,
+        "l2_power": _signed16(regs[REG_ACTIVE_POWER_L2 - base]) * 0.01,
+        "l3_power": _signed16(regs[REG_ACTIVE_POWER_L3 - base]) * 0.01,
+    }
+
+
+def derive_metrics(
+    data: dict[str, Any], energy_rate: tuple[float, float] | None = None
+) -> dict[str, Any]:
+    """Compute derived electrical values from one decoded status snapshot.
+
+    All per-phase values come from a single pass over the phase triples.
+    ``energy_rate`` is the energy delta in kWh and the elapsed time in hours
+    since the previous poll, used for the power from the energy counter.
+    """
+    derived: dict[str, Any] = {}
+    total_current = 0.0
+    total_apparent = 0.0
+    currents: list[float] = []
+    for phase, current, voltage in zip(
+        ("l1", "l2", "l3"),
+        (data.get("current_l1"), data.get("current_l2"), data.get("current_l3")),
+        (data.get("voltage_l1"), data.get("voltage_l2"), data.get("voltage_l3")),
+    ):
+        if current is None or voltage is None:
+            return derived
+        apparent = abs(current) * voltage / 1000  # kVA
+        derived[f"apparent_power_{phase}"] = round(apparent, 3)
+        total_current += current
+        total_apparent += apparent
+        currents.append(abs(current))
+
+    derived["total_current"] = round(total_current, 2)
+    derived["apparent_power"] = round(total_apparent, 3)
+
+    active_power = data.get("active_power")
+    if active_power is not None and total_apparent >= 0.05:
+        derived["power_factor"] = round(max(min(active_power / total_apparent, 1.0), -1.0), 3)
+    else:
+        derived["power_factor"] = None
+
+    peak = max(currents)
+    derived["current_imbalance"] = round((peak - min(currents)) / peak * 100, 1) if peak >= 1.0 else 0.0
+
+    if energy_rate is not None:
+        energy, hours = energy_rate
+        derived["energy_power"] = round(energy / hours, 3) if hours > 0 and energy >= 0 else None
+
+    return derived
+
+
+def _apply_control_values(data: dict[str, Any], address: int, values: list[int]) -> bool:
+    """Update decoded control values in a snapshot from raw register values.
+
+    Return True if any value in the snapshot was updated.
+    """
+    changed = False
+    for register, value in enumerate(values, start=address):
+        if register == REG_EXTERNAL_CURRENT_LIMIT:
+            data["external_current_limit"] = value * 0.01
+        elif register == REG_EXTERNAL_ALLOWED_PHASES:
+            data["external_allowed_phases"] = value
+        elif register == REG_CHARGING_COMMAND and "charging_command" in data:
+            data["charging_command"] = value
+        else:
+            continue
+        changed = True
+    return changed
+
+
+def _observed_control_values(data: dict[str, Any]) -> dict[int, int]:
+    """Return the raw values of the heartbeat registers found in a snapshot."""
+    observed: dict[int, int] = {}
+    if "external_current_limit" in data:
+        observed[REG_EXTERNAL_CURRENT_LIMIT] = round(data["external_current_limit"] * 100)
+    if "external_allowed_phases" in data:
+        observed[REG_EXTERNAL_ALLOWED_PHASES] = data["external_allowed_phases"]
+    return observed
+
+
+class VoolModbusCoordinator(DataUpdateCoordinator[dict[int, DeviceSnapshot]]):
+    """Coordinator to manage data updates from VOOL devices.
+
+    A config entry is either a single device or a hub: a Modbus gateway with a
+    list of slave IDs. Both are read over one connection in one cycle and the
+    data is a snapshot per slave ID.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client_factory: Callable[[], Any] | None = None,
+    ) -> None:
+        """Initialize the coordinator.
+
+        ``client_factory`` replaces the Modbus client, for example with a
+        trace replay client.
+        """
+        config = {**entry.data, **entry.options}
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        """Initialize the coordinator."""
         self.entry = entry
-        self.host = entry.data[CONF_HOST]
-        self.port = int(entry.data.get(CONF_PORT, DEFAULT_MODBUS_PORT))
-        self.slave_id = int(entry.data.get(CONF_SLAVE_ID, DEFAULT_SLAVE_ID))
-        self.device_type = entry.data.get(CONF_DEVICE_TYPE, DEVICE_TYPE_CHARGER)
-        self._client: AsyncModbusTcpClient | None = None
+        self.host = config[CONF_HOST]
+        self.port = int(config.get(CONF_PORT, DEFAULT_MODBUS_PORT))
+        self.transport = config.get(CONF_TRANSPORT, DEFAULT_TRANSPORT)
+        # Serial speed behind an RTU-over-TCP converter
+        self.baudrate = int(config.get(CONF_BAUDRATE, DEFAULT_BAUDRATE))
+        # Unrequested registers a bulk read may include to save a request,
+        # only worth it where every frame costs bus time
+        self.read_gap = read_gap(self.baudrate) if self.transport == TRANSPORT_RTU_OVER_TCP else 0
+        self.is_hub = CONF_SLAVE_IDS in config
+        if self.is_hub:
+            self.slave_ids: list[int] = [int(slave_id) for slave_id in config[CONF_SLAVE_IDS]]
+        else:
+            self.slave_ids = [int(config.get(CONF_SLAVE_ID, DEFAULT_SLAVE_ID))]
+        # First (or only) slave, kept for single device entries
+        self.slave_id = self.slave_ids[0]
+        self.device_type = config.get(CONF_DEVICE_TYPE, DEVICE_TYPE_CHARGER)
+        # The LMC allocation table layout is assumed, so it is only read on request
+        self.lmc_allocations = self.device_type == DEVICE_TYPE_LMC and bool(config.get(CONF_LMC_ALLOCATIONS))
+        if self.device_type != DEVICE_TYPE_LMC:
+            self.blocks = CHARGER_BLOCKS
+        else:
+            self.blocks = LMC_ALLOCATION_BLOCKS if self.lmc_allocations else LMC_BLOCKS
+        self._client_factory = client_factory or self._create_client
+        self._client: Any = None
         self._connected = False
+        self._trace: TraceRecorder | None = None
+        # Raw register values and when they were read, per slave and register
+        # table (True for input registers), served by the Modbus TCP proxy
+        self._register_cache: dict[tuple[int, bool], dict[int, tuple[int, float]]] = {}
+        # Serialises bus access between polling, writes and the telemetry stream
+        self._lock = BusLock()
+        # Poll and request counters served by the metrics endpoint
+        self.stats = CoordinatorStats()
+        self._capability_store = VoolCapabilityStore(hass, entry.entry_id)
+        self._capabilities: dict[int, DeviceCapabilities] | None = None
+        self.telemetry = VoolTelemetryStream(self)
+        self.capture = VoolCaptureManager(self)
+        self.sessions = (
+            VoolSessionTracker(hass, entry.entry_id) if self.device_type == DEVICE_TYPE_CHARGER else None
+        )
+        # Raw control values last written per slave, re-asserted when a poll
+        # shows drift or once after a reconnect, never on a timer
+        self._desired: dict[int, dict[int, int]] = {}
+        self._reassert_pending: set[int] = set()
+        # Consecutive polls each desired register was found drifted, per slave
+        self._drift_streaks: dict[int, dict[int, int]] = {}
+        # Energy counter and monotonic time of the previous poll per slave
+        self._last_energy: dict[int, tuple[float, float]] = {}
+        self.limit_drift_events: dict[int, int] = {}
+        # Set up by the integration when solar surplus charging is configured
+        self.surplus: VoolSurplusController | None = None
+        # Set up by the integration for chargers, see the charging schedule services
+        self.scheduler: VoolScheduleExecutor | None = None
+        # Profile run in progress, see the profile service
+        self.profiler: VoolProfiler | None = None
+        # Aligned entries poll on wall-clock multiples of the scan interval
+        # instead of their own timer, see async_start_aligned_polling
+        self.aligned = bool(config.get(CONF_ALIGNED_POLLING))
+        self._aligned_instant: float | None = None
+        self._aligned_task: asyncio.Task[None] | None = None
+        # Instant of the latest snapshot and whether it was an aligned cycle
+        self.sample_time: float | None = None
+        self.sample_aligned = False
+        # Errors that repeat every poll are logged once per interval
+        self._log = RateLimitedLogger(_LOGGER)
+        # Sampled per-cycle trace records, see the trace_cycles service
+        self.tracer = CycleTracer(entry.title)
+        # Downsampled history per device, see the history websocket command
+        self.history = {slave_id: DeviceHistory() for slave_id in self.slave_ids}
 
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN}_{entry.entry_id}",
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            update_interval=None if self.aligned else timedelta(seconds=DEFAULT_SCAN_INTERVAL),
         )
 
+    def device_key(self, slave_id: int) -> str:
+        """Return the identifier of the device behind a slave ID."""
+        return f"{self.host}_{slave_id}"
+
+    @property
+    def bus_waiting(self) -> int:
+        """Return the number of tasks waiting for the Modbus connection."""
+        return self._lock.waiting
+
+    def device_name(self, slave_id: int) -> str:
+        """Return the device name for a slave ID."""
+        if self.is_hub:
+            return f"{self.entry.title} Charger {slave_id}"
+        return self.entry.title
+
     async def _ensure_connected(self) -> bool:
         """Ensure we are connected to the Modbus device."""
         if self._client is None or not self._connected:
-            self._client = AsyncModbusTcpClient(
-                host=self.host,
-                port=self.port,
-                timeout=10,
-            )
+            self._client = MeteredClient(self._client_factory(), self.stats)
+            if self._trace is not None:
+                self._client = RecordingClient(self._client, self._trace)
             self._connected = await self._client.connect()
+            if self._connected:
+                self.stats.connects += 1
+                self._reassert_pending = set(self._desired)
         return self._connected
 
+    def _create_client(self) -> Any:
+        """Create the Modbus client of the configured transport."""
+        return create_client(self.host, self.port, 10, self.transport, self.baudrate)
+
+    async def async_start_trace(self, path: str) -> None:
+        """Record every Modbus request and response into a trace file."""
+        await self.async_stop_trace()
+        async with self._lock:
+            self._trace = TraceRecorder(
+                path,
+                {
+                    "host": self.host,
+                    "port": self.port,
+                    "transport": self.transport,
+                    "slave_ids": self.slave_ids,
+                    "device_type": self.device_type,
+                    "created": dt_util.utcnow().isoformat(),
+                    # A replay starts without probing, see trace_capabilities
+                    "capabilities": {
+                        str(slave_id): capabilities.as_dict()
+                        for slave_id, capabilities in (self._capabilities or {}).items()
+                    },
+                },
+            )
+            if self._client is not None and not isinstance(self._client, RecordingClient):
+                self._client = RecordingClient(self._client, self._trace)
+        await self.hass.async_add_executor_job(self._trace.write, self._trace.take())
+
+    async def async_stop_trace(self) -> TraceRecorder | None:
+        """Stop recording and write the rest of the trace. Return the recorder."""
+        async with self._lock:
+            trace, self._trace = self._trace, None
+            if isinstance(self._client, RecordingClient):
+                self._client = self._client.client
+        if trace is not None:
+            await self.hass.async_add_executor_job(trace.write, trace.take())
+        return trace
+
     async def async_close(self) -> None:
         """Close the Modbus connection."""
+        await self.telemetry.async_stop()
+        await self.capture.async_stop()
+        await self.async_stop_trace()
+        self.tracer.enable(0)
+        if self.profiler is not None:
+            self.profiler.finish()
         if self._client is not None:
             self._client.close()
             self._client = None
             self._connected = False
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from the VOOL device."""
+    @callback
+    def async_start_aligned_polling(self) -> CALLBACK_TYPE:
+        """Poll on wall-clock boundaries shared by every aligned entry.
+
+        Return a callback that stops polling.
+        """
+
+        @callback
+        def handle_tick(now: datetime) -> None:
+            if self._aligned_task is not None and not self._aligned_task.done():
+                _LOGGER.debug("Previous poll of %s still running, skipping %s", self.host, now)
+                return
+            self._aligned_instant = round(now.timestamp() / DEFAULT_SCAN_INTERVAL) * DEFAULT_SCAN_INTERVAL
+            self._aligned_task = self.hass.async_create_background_task(
+                self.async_refresh(), f"{self.name}_aligned_refresh"
+            )
+
+        return async_track_time_change(
+            self.hass, handle_tick, second=list(range(0, 60, DEFAULT_SCAN_INTERVAL))
+        )
+
+    async def _async_update_data(self) -> dict[int, DeviceSnapshot]:
+        """Fetch data from every VOOL device behind the connection."""
+        aligned, self._aligned_instant = self._aligned_instant, None
+        sample_time = dt_util.utcnow().timestamp() if aligned is None else float(aligned)
+        record = self.tracer.begin()
+        started = time.perf_counter()
+        try:
+            async with self._lock:
+                if record is not None:
+                    record.mark("lock")
+                data = await self._async_read_all()
+        except UpdateFailed as err:
+            self.stats.add_poll(time.perf_counter() - started, False)
+            if record is not None:
+                self.tracer.emit(record, aligned=aligned is not None, error=str(err))
+            raise
+        self.stats.add_poll(time.perf_counter() - started, True)
+        if record is not None:
+            record.mark("read")
+
+        # Every snapshot carries the instant it was sampled at, so snapshots
+        # of different entries can be matched
+        for slave_id, device_data in data.items():
+            device_data["sample_time"] = sample_time
+            self.history[slave_id].add(sample_time, device_data)
+        self.sample_time = sample_time
+        self.sample_aligned = aligned is not None
+
+        if self._trace is not None and self._trace.needs_flush:
+            await self.hass.async_add_executor_job(self._trace.write, self._trace.take())
+
+        if self.sessions is not None:
+            await self._async_update_sessions(data)
+
+        if record is not None:
+            self.tracer.emit(
+                record,
+                aligned=aligned is not None,
+                devices=len(data),
+                failed=[slave_id for slave_id in self.slave_ids if slave_id not in data],
+            )
+        return data
+
+    async def _async_update_sessions(self, data: dict[int, DeviceSnapshot]) -> None:
+        """Update the session statistics and announce finished sessions."""
+        if not self.sessions.loaded:
+            await self.sessions.async_load()
+
+        now = dt_util.utcnow().timestamp()
+        for slave_id, device_data in data.items():
+            if (finished := self.sessions.update(slave_id, device_data, now)) is None:
+                continue
+            _LOGGER.debug("Charging session on %s (slave %s) finished: %s", self.host, slave_id, finished)
+            self.hass.bus.async_fire(
+                EVENT_SESSION_FINISHED,
+                {
+                    "entry_id": self.entry.entry_id,
+                    "slave_id": slave_id,
+                    "device_name": self.device_name(slave_id),
+                    **finished,
+                },
+            )
+
+    async def _async_read_all(self) -> dict[int, DeviceSnapshot]:
+        """Read every device in one planned cycle."""
         try:
             if not await self._ensure_connected():
                 raise UpdateFailed("Failed to connect to Modbus device")
 
-            data: dict[str, Any] = {}
-            data = await self._read_charger_data()
-            data.update(await self._read_charger_holding_registers())
+            data: dict[int, DeviceSnapshot] = {}
+            errors: list[str] = []
+
+            for slave_id in self.slave_ids:
+                try:
+                    data[slave_id] = await self._async_read_device(slave_id)
+                    await self._async_reassert_controls(slave_id, data[slave_id])
+                except (UpdateFailed, ModbusException) as err:
+                    if not self.is_hub:
+                        raise
+                    # One offline charger must not take the whole hub down
+                    _LOGGER.debug("Error reading slave %s on %s: %s", slave_id, self.host, err)
+                    errors.append(f"slave {slave_id}: {err}")
+
+            if not data:
+                raise UpdateFailed(f"No device answered: {'; '.join(errors)}")
 
             return data
 
@@ -112,50 +503,215 @@ class VoolModbusCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             self._connected = False
             raise UpdateFailed(f"Error communicating with device: {err}") from err
 
-    async def _read_charger_data(self) -> dict[str, Any]:
+    async def _async_read_device(self, slave_id: int) -> DeviceSnapshot:
+        """Read all supported register blocks of one device."""
+        capabilities = await self._async_ensure_capabilities(slave_id)
+
+        data = DeviceSnapshot(await self._read_charger_data(slave_id, capabilities))
+        data.update(await self._read_charger_holding_registers(slave_id, capabilities))
+        if self.lmc_allocations:
+            data.update(await self._read_lmc_allocations(slave_id, capabilities))
+
+        data.update(derive_metrics(data, self._energy_rate(slave_id, data)))
+        return data
+
+    def _energy_rate(self, slave_id: int, data: dict[str, Any]) -> tuple[float, float] | None:
+        """Return the energy delta (kWh) and elapsed hours since the previous poll."""
+        if (energy := data.get("energy_imported")) is None:
+            return None
+        now = time.monotonic()
+        previous = self._last_energy.get(slave_id)
+        self._last_energy[slave_id] = (energy, now)
+        if previous is None:
+            return None
+        return energy - previous[0], (now - previous[1]) / 3600
+
+    async def _async_reassert_controls(self, slave_id: int, data: dict[str, Any]) -> None:
+        """Write the desired control values back if the device lost them.
+
+        Called with the bus lock held, right after the device was polled.
+        """
+        observed = _observed_control_values(data)
+        if observed:
+            data["limit_drift_events"] = self.limit_drift_events.get(slave_id, 0)
+
+        desired = self._desired.get(slave_id)
+        if not desired:
+            return
+
+        streaks = self._drift_streaks.setdefault(slave_id, {})
+        drifted: dict[int, int] = {}
+        for register, value in list(desired.items()):
+            if register not in observed:
+                continue
+            if observed[register] == value:
+                streaks.pop(register, None)
+                continue
+            streaks[register] = streaks.get(register, 0) + 1
+            if streaks[register] <= HEARTBEAT_MAX_REASSERTS:
+                drifted[register] = observed[register]
+                continue
+            # The device does not keep this value, e.g. it clamps it to its maximum
+            del desired[register]
+            del streaks[register]
+            _LOGGER.warning(
+                "%s (slave %s) did not keep %s in register %s after %s re-asserts (reads %s), "
+                "no longer re-asserting it until it is written again",
+                self.host,
+                slave_id,
+                value,
+                register,
+                HEARTBEAT_MAX_REASSERTS,
+                observed[register],
+            )
+        if not desired:
+            self._reassert_pending.discard(slave_id)
+            return
+
+        if drifted:
+            self.limit_drift_events[slave_id] = self.limit_drift_events.get(slave_id, 0) + 1
+            data["limit_drift_events"] = self.limit_drift_events[slave_id]
+            self._log.warning(
+                ("drift", slave_id),
+                "%s (slave %s) no longer holds the written control values (read %s, expected %s), re-asserting",
+                self.host,
+                slave_id,
+                drifted,
+                {register: desired[register] for register in drifted},
+            )
+        elif slave_id not in self._reassert_pending:
+            return
+
+        # After a reconnect everything is written once, otherwise only what drifted
+        values = desired if slave_id in self._reassert_pending else {
+            register: desired[register] for register in drifted
+        }
+        registers = sorted(values)
+        if registers == list(range(registers[0], registers[0] + len(registers))):
+            writes = [(registers[0], [values[register] for register in registers])]
+        else:
+            writes = [(register, [values[register]]) for register in registers]
+
+        for address, raw in writes:
+            try:
+                if len(raw) == 1:
+                    result = await async_write_register(self._client, address, raw[0], slave_id)
+                else:
+                    result = await async_write_registers(self._client, address, raw, slave_id)
+            except ModbusException as err:
+                result = err
+            if isinstance(result, ModbusException) or result.isError():
+                # The poll itself succeeded, retry on the next one
+                self._log.warning(
+                    ("reassert", slave_id),
+                    "Error re-asserting registers at %s on slave %s: %s",
+                    address,
+                    slave_id,
+                    result,
+                )
+                return
+            _apply_control_values(data, address, raw)
+
+        self._reassert_pending.discard(slave_id)
+        self._log.clear(("reassert", slave_id))
+
+    @callback
+    def _remember_desired(self, slave_id: int, address: int, values: list[int]) -> None:
+        """Remember written heartbeat register values as the desired state."""
+        for register, value in enumerate(values, start=address):
+            if register in HEARTBEAT_REGISTERS:
+                self._desired.setdefault(slave_id, {})[register] = value
+                self._drift_streaks.get(slave_id, {}).pop(register, None)
+
+    def seed_capabilities(self, capabilities: dict[int, DeviceCapabilities]) -> None:
+        """Use known capabilities instead of stored ones, for example those of a trace."""
+        self._capabilities = dict(capabilities)
+
+    async def _async_ensure_capabilities(self, slave_id: int) -> DeviceCapabilities:
+        """Return the register capabilities of a device, probing if needed."""
+        if self._capabilities is None:
+            self._capabilities = await self._capability_store.async_load()
+
+        capabilities = self._capabilities.get(slave_id)
+        if capabilities is not None and not capabilities.is_stale():
+            return capabilities
+
+        try:
+            probed = await async_probe_capabilities(
+                self._client, slave_id, self.device_type, self.blocks, capabilities
+            )
+        except CapabilityProbeError as err:
+            if capabilities is None:
+                raise UpdateFailed(str(err)) from err
+            # Keep using the cached result and try again next cycle
+            _LOGGER.debug("Capability re-probe of %s (slave %s) failed: %s", self.host, slave_id, err)
+            return capabilities
+
+        if capabilities is not None and capabilities.fingerprint != probed.fingerprint:
+            _LOGGER.info(
+                "Register capabilities of %s (slave %s) changed from %s to %s",
+                self.host,
+                slave_id,
+                capabilities.fingerprint,
+                probed.fingerprint,
+            )
+        else:
+            _LOGGER.debug("Register capabilities of %s (slave %s): %s", self.host, slave_id, probed.blocks)
+
+        self._capabilities[slave_id] = probed
+        await self._capability_store.async_save()
+        return probed
+
+    def _mark_block_unsupported(
+        self, slave_id: int, capabilities: DeviceCapabilities, block: RegisterBlock
+    ) -> None:
+        """Stop reading a block the device rejected with an exception response."""
+        if capabilities.mark_unsupported(block):
+            _LOGGER.warning(
+                "%s (slave %s) does not support registers %s-%s, they will no longer be read",
+                self.host,
+                slave_id,
+                block.address,
+                block.address + block.count - 1,
+            )
+            self._capability_store.async_schedule_save()
+
+    async def _read_charger_data(
+        self, slave_id: int, capabilities: DeviceCapabilities
+    ) -> dict[str, Any]:
         """Read charger status registers (100-111) - all are holding registers."""
         data: dict[str, Any] = {}
 
         # Read status registers 100-111 (12 registers) using FC03 (holding registers)
         result = await async_read_holding_registers(
-            self._client, REG_CHARGER_STATE, 12, self.slave_id
+            self._client, REG_CHARGER_STATE, 12, slave_id
         )
 
         if result.isError():
             raise UpdateFailed(f"Error reading charger data: {result}")
 
         regs = result.registers
-        base = REG_CHARGER_STATE
+        self._cache_registers(slave_id, REG_CHARGER_STATE, regs)
 
-        # Debug logging to help diagnose issues
-        _LOGGER.debug(
-            "Raw registers 100-111: %s",
-            [regs[i] for i in range(12)]
-        )
+        # Debug logging to help diagnose issues, formatted only when enabled
+        _LOGGER.debug("Raw registers 100-111 (slave %s): %s", slave_id, regs)
 
-        data["charger_state"] = regs[REG_CHARGER_STATE - base]
-        data["requested_phases"] = regs[REG_REQUESTED_PHASES - base]
-        # Current registers are signed int16, A × 0.01
-        data["current_l1"] = _signed16(regs[REG_CURRENT_L1 - base]) * 0.01
-        data["current_l2"] = _signed16(regs[REG_CURRENT_L2 - base]) * 0.01
-        data["current_l3"] = _signed16(regs[REG_CURRENT_L3 - base]) * 0.01
-        # Voltage registers are signed int16, V × 0.1
-        data["voltage_l1"] = _signed16(regs[REG_VOLTAGE_L1 - base]) * 0.1
-        data["voltage_l2"] = _signed16(regs[REG_VOLTAGE_L2 - base]) * 0.1
-        data["voltage_l3"] = _signed16(regs[REG_VOLTAGE_L3 - base]) * 0.1
-        # Power registers are signed int16, kW × 0.01
-        data["active_power"] = _signed16(regs[REG_ACTIVE_POWER - base]) * 0.01
-        data["l1_power"] = _signed16(regs[REG_ACTIVE_POWER_L1 - base]) * 0.01
-        data["l2_power"] = _signed16(regs[REG_ACTIVE_POWER_L2 - base]) * 0.01
-        data["l3_power"] = _signed16(regs[REG_ACTIVE_POWER_L3 - base]) * 0.01
+        data.update(decode_status(regs))
+
+        if not capabilities.is_readable(BLOCK_ENERGY):
+            return data
 
         # Read energy imported (registers 200-201, uint32)
         energy_result = await async_read_holding_registers(
-            self._client, REG_ENERGY_IMPORTED, 2, self.slave_id
+            self._client, REG_ENERGY_IMPORTED, 2, slave_id
         )
 
-        if not energy_result.isError():
+        if energy_result.isError():
+            if getattr(energy_result, "exception_code", None) is not None:
+                self._mark_block_unsupported(slave_id, capabilities, BLOCK_ENERGY)
+        else:
             energy_regs = energy_result.registers
+            self._cache_registers(slave_id, REG_ENERGY_IMPORTED, energy_regs)
             # uint32: MSB at 200, LSB at 201
             data["energy_imported"] = (
                 (energy_regs[0] << 16) | energy_regs[1]
@@ -163,54 +719,332 @@ class VoolModbusCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
         return data
 
-    async def _read_charger_holding_registers(self) -> dict[str, Any]:
-        """Read charger control registers (500-502)."""
+    async def _read_charger_holding_registers(
+        self, slave_id: int, capabilities: DeviceCapabilities
+    ) -> dict[str, Any]:
+        """Read charger control registers (500-502, or 501-502 if 500 is not readable)."""
         data: dict[str, Any] = {}
 
-        # Read control registers 500-502 (charging command, current limit, and phases)
+        if BLOCK_CONTROL in self.blocks and capabilities.is_readable(BLOCK_CONTROL):
+            block = BLOCK_CONTROL
+        elif capabilities.is_readable(BLOCK_CONTROL_RW):
+            block = BLOCK_CONTROL_RW
+        else:
+            return data
+
         result = await async_read_holding_registers(
-            self._client, REG_CHARGING_COMMAND, 3, self.slave_id
+            self._client, block.address, block.count, slave_id
         )
 
         if result.isError():
-            _LOGGER.warning("Error reading control registers: %s", result)
+            if getattr(result, "exception_code", None) is not None:
+                self._mark_block_unsupported(slave_id, capabilities, block)
+            else:
+                self._log.warning(
+                    ("control", slave_id), "Error reading control registers of slave %s: %s", slave_id, result
+                )
             return data
 
+        self._log.clear(("control", slave_id))
         regs = result.registers
+        base = block.address
+        self._cache_registers(slave_id, base, regs)
 
-        data["charging_command"] = regs[0]  # 1=Start, 2=Stop
-        data["external_current_limit"] = regs[1] * 0.01  # A × 0.01
-        data["external_allowed_phases"] = regs[2]
+        if block is BLOCK_CONTROL:
+            data["charging_command"] = regs[REG_CHARGING_COMMAND - base]  # 1=Start, 2=Stop
+        data["external_current_limit"] = regs[REG_EXTERNAL_CURRENT_LIMIT - base] * 0.01  # A × 0.01
+        data["external_allowed_phases"] = regs[REG_EXTERNAL_ALLOWED_PHASES - base]
 
         return data
 
-    async def async_write_register(self, address: int, value: int) -> bool:
-        """Write a value to a holding register."""
+    async def _read_lmc_allocations(
+        self, slave_id: int, capabilities: DeviceCapabilities
+    ) -> dict[str, Any]:
+        """Read the per-charger allocation table of a Load Management Controller.
+
+        The table layout is assumed, see const.py. One FC04 request returns
+        every managed charger, so an LMC site needs a single poll instead of
+        one per charger.
+        """
+        data: dict[str, Any] = {}
+
+        if not capabilities.is_readable(BLOCK_LMC_ALLOCATIONS):
+            return data
+
+        result = await async_read_block(self._client, BLOCK_LMC_ALLOCATIONS, slave_id)
+
+        if result.isError():
+            if getattr(result, "exception_code", None) is not None:
+                self._mark_block_unsupported(slave_id, capabilities, BLOCK_LMC_ALLOCATIONS)
+            else:
+                self._log.warning(
+                    ("lmc", slave_id), "Error reading LMC allocation registers of slave %s: %s", slave_id, result
+                )
+            return data
+
+        self._log.clear(("lmc", slave_id))
+        regs = result.registers
+        self._cache_registers(slave_id, BLOCK_LMC_ALLOCATIONS.address, regs, input_registers=True)
+        active_chargers = 0
+        allocated_current = 0.0
+
+        for index in range(LMC_MAX_CHARGERS):
+            base = index * LMC_ALLOCATION_STRIDE
+            state = regs[base + LMC_OFFSET_STATE]
+            if state == 0:
+                # Unused slot
+                continue
+            slot = index + 1
+            current = regs[base + LMC_OFFSET_CURRENT] * 0.01  # A × 0.01
+            data[f"charger_{slot}_state"] = state
+            data[f"charger_{slot}_allocated_current"] = current
+            data[f"charger_{slot}_allocated_phases"] = regs[base + LMC_OFFSET_PHASES]
+            data[f"charger_{slot}_power"] = _signed16(regs[base + LMC_OFFSET_POWER]) * 0.01
+            active_chargers += 1
+            allocated_current += current
+
+        data["lmc_active_chargers"] = active_chargers
+        data["lmc_allocated_current"] = round(allocated_current, 2)
+
+        return data
+
+    async def async_read_status(self, slave_id: int) -> dict[str, Any] | None:
+        """Read and decode only the status registers (100-111) of a device.
+
+        This is the fast register group used for live telemetry; it bypasses the
+        regular update cycle and never notifies entity listeners.
+        """
+        async with self._lock:
+            try:
+                if not await self._ensure_connected():
+                    return None
+                result = await async_read_holding_registers(
+                    self._client, REG_CHARGER_STATE, 12, slave_id
+                )
+            except ModbusException as err:
+                self._connected = False
+                _LOGGER.debug("Error reading status of slave %s: %s", slave_id, err)
+                return None
+
+        if result.isError():
+            return None
+        self._cache_registers(slave_id, REG_CHARGER_STATE, result.registers)
+        return decode_status(result.registers)
+
+    async def async_read_raw_blocks(
+        self, slave_id: int, blocks: tuple[RegisterBlock, ...]
+    ) -> list[int] | None:
+        """Read raw register blocks of a device back to back under one lock.
+
+        Blocks the device does not support are filled with zeros so every
+        result has the same length. Return None if the device did not answer.
+        """
+        capabilities = (self._capabilities or {}).get(slave_id)
+        registers: list[int] = []
+        async with self._lock:
+            try:
+                if not await self._ensure_connected():
+                    return None
+                for block in blocks:
+                    if capabilities is not None and not capabilities.is_readable(block):
+                        registers.extend([0] * block.count)
+                        continue
+                    result = await async_read_block(self._client, block, slave_id)
+                    if result.isError():
+                        return None
+                    registers.extend(result.registers[: block.count])
+                    self._cache_registers(
+                        slave_id, block.address, result.registers, input_registers=block.input_registers
+                    )
+            except ModbusException as err:
+                self._connected = False
+                _LOGGER.debug("Error reading raw registers of slave %s: %s", slave_id, err)
+                return None
+        return registers
+
+    @callback
+    def _cache_registers(
+        self, slave_id: int, address: int, registers: list[int], input_registers: bool = False
+    ) -> None:
+        """Remember raw register values read from a device."""
+        now = time.monotonic()
+        cache = self._register_cache.setdefault((slave_id, input_registers), {})
+        for register, value in enumerate(registers, start=address):
+            cache[register] = (value, now)
+
+    @callback
+    def _update_cached_registers(self, slave_id: int, address: int, values: list[int]) -> None:
+        """Update cached holding registers after a write.
+
+        Only registers that were read before are updated, write-only registers
+        must not become readable from the cache.
+        """
+        cache = self._register_cache.get((slave_id, False))
+        if cache is None:
+            return
+        now = time.monotonic()
+        for register, value in enumerate(values, start=address):
+            if register in cache:
+                cache[register] = (value, now)
+
+    @callback
+    def cached_registers(
+        self, slave_id: int, input_registers: bool, address: int, count: int, max_age: float
+    ) -> list[int] | None:
+        """Return raw register values from the cache if all are fresh enough."""
+        cache = self._register_cache.get((slave_id, input_registers))
+        if cache is None:
+            return None
+        oldest = time.monotonic() - max_age
+        registers: list[int] = []
+        for register in range(address, address + count):
+            if (cached := cache.get(register)) is None or cached[1] < oldest:
+                return None
+            registers.append(cached[0])
+        return registers
+
+    async def async_forward_read(
+        self, slave_id: int, input_registers: bool, address: int, count: int
+    ) -> Any:
+        """Read registers upstream for another Modbus client, queued on the bus lock.
+
+        Return the pymodbus response, or None if the device could not be reached.
+        """
+        async with self._lock:
+            try:
+                if not await self._ensure_connected():
+                    return None
+                if input_registers:
+                    result = await async_read_input_registers(self._client, address, count, slave_id)
+                else:
+                    result = await async_read_holding_registers(self._client, address, count, slave_id)
+            except ModbusException as err:
+                self._connected = False
+                _LOGGER.debug("Error forwarding read of slave %s: %s", slave_id, err)
+                return None
+
+        if not result.isError():
+            self._cache_registers(slave_id, address, result.registers[:count], input_registers)
+        return result
+
+    async def async_write_register(
+        self,
+        address: int,
+        value: int,
+        slave_id: int | None = None,
+        refresh: bool = True,
+    ) -> bool:
+        """Write a value to a holding register.
+
+        With ``refresh`` disabled the cached value is updated in place instead
+        of re-reading the device, which keeps control loops fast.
+        """
+        if slave_id is None:
+            slave_id = self.slave_id
+
         try:
-            if not await self._ensure_connected():
-                raise UpdateFailed("Failed to connect to Modbus device")
+            async with self._lock:
+                if not await self._ensure_connected():
+                    raise UpdateFailed("Failed to connect to Modbus device")
+
+                result = await async_write_register(self._client, address, value, slave_id)
 
-            result = await async_write_register(self._client, address, value, self.slave_id)
-            
             if result.isError():
-                _LOGGER.error("Error writing register %s: %s", address, result)
+                self._log.error(("write", slave_id), "Error writing register %s: %s", address, result)
                 return False
-            
-            # Trigger a data refresh
-            await self.async_request_refresh()
+            self._log.clear(("write", slave_id))
+
+            capabilities = (self._capabilities or {}).get(slave_id)
+            if capabilities is not None and capabilities.mark_written(address, self.blocks):
+                self._capability_store.async_schedule_save()
+            self._remember_desired(slave_id, address, [value])
+            self._update_cached_registers(slave_id, address, [value])
+
+            if refresh:
+                # Trigger a data refresh
+                await self.async_request_refresh()
+            else:
+                self._apply_written_values(slave_id, address, [value])
             return True
 
         except Exception as err:
-            _LOGGER.error("Error writing to Modbus device: %s", err)
+            self._log.error(("write", slave_id), "Error writing to Modbus device: %s", err)
             return False
 
+    async def async_write_registers(
+        self,
+        address: int,
+        values: list[int],
+        slave_id: int | None = None,
+        refresh: bool = True,
+    ) -> bool:
+        """Write consecutive holding registers in a single request (FC16)."""
+        if slave_id is None:
+            slave_id = self.slave_id
+
+        try:
+            async with self._lock:
+                if not await self._ensure_connected():
+                    raise UpdateFailed("Failed to connect to Modbus device")
+
+                result = await async_write_registers(self._client, address, values, slave_id)
+
+            if result.isError():
+                self._log.error(
+                    ("write", slave_id), "Error writing registers %s-%s: %s", address, address + len(values) - 1, result
+                )
+                return False
+            self._log.clear(("write", slave_id))
+
+            capabilities = (self._capabilities or {}).get(slave_id)
+            if capabilities is not None and capabilities.mark_written(address, self.blocks):
+                self._capability_store.async_schedule_save()
+            self._remember_desired(slave_id, address, values)
+            self._update_cached_registers(slave_id, address, values)
+
+            if refresh:
+                await self.async_request_refresh()
+            else:
+                self._apply_written_values(slave_id, address, values)
+            return True
+
+        except (UpdateFailed, ModbusException, OSError, VoolPymodbusCompatError) as err:
+            self._log.error(("write", slave_id), "Error writing to Modbus device: %s", err)
+            return False
+
+    async def async_write_register_map(
+        self, registers: dict[int, int], slave_id: int | None = None
+    ) -> tuple[bool, int]:
+        """Write scattered registers, consecutive ones in a single request.
+
+        The cached snapshot is updated in place instead of re-reading the
+        device. Return success and the number of requests sent.
+        """
+        spans = coalesce(registers, MAX_WRITE_COUNT)
+        for sent, span in enumerate(spans, start=1):
+            values = [registers[address] for address in range(span.address, span.end + 1)]
+            if span.count == 1:
+                ok = await self.async_write_register(span.address, values[0], slave_id, refresh=False)
+            else:
+                ok = await self.async_write_registers(span.address, values, slave_id, refresh=False)
+            if not ok:
+                return False, sent
+        return True, len(spans)
+
+    @callback
+    def _apply_written_values(self, slave_id: int, address: int, values: list[int]) -> None:
+        """Update the cached snapshot after a write that skipped the refresh."""
+        data = (self.data or {}).get(slave_id)
+        if data is not None and _apply_control_values(data, address, values):
+            self.async_update_listeners()
+
     @property
     def device_info(self) -> dict[str, Any]:
         """Return device information."""
         return {
-            "identifiers": {(DOMAIN, f"{self.host}_{self.slave_id}")},
-            "name": self.entry.title,
+            "identifiers": {(DOMAIN, self.device_key(self.slave_id))},
+            "name": self.device_name(self.slave_id),
             "manufacturer": "VOOL",
-            "model": "Charger",
+            "model": "Charger" if self.device_type == DEVICE_TYPE_CHARGER else "LMC",
             "configuration_url": f"http://{self.host}",
         }
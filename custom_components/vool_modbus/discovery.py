@@ -0,0 +1,196 @@
+"""Network discovery of VOOL chargers for the VOOL Modbus integration."""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    CHARGER_STATE_MAP,
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_CONNECT_TIMEOUT,
+    DISCOVERY_MAX_HOSTS,
+    DISCOVERY_MAX_UNANSWERED,
+    DISCOVERY_READ_TIMEOUT,
+    REG_CHARGER_STATE,
+)
+from .pymodbus_compat import VoolPymodbusCompatError, async_read_holding_registers
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class InvalidNetwork(ValueError):
+    """Raised when a network range can not be scanned."""
+
+
+@dataclass(frozen=True)
+class DiscoveredCharger:
+    """A VOOL charger found during a network scan."""
+
+    host: str
+    port: int
+    slave_id: int
+    charger_state: int
+
+    @property
+    def unique_id(self) -> str:
+        """Return the config entry unique ID for this charger."""
+        return f"{self.host}_{self.slave_id}"
+
+
+def parse_slave_ids(value: str) -> list[int]:
+    """Parse a slave ID list such as "1, 2, 5-7" into sorted unique IDs."""
+    slave_ids: set[int] = set()
+    for part in value.replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, _, last = part.partition("-")
+            start, end = int(first), int(last)
+            if start > end:
+                raise ValueError(f"Invalid slave ID range: {part}")
+            slave_ids.update(range(start, end + 1))
+        else:
+            slave_ids.add(int(part))
+
+    if not slave_ids or min(slave_ids) < 1 or max(slave_ids) > 247:
+        raise ValueError(f"Slave IDs must be between 1 and 247: {value}")
+    return sorted(slave_ids)
+
+
+def network_hosts(network: str) -> list[str]:
+    """Return the host addresses of a CIDR range, e.g. 192.168.1.0/24."""
+    try:
+        net = ipaddress.ip_network(network.strip(), strict=False)
+    except ValueError as err:
+        raise InvalidNetwork(str(err)) from err
+
+    if net.num_addresses > DISCOVERY_MAX_HOSTS + 2:
+        raise InvalidNetwork(f"{network} is larger than {DISCOVERY_MAX_HOSTS} hosts")
+
+    if net.num_addresses <= 2:
+        # /31 and /32 have no network/broadcast address
+        return [str(address) for address in net]
+    return [str(address) for address in net.hosts()]
+
+
+def is_plausible_status(regs: list[int]) -> bool:
+    """Return True if registers 100-111 look like a VOOL charger status block."""
+    if len(regs) < 12:
+        return False
+
+    def signed(value: int) -> int:
+        return value - 0x10000 if value >= 0x8000 else value
+
+    if regs[0] not in CHARGER_STATE_MAP or regs[1] > 0b111:
+        return False
+    # Currents A × 0.01, voltages V × 0.1, power kW × 0.01
+    if any(abs(signed(value)) > 8000 for value in regs[2:5]):
+        return False
+    if any(not 0 <= signed(value) <= 3000 for value in regs[5:8]):
+        return False
+    return all(abs(signed(value)) <= 6000 for value in regs[8:12])
+
+
+async def async_port_open(host: str, port: int, timeout: float) -> bool:
+    """Return True if a TCP connection to host:port can be opened."""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, TimeoutError):
+        return False
+
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
+
+
+async def async_probe_host(
+    host: str,
+    port: int,
+    slave_ids: list[int],
+    timeout: float = DISCOVERY_READ_TIMEOUT,
+) -> list[DiscoveredCharger]:
+    """Read the status block of every candidate slave ID on a Modbus TCP host.
+
+    Unknown slave IDs are answered with an exception right away, but behind a
+    serial gateway each one times out. Probing a host stops once
+    ``DISCOVERY_MAX_UNANSWERED`` requests went unanswered, which bounds a
+    host to a few read timeouts instead of one per candidate ID.
+    """
+    from pymodbus.client import AsyncModbusTcpClient
+    from pymodbus.exceptions import ModbusException
+
+    found: list[DiscoveredCharger] = []
+    unanswered = 0
+    client: Any = AsyncModbusTcpClient(host=host, port=port, timeout=timeout, retries=0)
+
+    try:
+        if not await client.connect():
+            return found
+
+        for slave_id in slave_ids:
+            if unanswered >= DISCOVERY_MAX_UNANSWERED:
+                _LOGGER.debug("Giving up on %s:%s after %s unanswered requests", host, port, unanswered)
+                break
+            try:
+                result = await async_read_holding_registers(client, REG_CHARGER_STATE, 12, slave_id)
+            except VoolPymodbusCompatError as err:
+                _LOGGER.debug("No compatible read for %s:%s slave %s: %s", host, port, slave_id, err)
+                continue
+            except (ModbusException, OSError, TimeoutError) as err:
+                _LOGGER.debug("No answer from %s:%s slave %s: %s", host, port, slave_id, err)
+                unanswered += 1
+                continue
+
+            if result.isError():
+                # An error without exception code is a timeout or a garbled frame
+                if getattr(result, "exception_code", None) is None:
+                    unanswered += 1
+                continue
+            if not is_plausible_status(result.registers):
+                continue
+
+            found.append(DiscoveredCharger(host, port, slave_id, result.registers[0]))
+    finally:
+        client.close()
+
+    return found
+
+
+async def async_scan_network(
+    network: str,
+    port: int,
+    slave_ids: list[int],
+    concurrency: int = DISCOVERY_CONCURRENCY,
+    connect_timeout: float = DISCOVERY_CONNECT_TIMEOUT,
+    read_timeout: float = DISCOVERY_READ_TIMEOUT,
+    exclude: set[str] | None = None,
+) -> list[DiscoveredCharger]:
+    """Scan a CIDR range for VOOL chargers.
+
+    Hosts in ``exclude``, such as those of configured entries, are skipped
+    without opening a connection. The other hosts are first checked for an
+    open Modbus TCP port with a short connect timeout; only responsive hosts
+    are probed for a plausible status block. At most ``concurrency`` hosts
+    are contacted at the same time.
+    """
+    hosts = [host for host in network_hosts(network) if not exclude or host not in exclude]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def scan(host: str) -> list[DiscoveredCharger]:
+        async with semaphore:
+            if not await async_port_open(host, port, connect_timeout):
+                return []
+            return await async_probe_host(host, port, slave_ids, read_timeout)
+
+    results = await asyncio.gather(*(scan(host) for host in hosts))
+    found = [charger for chargers in results for charger in chargers]
+
+    _LOGGER.debug("Scanned %s hosts in %s, found %s chargers", len(hosts), network, len(found))
+    return found
@@ -0,0 +1,133 @@
+"""Long-term energy statistics import for VOOL Modbus integration.
+
+Instead of recording the energy counter as a sensor state every poll and
+letting the recorder compile statistics from those states, hourly sum/state
+statistics are built incrementally from the raw counter (registers 200-201)
+and imported as external statistics. Only one row per device and hour is
+written to the database.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import DOMAIN
+from .coordinator import VoolModbusCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _CounterState:
+    """Running statistic of one device's energy counter."""
+
+    counter: float | None = None
+    sum: float = 0.0
+    # Hour of the last counter sample and the last hour that was imported
+    hour: datetime | None = None
+    imported_hour: datetime | None = None
+
+
+class VoolEnergyStatistics:
+    """Import hourly energy statistics for the devices of a coordinator."""
+
+    def __init__(self, hass: HomeAssistant, coordinator: VoolModbusCoordinator) -> None:
+        """Initialize the importer."""
+        self.hass = hass
+        self._coordinator = coordinator
+        self._states: dict[int, _CounterState] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+        self.imported = 0
+
+    def statistic_id(self, slave_id: int) -> str:
+        """Return the external statistic ID of a device."""
+        return f"{DOMAIN}:energy_{slugify(self._coordinator.device_key(slave_id))}"
+
+    def _metadata(self, slave_id: int) -> StatisticMetaData:
+        return StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"{self._coordinator.device_name(slave_id)} Energy Imported",
+            source=DOMAIN,
+            statistic_id=self.statistic_id(slave_id),
+            unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        )
+
+    async def async_start(self) -> None:
+        """Continue from the last imported statistics and follow the coordinator."""
+        for slave_id in self._coordinator.slave_ids:
+            statistic_id = self.statistic_id(slave_id)
+            last = await get_instance(self.hass).async_add_executor_job(
+                get_last_statistics, self.hass, 1, statistic_id, True, {"sum", "state"}
+            )
+            state = _CounterState()
+            if rows := last.get(statistic_id):
+                row = rows[0]
+                state.counter = row.get("state")
+                state.sum = row.get("sum") or 0.0
+                start = row["start"]
+                state.imported_hour = (
+                    dt_util.utc_from_timestamp(start) if isinstance(start, (int, float)) else start
+                )
+            self._states[slave_id] = state
+
+        self._unsub = self._coordinator.async_add_listener(self._async_handle_update)
+        self._async_handle_update()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the coordinator."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_handle_update(self) -> None:
+        """Feed the latest counter values, importing every completed hour."""
+        hour = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        for slave_id, state in self._states.items():
+            data = (self._coordinator.data or {}).get(slave_id)
+            if data is None or (counter := data.get("energy_imported")) is None:
+                continue
+
+            if (
+                state.hour is not None
+                and hour > state.hour
+                and state.counter is not None
+                and (state.imported_hour is None or state.hour > state.imported_hour)
+            ):
+                # The first sample of a new hour closes the previous one
+                async_add_external_statistics(
+                    self.hass,
+                    self._metadata(slave_id),
+                    [StatisticData(start=state.hour, state=state.counter, sum=state.sum)],
+                )
+                state.imported_hour = state.hour
+                self.imported += 1
+
+            if state.counter is not None:
+                if counter >= state.counter:
+                    state.sum += counter - state.counter
+                else:
+                    # The counter went backwards, so it restarted from zero
+                    _LOGGER.info(
+                        "Energy counter of %s reset from %.3f to %.3f kWh",
+                        self._coordinator.device_name(slave_id),
+                        state.counter,
+                        counter,
+                    )
+                    state.sum += counter
+            state.counter = counter
+            state.hour = hour
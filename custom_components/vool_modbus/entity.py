@@ -6,6 +6,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, DEVICE_TYPE_CHARGER
 from .coordinator import VoolModbusCoordinator
+from .snapshot import DeviceSnapshot
 
 
 class VoolModbusEntity(CoordinatorEntity[VoolModbusCoordinator]):
@@ -17,18 +18,27 @@ class VoolModbusEntity(CoordinatorEntity[VoolModbusCoordinator]):
         self,
         coordinator: VoolModbusCoordinator,
         entity_key: str,
+        slave_id: int | None = None,
     ) -> None:
         """Initialize the entity."""
         super().__init__(coordinator)
         self._entity_key = entity_key
-        self._attr_unique_id = f"{coordinator.host}_{coordinator.slave_id}_{entity_key}"
+        self._slave_id = coordinator.slave_id if slave_id is None else slave_id
+        self._attr_unique_id = f"{coordinator.device_key(self._slave_id)}_{entity_key}"
+
+    @property
+    def device_data(self) -> DeviceSnapshot | None:
+        """Return the latest snapshot of this entity's device."""
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.get(self._slave_id)
 
     @property
     def device_info(self) -> DeviceInfo:
         """Return device information."""
         return DeviceInfo(
-            identifiers={(DOMAIN, f"{self.coordinator.host}_{self.coordinator.slave_id}")},
-            name=self.coordinator.entry.title,
+            identifiers={(DOMAIN, self.coordinator.device_key(self._slave_id))},
+            name=self.coordinator.device_name(self._slave_id),
             manufacturer="VOOL",
             model="Charger" if self.coordinator.device_type == DEVICE_TYPE_CHARGER else "LMC",
             configuration_url=f"http://{self.coordinator.host}",
@@ -37,4 +47,4 @@ class VoolModbusEntity(CoordinatorEntity[VoolModbusCoordinator]):
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return self.coordinator.last_update_success
+        return self.coordinator.last_update_success and self.device_data is not None
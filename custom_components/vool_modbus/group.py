@@ -0,0 +1,84 @@
+"""Group commands across VOOL devices for VOOL Modbus integration.
+
+A group command writes the same charging command (500), current limit (501)
+and allowed phases (502) to many chargers. Devices are written concurrently
+with a bounded number of requests in flight, so a fleet-wide command takes
+about one round trip per wave of ``max_concurrency`` devices. An optional
+stagger spaces the devices out to avoid every car starting at once.
+
+Devices behind the same gateway share one connection, so their writes still
+queue one after the other on that connection.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from .coordinator import VoolModbusCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class GroupTarget:
+    """A device addressed by a group command."""
+
+    device_id: str
+    coordinator: VoolModbusCoordinator
+    slave_id: int
+
+    @property
+    def name(self) -> str:
+        """Return the device name."""
+        return self.coordinator.device_name(self.slave_id)
+
+
+async def async_group_command(
+    targets: list[GroupTarget],
+    registers: dict[int, int],
+    max_concurrency: int,
+    stagger: float = 0.0,
+) -> dict[str, Any]:
+    """Write registers to many devices and return a per-device report."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+    started = time.monotonic()
+    report: dict[str, dict[str, Any]] = {}
+
+    async def run(index: int, target: GroupTarget) -> None:
+        if stagger:
+            await asyncio.sleep(index * stagger)
+        async with semaphore:
+            device_started = time.monotonic()
+            ok, requests = await target.coordinator.async_write_register_map(registers, target.slave_id)
+        result: dict[str, Any] = {
+            "name": target.name,
+            "success": ok,
+            "latency_ms": round((time.monotonic() - device_started) * 1000, 1),
+            "requests": requests,
+        }
+        if not ok:
+            result["error"] = "Write failed"
+        report[target.device_id] = result
+
+    await asyncio.gather(*(run(index, target) for index, target in enumerate(targets)))
+
+    # One refresh per connection instead of one per device
+    for coordinator in {target.coordinator for target in targets}:
+        await coordinator.async_request_refresh()
+
+    succeeded = sum(result["success"] for result in report.values())
+    _LOGGER.debug(
+        "Group command to %d devices: %d succeeded in %.0f ms",
+        len(targets),
+        succeeded,
+        (time.monotonic() - started) * 1000,
+    )
+    return {
+        "devices": report,
+        "succeeded": succeeded,
+        "failed": len(report) - succeeded,
+        "duration_ms": round((time.monotonic() - started) * 1000, 1),
+    }
@@ -0,0 +1,183 @@
+"""In-memory multi-resolution history for VOOL Modbus integration.
+
+Every poll feeds the numeric fields of each device into ring buffers: a raw
+tier with one sample per poll, and aggregate tiers with the minimum, maximum
+and average of fixed buckets (1 minute and 15 minutes by default). All
+buffers are float32 arrays allocated once per device, so memory stays fixed
+however long Home Assistant runs, and an update only touches the current
+slot of each tier.
+
+Dashboards query the history with the ``vool_modbus/history`` websocket
+command instead of the recorder. The history is not persisted and starts
+empty after a restart.
+"""
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Any
+
+from .const import HISTORY_FIELDS, HISTORY_RAW_SIZE, HISTORY_TIERS
+from .snapshot import FIELD_INDEX, DeviceSnapshot
+
+NAN = math.nan
+TIER_RAW = "raw"
+
+_INDEXES = tuple(FIELD_INDEX[key] for key in HISTORY_FIELDS)
+
+
+def _value(value: float) -> float | None:
+    """Return a stored value for JSON, None for a gap."""
+    return None if math.isnan(value) else round(value, 3)
+
+
+class _RawTier:
+    """One sample per poll."""
+
+    def __init__(self, size: int) -> None:
+        """Allocate the buffers."""
+        self.size = size
+        self.times = array("d", [NAN]) * size
+        self.values = array("f", [NAN]) * (size * len(HISTORY_FIELDS))
+        self.position = 0
+        self.count = 0
+
+    def add(self, timestamp: float, values: list[float]) -> None:
+        """Store a sample in the oldest slot."""
+        position = self.position
+        self.times[position] = timestamp
+        base = position * len(HISTORY_FIELDS)
+        self.values[base : base + len(values)] = array("f", values)
+        self.position = (position + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def slots(self, start: float, end: float) -> list[int]:
+        """Return the slots with samples from start to end, oldest first."""
+        first = self.position - self.count
+        slots = [(first + offset) % self.size for offset in range(self.count)]
+        return [slot for slot in slots if start <= self.times[slot] <= end]
+
+    def query(self, fields: tuple[int, ...], start: float, end: float) -> dict[str, Any]:
+        """Return the samples from start to end."""
+        slots = self.slots(start, end)
+        width = len(HISTORY_FIELDS)
+        return {
+            "t": [self.times[slot] for slot in slots],
+            **{
+                HISTORY_FIELDS[field]: [_value(self.values[slot * width + field]) for slot in slots]
+                for field in fields
+            },
+        }
+
+    @property
+    def oldest(self) -> float | None:
+        """Return the time of the oldest sample."""
+        return self.times[(self.position - self.count) % self.size] if self.count else None
+
+
+class _AggregateTier(_RawTier):
+    """Minimum, maximum and average of fixed buckets."""
+
+    def __init__(self, step: int, size: int) -> None:
+        """Allocate the buffers."""
+        super().__init__(size)
+        self.step = step
+        self.minimums = array("f", [NAN]) * (size * len(HISTORY_FIELDS))
+        self.maximums = array("f", [NAN]) * (size * len(HISTORY_FIELDS))
+        # The open bucket: its number and running totals per field
+        self.bucket: int | None = None
+        self._sums = [0.0] * len(HISTORY_FIELDS)
+        self._counts = [0] * len(HISTORY_FIELDS)
+        self._minimums = [NAN] * len(HISTORY_FIELDS)
+        self._maximums = [NAN] * len(HISTORY_FIELDS)
+
+    def add(self, timestamp: float, values: list[float]) -> None:
+        """Add a sample to its bucket, closing the previous bucket first."""
+        bucket = int(timestamp // self.step)
+        if bucket != self.bucket:
+            self._close()
+            self.bucket = bucket
+        sums, counts, minimums, maximums = self._sums, self._counts, self._minimums, self._maximums
+        for field, value in enumerate(values):
+            if math.isnan(value):
+                continue
+            sums[field] += value
+            counts[field] += 1
+            if not value >= minimums[field]:
+                minimums[field] = value
+            if not value <= maximums[field]:
+                maximums[field] = value
+
+    def _close(self) -> None:
+        """Store the open bucket in the oldest slot and reset the totals."""
+        if self.bucket is None:
+            return
+        width = len(HISTORY_FIELDS)
+        base = self.position * width
+        self.times[self.position] = self.bucket * self.step
+        for field in range(width):
+            count = self._counts[field]
+            self.values[base + field] = self._sums[field] / count if count else NAN
+            self.minimums[base + field] = self._minimums[field]
+            self.maximums[base + field] = self._maximums[field]
+        self.position = (self.position + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        self._sums = [0.0] * width
+        self._counts = [0] * width
+        self._minimums = [NAN] * width
+        self._maximums = [NAN] * width
+
+    def query(self, fields: tuple[int, ...], start: float, end: float) -> dict[str, Any]:
+        """Return the buckets from start to end, the open one last."""
+        slots = self.slots(start, end)
+        width = len(HISTORY_FIELDS)
+        times = [self.times[slot] for slot in slots]
+        result: dict[str, Any] = {"t": times}
+        include_open = self.bucket is not None and start <= self.bucket * self.step <= end
+        if include_open:
+            times.append(float(self.bucket * self.step))
+        for field in fields:
+            series = {
+                "min": [_value(self.minimums[slot * width + field]) for slot in slots],
+                "max": [_value(self.maximums[slot * width + field]) for slot in slots],
+                "avg": [_value(self.values[slot * width + field]) for slot in slots],
+            }
+            if include_open:
+                count = self._counts[field]
+                series["min"].append(_value(self._minimums[field]))
+                series["max"].append(_value(self._maximums[field]))
+                series["avg"].append(round(self._sums[field] / count, 3) if count else None)
+            result[HISTORY_FIELDS[field]] = series
+        return result
+
+
+class DeviceHistory:
+    """Raw and aggregate history of one device."""
+
+    def __init__(self) -> None:
+        """Allocate every tier."""
+        self.tiers: dict[str, _RawTier] = {TIER_RAW: _RawTier(HISTORY_RAW_SIZE)}
+        for name, step, size in HISTORY_TIERS:
+            self.tiers[name] = _AggregateTier(step, size)
+
+    def add(self, timestamp: float, data: DeviceSnapshot) -> None:
+        """Add the values of one poll."""
+        at = data.at
+        values = [NAN if (value := at(index)) is None else float(value) for index in _INDEXES]
+        for tier in self.tiers.values():
+            tier.add(timestamp, values)
+
+    def resolution(self, start: float) -> str:
+        """Return the finest tier that reaches back to start."""
+        for name, tier in self.tiers.items():
+            # A tier that did not wrap yet still holds everything since startup
+            if tier.count < tier.size or tier.oldest <= start:
+                return name
+        return next(reversed(self.tiers))
+
+    def query(
+        self, resolution: str, fields: tuple[str, ...], start: float, end: float
+    ) -> dict[str, Any]:
+        """Return the history of some fields at a resolution."""
+        indexes = tuple(HISTORY_FIELDS.index(key) for key in fields)
+        return {"resolution": resolution, **self.tiers[resolution].query(indexes, start, end)}
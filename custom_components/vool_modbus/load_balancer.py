@@ -0,0 +1,199 @@
+"""Closed-loop dynamic load balancing for VOOL Modbus integration.
+
+The controller follows the phase currents of a grid meter and keeps the
+charger's external current limit (register 501) below what the main fuse
+allows. It reacts directly to meter state changes and writes the register
+through the coordinator without waiting for a refresh. A meter that reports
+each phase as its own entity updates them together, so the changes of one
+event loop iteration are coalesced into a single controller step.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    LB_DEADBAND,
+    LB_KI,
+    LB_KP,
+    LB_MARGIN,
+    LB_MAX_CURRENT,
+    LB_MIN_CURRENT,
+    LB_RAMP_UP,
+    REG_EXTERNAL_CURRENT_LIMIT,
+)
+from .coordinator import VoolModbusCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PIController:
+    """Velocity form PI controller with output clamping and ramp limiting.
+
+    The velocity form integrates the output directly, so clamping the output
+    doubles as anti-windup.
+    """
+
+    def __init__(
+        self,
+        kp: float,
+        ki: float,
+        minimum: float,
+        maximum: float,
+        ramp_up: float,
+    ) -> None:
+        """Initialize the controller."""
+        self.kp = kp
+        self.ki = ki
+        self.minimum = minimum
+        self.maximum = maximum
+        self.ramp_up = ramp_up
+        self.output = minimum
+        self._last_error: float | None = None
+
+    def reset(self, output: float) -> None:
+        """Restart from a known output."""
+        self.output = min(max(output, self.minimum), self.maximum)
+        self._last_error = None
+
+    def update(self, error: float, dt: float) -> float:
+        """Return the new output for a headroom error (positive = room to grow)."""
+        delta_error = 0.0 if self._last_error is None else error - self._last_error
+        self._last_error = error
+
+        step = self.kp * delta_error + self.ki * error * dt
+        if error < 0:
+            # Above the fuse limit: shed at least the overshoot right away
+            step = min(step, error)
+        else:
+            step = min(step, self.ramp_up * dt)
+
+        self.output = min(max(self.output + step, self.minimum), self.maximum)
+        return self.output
+
+
+class VoolLoadBalancer:
+    """Keep a charger within the headroom left by a main fuse."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: VoolModbusCoordinator,
+        meter_entities: list[str],
+        main_fuse: float,
+    ) -> None:
+        """Initialize the load balancer."""
+        self.hass = hass
+        self._coordinator = coordinator
+        self._slave_id = coordinator.slave_id
+        self._meter_entities = meter_entities
+        self._main_fuse = main_fuse
+        # Below the charger minimum the limit drops to 0, which pauses charging
+        self._controller = PIController(LB_KP, LB_KI, 0.0, LB_MAX_CURRENT, LB_RAMP_UP)
+        self._last_written: float | None = None
+        self._last_update: float | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+        # Step scheduled for the end of the current event loop iteration
+        self._step: asyncio.Handle | None = None
+        self._step_time = 0.0
+        # Bumped on every write so a failed older write does not undo a newer one
+        self._generation = 0
+        self.writes = 0
+
+    @callback
+    def async_start(self) -> None:
+        """Start following the meter."""
+        data = (self._coordinator.data or {}).get(self._slave_id, {})
+        current_limit = data.get("external_current_limit")
+        if current_limit is not None:
+            self._controller.reset(current_limit)
+            self._last_written = current_limit
+
+        self._unsub = async_track_state_change_event(
+            self.hass, self._meter_entities, self._async_meter_changed
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the meter."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        if self._step is not None:
+            self._step.cancel()
+            self._step = None
+
+    def _phase_currents(self) -> list[float] | None:
+        """Return the current meter reading of every phase, or None if unknown."""
+        currents: list[float] = []
+        for entity_id in self._meter_entities:
+            state = self.hass.states.get(entity_id)
+            if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+                return None
+            try:
+                currents.append(abs(float(state.state)))
+            except ValueError:
+                return None
+        return currents
+
+    @callback
+    def _async_meter_changed(self, event: Event) -> None:
+        """Schedule one controller step for the meter phases changed together."""
+        self._step_time = event.time_fired.timestamp()
+        if self._step is None:
+            self._step = self.hass.loop.call_soon(self._async_step)
+
+    @callback
+    def _async_step(self) -> None:
+        """Recompute the limit from the latest meter reading."""
+        self._step = None
+        now = self._step_time
+        dt = 1.0 if self._last_update is None else min(max(now - self._last_update, 0.05), 10.0)
+        self._last_update = now
+
+        currents = self._phase_currents()
+        if currents is None:
+            # Without a meter reading fall back to the charger minimum
+            target = LB_MIN_CURRENT
+            self._controller.reset(target)
+        else:
+            headroom = self._main_fuse - LB_MARGIN - max(currents)
+            target = self._controller.update(headroom, dt)
+
+        if target < LB_MIN_CURRENT:
+            target = 0.0
+        target = math.floor(target * 10) / 10
+
+        if not self._should_write(target):
+            return
+
+        self._last_written = target
+        self._generation += 1
+        self.writes += 1
+        self.hass.async_create_task(self._async_write(target, self._generation))
+
+    def _should_write(self, target: float) -> bool:
+        """Return True if the setpoint moved enough to be worth a write."""
+        if self._last_written is None:
+            return True
+        delta = target - self._last_written
+        if target == 0.0 or self._last_written == 0.0:
+            return delta != 0.0
+        if delta < 0:
+            # Reductions protect the fuse: only skip rounding noise
+            return delta <= -0.2
+        return delta >= LB_DEADBAND
+
+    async def _async_write(self, target: float, generation: int) -> None:
+        """Write the new limit without waiting for a refresh."""
+        _LOGGER.debug("Load balancer setting %s to %.1f A", self._coordinator.host, target)
+        if not await self._coordinator.async_write_register(
+            REG_EXTERNAL_CURRENT_LIMIT, round(target * 100), self._slave_id, refresh=False
+        ) and generation == self._generation:
+            # Force a retry on the next meter update
+            self._last_written = None
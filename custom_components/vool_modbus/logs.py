@@ -0,0 +1,153 @@
+"""Rate-limited logging and sampled cycle traces for VOOL Modbus integration.
+
+Errors on the polling path repeat every cycle for as long as a device stays in
+a bad state. A rate-limited logger logs the first occurrence of a message,
+counts the repeats within a window and reports them as "repeated N times"
+with the next record it emits, or when the condition clears. Arguments are
+only formatted for records that are emitted.
+
+A cycle tracer emits one structured record for every Nth polling cycle of an
+entry on the ``cycles`` child logger. It is off by default and enabled at
+runtime with the trace_cycles service.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Hashable
+from typing import Any
+
+from .const import LOG_RATE_LIMIT_INTERVAL
+
+CYCLE_LOGGER = logging.getLogger(f"{__package__}.cycles")
+
+
+class _Suppressed:
+    """State of a rate-limited message."""
+
+    __slots__ = ("args", "count", "level", "msg", "since")
+
+    def __init__(self, since: float, level: int, msg: str, args: tuple[Any, ...]) -> None:
+        self.since = since
+        self.count = 0
+        self.level = level
+        self.msg = msg
+        self.args = args
+
+
+class RateLimitedLogger:
+    """Log each message at most once per interval.
+
+    Messages are identified by a key, for example the register block and
+    slave ID, so the same failure on two devices is logged for both.
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = LOG_RATE_LIMIT_INTERVAL) -> None:
+        """Initialize the rate-limited logger."""
+        self._logger = logger
+        self._interval = interval
+        self._state: dict[Hashable, _Suppressed] = {}
+
+    def log(self, level: int, key: Hashable, msg: str, *args: Any) -> None:
+        """Log a message unless the same key was logged within the interval."""
+        if not self._logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        state = self._state.get(key)
+        if state is not None and now - state.since < self._interval:
+            state.count += 1
+            state.args = args
+            return
+        self._state[key] = _Suppressed(now, level, msg, args)
+        if state is not None and state.count:
+            self._logger.log(
+                level, f"{msg} (repeated %d times in the last %d s)", *args, state.count, now - state.since
+            )
+        else:
+            self._logger.log(level, msg, *args)
+
+    def warning(self, key: Hashable, msg: str, *args: Any) -> None:
+        """Log a rate-limited warning."""
+        self.log(logging.WARNING, key, msg, *args)
+
+    def error(self, key: Hashable, msg: str, *args: Any) -> None:
+        """Log a rate-limited error."""
+        self.log(logging.ERROR, key, msg, *args)
+
+    def clear(self, key: Hashable) -> None:
+        """Forget a message once its condition cleared, reporting suppressed repeats."""
+        if not self._state or (state := self._state.pop(key, None)) is None:
+            return
+        if state.count:
+            self._logger.log(
+                state.level,
+                f"{state.msg} (repeated %d more times, cleared after %d s)",
+                *state.args,
+                state.count,
+                time.monotonic() - state.since,
+            )
+
+
+class CycleRecord:
+    """Timings of one traced polling cycle."""
+
+    __slots__ = ("cycle", "fields", "started")
+
+    def __init__(self, cycle: int) -> None:
+        """Start the record."""
+        self.cycle = cycle
+        self.started = time.monotonic()
+        self.fields: dict[str, Any] = {}
+
+    def mark(self, phase: str) -> None:
+        """Record the milliseconds from the start of the cycle to the end of a phase."""
+        self.fields[f"{phase}_ms"] = round((time.monotonic() - self.started) * 1000, 1)
+
+
+class CycleTracer:
+    """Emit a trace record for every Nth polling cycle of an entry."""
+
+    # Tracers of all entries share the cycles logger; its configured level is
+    # restored when the last one stops
+    _active = 0
+    _saved_level = logging.NOTSET
+
+    def __init__(self, name: str) -> None:
+        """Initialize the tracer, disabled."""
+        self._name = name
+        self.every = 0
+        self._cycle = 0
+
+    def enable(self, every: int) -> None:
+        """Trace every Nth cycle, 0 disables tracing."""
+        was_enabled = bool(self.every)
+        self.every = every
+        self._cycle = 0
+        if every and not was_enabled:
+            if not CycleTracer._active:
+                CycleTracer._saved_level = CYCLE_LOGGER.level
+                if not CYCLE_LOGGER.isEnabledFor(logging.INFO):
+                    # Tracing was asked for explicitly, show it without a logger change
+                    CYCLE_LOGGER.setLevel(logging.INFO)
+            CycleTracer._active += 1
+        elif was_enabled and not every:
+            CycleTracer._active -= 1
+            if not CycleTracer._active:
+                CYCLE_LOGGER.setLevel(CycleTracer._saved_level)
+
+    def begin(self) -> CycleRecord | None:
+        """Return a record if the cycle that starts is sampled, else None."""
+        if not self.every:
+            return None
+        self._cycle += 1
+        if self._cycle % self.every:
+            return None
+        return CycleRecord(self._cycle)
+
+    def emit(self, record: CycleRecord, **fields: Any) -> None:
+        """Log a finished record."""
+        record.mark("total")
+        record.fields.update(fields)
+        CYCLE_LOGGER.info(
+            "%s cycle %d: %s", self._name, record.cycle, record.fields, extra={"vool_cycle": record.fields}
+        )
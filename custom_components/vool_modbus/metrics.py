@@ -0,0 +1,316 @@
+"""Prometheus metrics endpoint for VOOL Modbus integration.
+
+``/api/vool_modbus/metrics`` serves the latest coordinator snapshot of every
+VOOL device and the integration's own counters in the Prometheus text
+format, without going through entity states. Scrapers authenticate with a
+long-lived access token as bearer token, like other Home Assistant APIs.
+
+The label sets and sample prefixes of the device values are built once per
+set of loaded entries, so a scrape only looks up and formats the numbers.
+"""
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .pymodbus_compat import MODBUS_CALLS
+from .snapshot import FIELD_INDEX
+
+if TYPE_CHECKING:
+    from .coordinator import VoolModbusCoordinator
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds of the poll duration histogram buckets
+POLL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Device values: metric name, type, help and the snapshot fields with their
+# extra labels. Derived values are left to PromQL.
+DEVICE_METRICS: tuple[tuple[str, str, str, tuple[tuple[str, str], ...]], ...] = (
+    ("vool_modbus_charger_state", "gauge", "Charger state code (register 100)", (("charger_state", ""),)),
+    ("vool_modbus_requested_phases", "gauge", "Phases requested by the vehicle, bitmask", (("requested_phases", ""),)),
+    (
+        "vool_modbus_current_amperes",
+        "gauge",
+        "Phase current",
+        (("current_l1", 'phase="L1"'), ("current_l2", 'phase="L2"'), ("current_l3", 'phase="L3"')),
+    ),
+    (
+        "vool_modbus_voltage_volts",
+        "gauge",
+        "Phase voltage",
+        (("voltage_l1", 'phase="L1"'), ("voltage_l2", 'phase="L2"'), ("voltage_l3", 'phase="L3"')),
+    ),
+    ("vool_modbus_active_power_kilowatts", "gauge", "Active power", (("active_power", ""),)),
+    (
+        "vool_modbus_phase_power_kilowatts",
+        "gauge",
+        "Active power per phase",
+        (("l1_power", 'phase="L1"'), ("l2_power", 'phase="L2"'), ("l3_power", 'phase="L3"')),
+    ),
+    (
+        "vool_modbus_energy_imported_kilowatt_hours_total",
+        "counter",
+        "Energy counter",
+        (("energy_imported", ""),),
+    ),
+    ("vool_modbus_charging_command", "gauge", "Charging command (1 start, 2 stop)", (("charging_command", ""),)),
+    (
+        "vool_modbus_current_limit_amperes",
+        "gauge",
+        "External current limit",
+        (("external_current_limit", ""),),
+    ),
+    ("vool_modbus_allowed_phases", "gauge", "External allowed phases, bitmask", (("external_allowed_phases", ""),)),
+    ("vool_modbus_lmc_active_chargers", "gauge", "Chargers managed by the LMC", (("lmc_active_chargers", ""),)),
+    (
+        "vool_modbus_lmc_allocated_current_amperes",
+        "gauge",
+        "Current allocated by the LMC",
+        (("lmc_allocated_current", ""),),
+    ),
+    (
+        "vool_modbus_limit_drift_events_total",
+        "counter",
+        "Polls that found the written control values changed",
+        (("limit_drift_events", ""),),
+    ),
+    ("vool_modbus_session_active", "gauge", "Charging session in progress", (("session_active", ""),)),
+    ("vool_modbus_session_energy_kilowatt_hours", "gauge", "Energy of the session", (("session_energy", ""),)),
+    ("vool_modbus_session_duration_seconds", "gauge", "Duration of the session", (("session_time", ""),)),
+    (
+        "vool_modbus_sample_timestamp_seconds",
+        "gauge",
+        "Instant the values were sampled at",
+        (("sample_time", ""),),
+    ),
+)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: Any) -> str:
+    """Format a sample value."""
+    if value is True:
+        return "1"
+    if value is False:
+        return "0"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _header(name: str, metric_type: str, help_text: str) -> str:
+    return f"# HELP {name} {help_text}\n# TYPE {name} {metric_type}\n"
+
+
+class BusLock(asyncio.Lock):
+    """Lock serialising bus access that counts the tasks waiting for it."""
+
+    def __init__(self) -> None:
+        """Initialize the lock."""
+        super().__init__()
+        self.waiting = 0
+
+    async def acquire(self) -> bool:
+        """Acquire the lock."""
+        self.waiting += 1
+        try:
+            return await super().acquire()
+        finally:
+            self.waiting -= 1
+
+
+class CoordinatorStats:
+    """Counters of the polls and Modbus requests of one coordinator."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.polls = 0
+        self.poll_errors = 0
+        self.poll_sum = 0.0
+        # Not cumulative, the last bucket counts polls above every bound
+        self.poll_buckets = [0] * (len(POLL_BUCKETS) + 1)
+        self.requests = dict.fromkeys(MODBUS_CALLS, 0)
+        self.request_errors = dict.fromkeys(MODBUS_CALLS, 0)
+        self.connects = 0
+
+    def add_poll(self, elapsed: float, success: bool) -> None:
+        """Count a poll that took a number of seconds."""
+        self.polls += 1
+        if not success:
+            self.poll_errors += 1
+        self.poll_sum += elapsed
+        self.poll_buckets[bisect_left(POLL_BUCKETS, elapsed)] += 1
+
+    def wrap_modbus_call(self, name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        """Return a counted version of a pymodbus client call."""
+        requests = self.requests
+        errors = self.request_errors
+
+        async def counted(*args: Any, **kwargs: Any) -> Any:
+            try:
+                result = await method(*args, **kwargs)
+            except TypeError:
+                # Signature probing of pymodbus_compat, not a request
+                raise
+            except Exception:
+                requests[name] += 1
+                errors[name] += 1
+                raise
+            requests[name] += 1
+            if result.isError():
+                errors[name] += 1
+            return result
+
+        return counted
+
+
+class MeteredClient:
+    """Count the Modbus calls of a pymodbus client, delegate everything else."""
+
+    def __init__(self, client: Any, stats: CoordinatorStats) -> None:
+        """Initialize the metered client."""
+        self.client = client
+        self.stats = stats
+        for name in MODBUS_CALLS:
+            if (method := getattr(client, name, None)) is not None:
+                setattr(self, name, stats.wrap_modbus_call(name, method))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+
+class MetricsRenderer:
+    """Render the metrics of every loaded VOOL entry."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the renderer."""
+        self.hass = hass
+        self._layout: tuple[tuple[int, tuple[int, ...]], ...] | None = None
+        self._coordinators: list[VoolModbusCoordinator] = []
+        self._coordinator_labels: list[str] = []
+        # Coordinator and slave ID of every device, in sample order
+        self._devices: list[tuple[VoolModbusCoordinator, int]] = []
+        # Per device metric: header and (device, field index, sample prefix)
+        self._families: list[tuple[str, list[tuple[int, int, str]]]] = []
+        self._up: list[str] = []
+
+    def _build(self, coordinators: list[VoolModbusCoordinator]) -> None:
+        """Build the label sets and sample prefixes of the loaded entries."""
+        self._coordinators = coordinators
+        self._coordinator_labels = [
+            f'host="{_escape(coordinator.host)}",entry="{_escape(coordinator.entry.title)}"'
+            for coordinator in coordinators
+        ]
+        self._devices = []
+        device_labels: list[str] = []
+        for coordinator in coordinators:
+            for slave_id in coordinator.slave_ids:
+                self._devices.append((coordinator, slave_id))
+                device_labels.append(
+                    f'host="{_escape(coordinator.host)}",slave="{slave_id}",'
+                    f'device="{_escape(coordinator.device_name(slave_id))}"'
+                )
+
+        self._up = [f"vool_modbus_up{{{labels}}} " for labels in device_labels]
+        self._families = []
+        for name, metric_type, help_text, fields in DEVICE_METRICS:
+            samples = [
+                (device, FIELD_INDEX[field], f"{name}{{{labels}{',' + extra if extra else ''}}} ")
+                for device, labels in enumerate(device_labels)
+                for field, extra in fields
+            ]
+            self._families.append((_header(name, metric_type, help_text), samples))
+
+    def render(self) -> str:
+        """Return the metrics in the Prometheus text format."""
+        coordinators: list[VoolModbusCoordinator] = list(self.hass.data.get(DOMAIN, {}).values())
+        layout = tuple((id(coordinator), tuple(coordinator.slave_ids)) for coordinator in coordinators)
+        if layout != self._layout:
+            self._build(coordinators)
+            self._layout = layout
+
+        parts: list[str] = []
+        append = parts.append
+        snapshots = [
+            (coordinator.data or {}).get(slave_id) if coordinator.last_update_success else None
+            for coordinator, slave_id in self._devices
+        ]
+
+        append(_header("vool_modbus_up", "gauge", "Device answered the latest poll"))
+        for prefix, data in zip(self._up, snapshots):
+            append(prefix)
+            append("0\n" if data is None else "1\n")
+
+        for header, samples in self._families:
+            append(header)
+            for device, index, prefix in samples:
+                if (data := snapshots[device]) is None or (value := data.at(index)) is None:
+                    continue
+                append(prefix)
+                append(_format(value))
+                append("\n")
+
+        self._render_internals(append)
+        return "".join(parts)
+
+    def _render_internals(self, append: Callable[[str], None]) -> None:
+        """Render the counters of every coordinator."""
+        entries = list(zip(self._coordinators, self._coordinator_labels))
+
+        append(_header("vool_modbus_polls_total", "counter", "Polling cycles"))
+        for coordinator, labels in entries:
+            append(f"vool_modbus_polls_total{{{labels}}} {coordinator.stats.polls}\n")
+        append(_header("vool_modbus_poll_errors_total", "counter", "Polling cycles that failed"))
+        for coordinator, labels in entries:
+            append(f"vool_modbus_poll_errors_total{{{labels}}} {coordinator.stats.poll_errors}\n")
+
+        append(_header("vool_modbus_poll_duration_seconds", "histogram", "Time to read every device of an entry"))
+        for coordinator, labels in entries:
+            stats = coordinator.stats
+            cumulative = 0
+            for bound, count in zip((*map(repr, POLL_BUCKETS), "+Inf"), stats.poll_buckets):
+                cumulative += count
+                append(f'vool_modbus_poll_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}\n')
+            append(f"vool_modbus_poll_duration_seconds_sum{{{labels}}} {stats.poll_sum!r}\n")
+            append(f"vool_modbus_poll_duration_seconds_count{{{labels}}} {stats.polls}\n")
+
+        append(_header("vool_modbus_requests_total", "counter", "Modbus requests"))
+        for coordinator, labels in entries:
+            for op, count in coordinator.stats.requests.items():
+                append(f'vool_modbus_requests_total{{{labels},op="{op}"}} {count}\n')
+        append(_header("vool_modbus_request_errors_total", "counter", "Modbus requests that failed"))
+        for coordinator, labels in entries:
+            for op, count in coordinator.stats.request_errors.items():
+                append(f'vool_modbus_request_errors_total{{{labels},op="{op}"}} {count}\n')
+
+        append(_header("vool_modbus_connects_total", "counter", "Connections established"))
+        for coordinator, labels in entries:
+            append(f"vool_modbus_connects_total{{{labels}}} {coordinator.stats.connects}\n")
+        append(_header("vool_modbus_bus_waiting", "gauge", "Requests waiting for the Modbus connection"))
+        for coordinator, labels in entries:
+            append(f"vool_modbus_bus_waiting{{{labels}}} {coordinator.bus_waiting}\n")
+
+
+class VoolMetricsView(HomeAssistantView):
+    """Serve the metrics of every loaded VOOL entry."""
+
+    url = "/api/vool_modbus/metrics"
+    name = "api:vool_modbus:metrics"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self._renderer = MetricsRenderer(hass)
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics."""
+        return web.Response(body=self._renderer.render().encode(), headers={"Content-Type": CONTENT_TYPE})
@@ -15,11 +15,13 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
+    DEVICE_TYPE_LMC,
     DOMAIN,
     REG_EXTERNAL_CURRENT_LIMIT,
 )
 from .coordinator import VoolModbusCoordinator
 from .entity import VoolModbusEntity
+from .snapshot import field_index
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -49,6 +51,25 @@ CHARGER_NUMBERS: tuple[VoolNumberEntityDescription, ...] = (
 )
 
 
+# The LMC limits the whole site through the same register
+LMC_NUMBERS: tuple[VoolNumberEntityDescription, ...] = (
+    VoolNumberEntityDescription(
+        key="site_current_limit",
+        translation_key="site_current_limit",
+        device_class=NumberDeviceClass.CURRENT,
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        native_min_value=0,
+        native_max_value=630,
+        native_step=1,
+        mode=NumberMode.BOX,
+        icon="mdi:transmission-tower",
+        register=REG_EXTERNAL_CURRENT_LIMIT,
+        data_key="external_current_limit",
+        multiplier=100,  # Register stores A × 0.01, so we multiply by 100
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -56,10 +77,12 @@ async def async_setup_entry(
 ) -> None:
     """Set up VOOL Modbus numbers."""
     coordinator: VoolModbusCoordinator = hass.data[DOMAIN][entry.entry_id]
+    descriptions = LMC_NUMBERS if coordinator.device_type == DEVICE_TYPE_LMC else CHARGER_NUMBERS
 
     async_add_entities(
-        VoolNumber(coordinator, description)
-        for description in CHARGER_NUMBERS
+        VoolNumber(coordinator, description, slave_id)
+        for slave_id in coordinator.slave_ids
+        for description in descriptions
     )
 
 
@@ -72,22 +95,24 @@ class VoolNumber(VoolModbusEntity, NumberEntity):
         self,
         coordinator: VoolModbusCoordinator,
         description: VoolNumberEntityDescription,
+        slave_id: int,
     ) -> None:
         """Initialize the number."""
-        super().__init__(coordinator, description.key)
+        super().__init__(coordinator, description.key, slave_id)
         self.entity_description = description
+        self._index = field_index(description.data_key)
 
     @property
     def native_value(self) -> float | None:
         """Return the current value."""
-        if self.coordinator.data is None:
+        if (data := self.device_data) is None:
             return None
         
-        return self.coordinator.data.get(self.entity_description.data_key)
+        return data.at(self._index)
 
     async def async_set_native_value(self, value: float) -> None:
         """Set a new value."""
         register_value = int(value * self.entity_description.multiplier)
         await self.coordinator.async_write_register(
-            self.entity_description.register, register_value
+            self.entity_description.register, register_value, self._slave_id
         )
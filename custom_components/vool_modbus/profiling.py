@@ -0,0 +1,247 @@
+"""On-demand profiling for VOOL Modbus integration.
+
+A profile run times a fixed number of polling cycles of a coordinator: the
+whole update, every pymodbus call and the fan-out to the entities. The
+timing wrappers are installed by replacing attributes on the coordinator
+instance and its client and removed again afterwards, so nothing is timed,
+and nothing costs anything, while no profile runs.
+
+Optionally cProfile runs for the same cycles. It profiles everything on the
+event loop thread, not only this integration, and its stats file can be
+opened with pstats, snakeviz, or converted to a flame graph with flameprof.
+"""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import json
+import logging
+import pstats
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .metrics import MeteredClient
+from .pymodbus_compat import MODBUS_CALLS
+from .trace import RecordingClient
+
+if TYPE_CHECKING:
+    from .coordinator import VoolModbusCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Functions listed in the summary of a cProfile run
+PROFILE_TOP = 25
+
+
+@dataclass
+class SpanStats:
+    """Running totals of one timed span."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, elapsed: float) -> None:
+        """Add one measurement in seconds."""
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the totals in milliseconds."""
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else None,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class ProfilingClient:
+    """Time the Modbus calls of a pymodbus client, delegate everything else."""
+
+    def __init__(self, client: Any, profiler: VoolProfiler) -> None:
+        """Initialize the profiling client."""
+        self.client = client
+        for name in MODBUS_CALLS:
+            if (method := getattr(client, name, None)) is not None:
+                setattr(self, name, profiler.wrap_modbus_call(name, method))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+
+class VoolProfiler:
+    """Profile a number of polling cycles of one coordinator."""
+
+    def __init__(self, coordinator: VoolModbusCoordinator, cycles: int, use_cprofile: bool) -> None:
+        """Initialize the profiler."""
+        self._coordinator = coordinator
+        self.cycles = cycles
+        self.completed = 0
+        self.spans: dict[str, SpanStats] = {}
+        self._update_io = 0.0
+        self._in_update = False
+        self._cprofile = cProfile.Profile() if use_cprofile else None
+        self._started = 0.0
+        self._elapsed = 0.0
+        self._done: asyncio.Event = asyncio.Event()
+        self._restore: list[Callable[[], None]] = []
+
+    def _span(self, name: str) -> SpanStats:
+        if (span := self.spans.get(name)) is None:
+            span = self.spans[name] = SpanStats()
+        return span
+
+    def wrap_modbus_call(self, name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        """Return a timed version of a pymodbus client call."""
+        span = self._span(f"modbus.{name}")
+
+        async def timed(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                result = await method(*args, **kwargs)
+            except TypeError:
+                # Signature probing of pymodbus_compat, not a request
+                raise
+            except Exception:
+                self._record_io(span, started)
+                raise
+            self._record_io(span, started)
+            return result
+
+        return timed
+
+    def _record_io(self, span: SpanStats, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        span.add(elapsed)
+        if self._in_update:
+            self._update_io += elapsed
+
+    def _wrap_client(self, client: Any) -> Any:
+        """Wrap a client, or the client inside a trace recording client."""
+        if isinstance(client, RecordingClient):
+            client.client = self._wrap_client(client.client)
+            return client
+        if client is None or isinstance(client, ProfilingClient):
+            return client
+        return ProfilingClient(client, self)
+
+    @staticmethod
+    def _unwrap_client(client: Any) -> Any:
+        if isinstance(client, RecordingClient):
+            client.client = VoolProfiler._unwrap_client(client.client)
+            return client
+        if isinstance(client, MeteredClient) and isinstance(client.client, ProfilingClient):
+            # Created by the profiled factory on a reconnect, the metered calls are bound
+            # to the profiling client, so meter the plain client again
+            return MeteredClient(client.client.client, client.stats)
+        if isinstance(client, ProfilingClient):
+            return client.client
+        return client
+
+    def install(self) -> None:
+        """Replace the coordinator's update, client and listener fan-out with timed versions."""
+        coordinator = self._coordinator
+        update = coordinator._async_update_data
+        update_listeners = coordinator.async_update_listeners
+        client_factory = coordinator._client_factory
+        update_span = self._span("update")
+        processing_span = self._span("processing")
+        listeners_span = self._span("listeners")
+
+        async def timed_update() -> Any:
+            self._in_update = True
+            self._update_io = 0.0
+            started = time.perf_counter()
+            try:
+                return await update()
+            finally:
+                elapsed = time.perf_counter() - started
+                self._in_update = False
+                update_span.add(elapsed)
+                # Decoding, derived values, sessions and the heartbeat
+                processing_span.add(max(elapsed - self._update_io, 0.0))
+                self.completed += 1
+
+        def timed_update_listeners() -> None:
+            started = time.perf_counter()
+            update_listeners()
+            listeners_span.add(time.perf_counter() - started)
+            if self.completed >= self.cycles:
+                self.finish()
+
+        def profiled_client_factory() -> Any:
+            return self._wrap_client(client_factory())
+
+        coordinator._async_update_data = timed_update  # type: ignore[method-assign]
+        coordinator.async_update_listeners = timed_update_listeners  # type: ignore[method-assign]
+        coordinator._client_factory = profiled_client_factory
+        coordinator._client = self._wrap_client(coordinator._client)
+
+        def restore() -> None:
+            del coordinator._async_update_data
+            del coordinator.async_update_listeners
+            coordinator._client_factory = client_factory
+            coordinator._client = self._unwrap_client(coordinator._client)
+
+        self._restore.append(restore)
+        self._started = time.perf_counter()
+        if self._cprofile is not None:
+            self._cprofile.enable()
+
+    def finish(self) -> None:
+        """Stop profiling and remove every wrapper."""
+        if self._done.is_set():
+            return
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        self._elapsed = time.perf_counter() - self._started
+        while self._restore:
+            self._restore.pop()()
+        self._done.set()
+
+    async def async_wait(self, timeout: float) -> bool:
+        """Wait for the profiled cycles. Return False if the timeout ended the run."""
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout)
+        except TimeoutError:
+            self.finish()
+            return False
+        return True
+
+    def summary(self) -> dict[str, Any]:
+        """Return the span totals."""
+        return {
+            "cycles": self.completed,
+            "duration_s": round(self._elapsed, 3),
+            "spans": {name: span.as_dict() for name, span in self.spans.items() if span.count},
+        }
+
+    def write(self, summary_path: str, stats_path: str | None) -> dict[str, Any]:
+        """Write the summary and the cProfile stats. Runs in the executor."""
+        summary = self.summary()
+        if self._cprofile is not None and stats_path is not None:
+            self._cprofile.dump_stats(stats_path)
+            stats = pstats.Stats(self._cprofile)
+            stats.sort_stats(pstats.SortKey.TIME)
+            top = []
+            for function in stats.fcn_list[:PROFILE_TOP]:  # type: ignore[attr-defined]
+                _, calls, tottime, cumtime, _ = stats.stats[function]  # type: ignore[attr-defined]
+                file_name, line, name = function
+                top.append(
+                    {
+                        "function": f"{file_name}:{line}({name})",
+                        "calls": calls,
+                        "tottime_ms": round(tottime * 1000, 3),
+                        "cumtime_ms": round(cumtime * 1000, 3),
+                    }
+                )
+            summary["top_functions"] = top
+            summary["pstats"] = stats_path
+        with open(summary_path, "w", encoding="utf-8") as file:
+            json.dump(summary, file, indent=2)
+        summary["summary"] = summary_path
+        return summary
@@ -0,0 +1,162 @@
+"""Local Modbus TCP proxy for VOOL Modbus integration.
+
+Many VOOL units accept a single Modbus master. The proxy lets other tools
+(EVCC, monitoring) share the integration's connection: reads of registers the
+coordinator polls are answered from its cache without touching the bus, and
+writes and other reads are forwarded upstream, queued behind the
+coordinator's own requests.
+
+Only the function codes the chargers use are supported: read holding
+registers (03), read input registers (04), write single register (06) and
+write multiple registers (16).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+
+from .const import DEFAULT_PROXY_HOST, PROXY_CACHE_MAX_AGE
+from .coordinator import VoolModbusCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+MBAP = struct.Struct(">HHHB")  # transaction, protocol, length, unit
+
+FC_READ_HOLDING = 0x03
+FC_READ_INPUT = 0x04
+FC_WRITE_SINGLE = 0x06
+FC_WRITE_MULTIPLE = 0x10
+
+EXC_ILLEGAL_FUNCTION = 0x01
+EXC_ILLEGAL_VALUE = 0x03
+EXC_DEVICE_FAILURE = 0x04
+EXC_GATEWAY_NO_RESPONSE = 0x0B
+
+# Unit IDs clients commonly use for "the device behind this connection"
+DEFAULT_UNITS = (0, 255)
+
+
+def exception_pdu(function_code: int, code: int) -> bytes:
+    """Return a Modbus exception response."""
+    return bytes((function_code | 0x80, code))
+
+
+class VoolModbusProxy:
+    """Modbus TCP server answering from a coordinator."""
+
+    def __init__(self, coordinator: VoolModbusCoordinator, port: int, host: str = DEFAULT_PROXY_HOST) -> None:
+        """Initialize the proxy."""
+        self._coordinator = coordinator
+        self._host = host
+        self._port = port
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+        self.cache_hits = 0
+        self.forwarded = 0
+
+    async def async_start(self) -> None:
+        """Start listening."""
+        self._server = await asyncio.start_server(self._handle_client, self._host, self._port)
+        _LOGGER.info(
+            "Modbus TCP proxy for %s listening on %s port %s", self._coordinator.host, self._host, self._port
+        )
+
+    async def async_stop(self) -> None:
+        """Stop listening and disconnect all clients."""
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer the requests of one client, in order."""
+        peer = writer.get_extra_info("peername")
+        _LOGGER.debug("Modbus proxy client %s connected", peer)
+        self._writers.add(writer)
+        try:
+            while True:
+                transaction, protocol, length, unit = MBAP.unpack(await reader.readexactly(MBAP.size))
+                if protocol != 0 or not 2 <= length <= 254:
+                    _LOGGER.debug("Invalid Modbus TCP frame from %s, disconnecting", peer)
+                    break
+                pdu = await reader.readexactly(length - 1)
+                response = await self._handle_pdu(unit, pdu)
+                writer.write(MBAP.pack(transaction, 0, len(response) + 1, unit) + response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            _LOGGER.debug("Modbus proxy client %s disconnected", peer)
+
+    def _slave_id(self, unit: int) -> int | None:
+        """Map a unit ID to a slave of the coordinator."""
+        if unit in self._coordinator.slave_ids:
+            return unit
+        if unit in DEFAULT_UNITS:
+            return self._coordinator.slave_id
+        return None
+
+    async def _handle_pdu(self, unit: int, pdu: bytes) -> bytes:
+        """Return the response PDU for a request PDU."""
+        function_code = pdu[0]
+        if (slave_id := self._slave_id(unit)) is None:
+            return exception_pdu(function_code, EXC_GATEWAY_NO_RESPONSE)
+
+        try:
+            if function_code in (FC_READ_HOLDING, FC_READ_INPUT):
+                return await self._read(slave_id, function_code, pdu)
+            if function_code == FC_WRITE_SINGLE:
+                return await self._write_single(slave_id, pdu)
+            if function_code == FC_WRITE_MULTIPLE:
+                return await self._write_multiple(slave_id, pdu)
+        except struct.error:
+            return exception_pdu(function_code, EXC_ILLEGAL_VALUE)
+        return exception_pdu(function_code, EXC_ILLEGAL_FUNCTION)
+
+    async def _read(self, slave_id: int, function_code: int, pdu: bytes) -> bytes:
+        address, count = struct.unpack_from(">HH", pdu, 1)
+        if not 1 <= count <= 125:
+            return exception_pdu(function_code, EXC_ILLEGAL_VALUE)
+        input_registers = function_code == FC_READ_INPUT
+
+        registers = self._coordinator.cached_registers(
+            slave_id, input_registers, address, count, PROXY_CACHE_MAX_AGE
+        )
+        if registers is not None:
+            self.cache_hits += 1
+        else:
+            self.forwarded += 1
+            result = await self._coordinator.async_forward_read(slave_id, input_registers, address, count)
+            if result is None:
+                return exception_pdu(function_code, EXC_GATEWAY_NO_RESPONSE)
+            if result.isError():
+                return exception_pdu(
+                    function_code, getattr(result, "exception_code", None) or EXC_DEVICE_FAILURE
+                )
+            registers = result.registers[:count]
+
+        return struct.pack(f">BB{count}H", function_code, count * 2, *registers)
+
+    async def _write_single(self, slave_id: int, pdu: bytes) -> bytes:
+        address, value = struct.unpack_from(">HH", pdu, 1)
+        self.forwarded += 1
+        if not await self._coordinator.async_write_register(address, value, slave_id, refresh=False):
+            return exception_pdu(FC_WRITE_SINGLE, EXC_DEVICE_FAILURE)
+        # The response echoes the request
+        return pdu[:5]
+
+    async def _write_multiple(self, slave_id: int, pdu: bytes) -> bytes:
+        address, count, byte_count = struct.unpack_from(">HHB", pdu, 1)
+        if not 1 <= count <= 123 or byte_count != count * 2:
+            return exception_pdu(FC_WRITE_MULTIPLE, EXC_ILLEGAL_VALUE)
+        values = list(struct.unpack_from(f">{count}H", pdu, 6))
+        self.forwarded += 1
+        if not await self._coordinator.async_write_registers(address, values, slave_id, refresh=False):
+            return exception_pdu(FC_WRITE_MULTIPLE, EXC_DEVICE_FAILURE)
+        return struct.pack(">BHH", FC_WRITE_MULTIPLE, address, count)
@@ -5,7 +5,8 @@ version and dependency resolver. pymodbus has changed the Modbus unit/slave argu
 name and whether it is keyword-only across releases.
 
 These helpers try the common call patterns and fall back to calls without an explicit
-unit id if the installed pymodbus version doesn't support passing it.
+unit id if the installed pymodbus version doesn't support passing it. The RTU framer
+passed to the client constructors changed from a class to an enum the same way.
 """
 
 from __future__ import annotations
@@ -13,7 +14,14 @@ from __future__ import annotations
 import logging
 from typing import Any, Awaitable, Callable
 
+from .logs import RateLimitedLogger
+
 _LOGGER = logging.getLogger(__name__)
+# The fallback is taken on every call of an unsupported signature
+_FALLBACK_LOG = RateLimitedLogger(_LOGGER)
+
+# pymodbus client calls that the metering, tracing and pacing client wrappers intercept
+MODBUS_CALLS = ("read_holding_registers", "read_input_registers", "write_register", "write_registers")
 
 
 class VoolPymodbusCompatError(TypeError):
@@ -74,8 +82,9 @@ async def async_read_input_registers(client: Any, address: int, count: int, unit
             context="read_input_registers",
         )
     except VoolPymodbusCompatError:
-        _LOGGER.warning(
-            "pymodbus does not accept unit/slave id for read_input_registers; falling back to default unit id"
+        _FALLBACK_LOG.warning(
+            "read_input_registers",
+            "pymodbus does not accept unit/slave id for read_input_registers; falling back to default unit id",
         )
         return await client.read_input_registers(address=address, count=count)
 
@@ -122,8 +131,9 @@ async def async_read_holding_registers(client: Any, address: int, count: int, un
             context="read_holding_registers",
         )
     except VoolPymodbusCompatError:
-        _LOGGER.warning(
-            "pymodbus does not accept unit/slave id for read_holding_registers; falling back to default unit id"
+        _FALLBACK_LOG.warning(
+            "read_holding_registers",
+            "pymodbus does not accept unit/slave id for read_holding_registers; falling back to default unit id",
         )
         return await client.read_holding_registers(address=address, count=count)
 
@@ -170,7 +180,82 @@ async def async_write_register(client: Any, address: int, value: int, unit_id: i
             context="write_register",
         )
     except VoolPymodbusCompatError:
-        _LOGGER.warning(
-            "pymodbus does not accept unit/slave id for write_register; falling back to default unit id"
+        _FALLBACK_LOG.warning(
+            "write_register",
+            "pymodbus does not accept unit/slave id for write_register; falling back to default unit id",
         )
         return await client.write_register(address=address, value=value)
+
+
+async def async_write_registers(client: Any, address: int, values: list[int], unit_id: int) -> Any:
+    """Write consecutive holding registers (FC16) with best-effort unit/slave handling."""
+
+    address = int(address)
+    values = [int(value) for value in values]
+    unit_id = int(unit_id)
+
+    async def call_address_values_slave() -> Any:
+        return await client.write_registers(address=address, values=values, slave=unit_id)
+
+    async def call_address_values_unit() -> Any:
+        return await client.write_registers(address=address, values=values, unit=unit_id)
+
+    async def call_address_values_slave_id() -> Any:
+        return await client.write_registers(address=address, values=values, slave_id=unit_id)
+
+    async def call_address_values_device_id() -> Any:
+        return await client.write_registers(address=address, values=values, device_id=unit_id)
+
+    async def call_address_values() -> Any:
+        return await client.write_registers(address=address, values=values)
+
+    async def call_positional_address_values_slave() -> Any:
+        return await client.write_registers(address, values, unit_id)
+
+    async def call_positional_address_values() -> Any:
+        return await client.write_registers(address, values)
+
+    try:
+        return await _try_calls(
+            [
+                call_address_values_slave,
+                call_address_values_unit,
+                call_address_values_slave_id,
+                call_address_values_device_id,
+                call_address_values,
+                call_positional_address_values_slave,
+                call_positional_address_values,
+            ],
+            context="write_registers",
+        )
+    except VoolPymodbusCompatError:
+        _FALLBACK_LOG.warning(
+            "write_registers",
+            "pymodbus does not accept unit/slave id for write_registers; falling back to default unit id",
+        )
+        return await client.write_registers(address=address, values=values)
+
+
+def rtu_framer() -> Any:
+    """Return the RTU framer argument of the installed pymodbus client constructors."""
+
+    try:
+        # pymodbus >= 3.7
+        from pymodbus import FramerType
+
+        return FramerType.RTU
+    except ImportError:
+        pass
+
+    try:
+        # pymodbus 3.5 - 3.6
+        from pymodbus.framer import Framer
+
+        return Framer.RTU
+    except ImportError:
+        pass
+
+    # pymodbus < 3.5 takes the framer class
+    from pymodbus.framer.rtu_framer import ModbusRtuFramer
+
+    return ModbusRtuFramer
@@ -0,0 +1,298 @@
+"""Charging schedules for VOOL Modbus integration.
+
+A schedule is a list of slots per charger. Each slot sets the charging
+command (500), current limit (501) and/or allowed phases (502) from its start
+until the next slot starts. Slots of a daily schedule start at a time of day
+and repeat every day; slots of a dated schedule start at a date and time, and
+the last one stays in effect.
+
+The executor arms one timer per charger for the next slot boundary and writes
+only then. The slot in effect is also written when a schedule is set, when
+the entry starts and on the next poll after a failed write. After a
+reconnect the heartbeat re-asserts the current limit and phases, and the
+executor re-asserts the charging command.
+
+When load balancing or solar charging controls the current limit and phases
+of an entry, its schedules only run the charging command, so the two do not
+overwrite each other. The site allocator in turn leaves out chargers whose
+schedule sets the current limit or phases.
+"""
+from __future__ import annotations
+
+import logging
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from functools import partial
+from itertools import pairwise
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, HEARTBEAT_REGISTERS, STORAGE_VERSION
+from .coordinator import VoolModbusCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _schedule_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.schedules")
+
+
+async def async_remove_schedules(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the stored schedules of a config entry."""
+    await _schedule_store(hass, entry_id).async_remove()
+
+
+def _as_utc(start: datetime) -> datetime:
+    """Return a slot start in UTC, reading one without an offset as local time."""
+    if start.tzinfo is None:
+        # Like the times of day of daily slots
+        start = start.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return dt_util.as_utc(start)
+
+
+@dataclass(frozen=True)
+class ScheduleSlot:
+    """Register values in effect from a start time on."""
+
+    # Time of day for daily schedules, a UTC datetime otherwise
+    start: time | datetime
+    registers: dict[int, int]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the slot for storage."""
+        return {
+            "start": self.start.isoformat(),
+            "registers": {str(register): value for register, value in self.registers.items()},
+        }
+
+
+@dataclass(frozen=True)
+class ChargingSchedule:
+    """The slots of one charger, sorted by start."""
+
+    slots: tuple[ScheduleSlot, ...]
+    daily: bool
+
+    @classmethod
+    def from_slots(cls, slots: list[ScheduleSlot]) -> ChargingSchedule:
+        """Create a schedule from slots in any order. Raise ValueError if they are invalid."""
+        if not slots:
+            raise ValueError("A schedule needs at least one slot")
+        daily = isinstance(slots[0].start, time)
+        if any(isinstance(slot.start, time) != daily for slot in slots):
+            raise ValueError("Slots must all start at a time of day or all at a date and time")
+        if not daily:
+            slots = [ScheduleSlot(_as_utc(slot.start), slot.registers) for slot in slots]
+        slots = sorted(slots, key=lambda slot: slot.start)
+        if any(first.start == second.start for first, second in pairwise(slots)):
+            raise ValueError("Two slots start at the same time")
+        return cls(tuple(slots), daily)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ChargingSchedule:
+        """Create a schedule from stored data."""
+        parse = time.fromisoformat if data["daily"] else datetime.fromisoformat
+        return cls.from_slots(
+            [
+                ScheduleSlot(
+                    parse(slot["start"]),
+                    {int(register): value for register, value in slot["registers"].items()},
+                )
+                for slot in data["slots"]
+            ]
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the schedule for storage."""
+        return {"daily": self.daily, "slots": [slot.as_dict() for slot in self.slots]}
+
+    def _position(self, now: datetime) -> tuple[int, datetime]:
+        """Return the index of the first slot starting after now and now as compared."""
+        if self.daily:
+            local = dt_util.as_local(now)
+            return bisect_right([slot.start for slot in self.slots], local.time()), local
+        return bisect_right([slot.start for slot in self.slots], now), now
+
+    def active(self, now: datetime) -> ScheduleSlot | None:
+        """Return the slot in effect at a point in time, None before a dated schedule starts."""
+        index, _ = self._position(now)
+        if index == 0 and not self.daily:
+            return None
+        # Before the first slot of the day the last one of the previous day is in effect
+        return self.slots[index - 1]
+
+    def next_start(self, now: datetime) -> datetime | None:
+        """Return when the next slot starts, None after the last slot of a dated schedule."""
+        index, local = self._position(now)
+        if not self.daily:
+            return self.slots[index].start if index < len(self.slots) else None
+        day = local.date()
+        if index == len(self.slots):
+            index = 0
+            day += timedelta(days=1)
+        return datetime.combine(day, self.slots[index].start, tzinfo=local.tzinfo)
+
+
+class VoolScheduleExecutor:
+    """Execute the charging schedules of the chargers behind a config entry."""
+
+    def __init__(self, hass: HomeAssistant, coordinator: VoolModbusCoordinator, command_only: bool = False) -> None:
+        """Initialize the executor."""
+        self.hass = hass
+        self._coordinator = coordinator
+        # A closed-loop controller owns the current limit and phases
+        self.command_only = command_only
+        self._store = _schedule_store(hass, coordinator.entry.entry_id)
+        self.schedules: dict[int, ChargingSchedule] = {}
+        self._timers: dict[int, CALLBACK_TYPE] = {}
+        # Chargers whose slot in effect could not be written, retried on the next poll
+        self._retry: set[int] = set()
+        self._writing: set[int] = set()
+        # Chargers whose slot in effect changed while a write was in flight
+        self._rerun: set[int] = set()
+        self._connects = coordinator.stats.connects
+        self._unsub: CALLBACK_TYPE | None = None
+
+    async def async_start(self) -> None:
+        """Load the stored schedules and write the slots in effect."""
+        data = await self._store.async_load() or {}
+        for slave_id, schedule in data.get("schedules", {}).items():
+            if int(slave_id) in self._coordinator.slave_ids:
+                self.schedules[int(slave_id)] = ChargingSchedule.from_dict(schedule)
+        if self.command_only and any(
+            register in slot.registers
+            for schedule in self.schedules.values()
+            for slot in schedule.slots
+            for register in HEARTBEAT_REGISTERS
+        ):
+            _LOGGER.warning(
+                "Charging schedules of %s set the current limit or phases, which another controller owns; "
+                "only their charging commands are run",
+                self._coordinator.host,
+            )
+        self._connects = self._coordinator.stats.connects
+        self._unsub = self._coordinator.async_add_listener(self._handle_coordinator_update)
+        for slave_id in self.schedules:
+            self._arm(slave_id)
+            self._async_write_active(slave_id)
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel every timer."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        for cancel in self._timers.values():
+            cancel()
+        self._timers.clear()
+
+    async def async_set(self, slave_id: int, schedule: ChargingSchedule) -> None:
+        """Replace the schedule of a charger and write the slot in effect now."""
+        self.schedules[slave_id] = schedule
+        await self._store.async_save(self._data_to_save())
+        self._arm(slave_id)
+        slot = schedule.active(dt_util.utcnow())
+        if slot is not None and (values := self._writable(slot.registers)):
+            await self._async_write(slave_id, values)
+
+    async def async_clear(self, slave_id: int) -> None:
+        """Remove the schedule of a charger. Its registers keep their values."""
+        if self.schedules.pop(slave_id, None) is None:
+            return
+        if (cancel := self._timers.pop(slave_id, None)) is not None:
+            cancel()
+        self._retry.discard(slave_id)
+        self._rerun.discard(slave_id)
+        await self._store.async_save(self._data_to_save())
+
+    def sets_current(self, slave_id: int) -> bool:
+        """Return True if the schedule of a charger writes its current limit or phases."""
+        if self.command_only or (schedule := self.schedules.get(slave_id)) is None:
+            return False
+        return any(register in slot.registers for slot in schedule.slots for register in HEARTBEAT_REGISTERS)
+
+    def _writable(self, registers: dict[int, int]) -> dict[int, int]:
+        """Return the register values of a slot the executor may write."""
+        if not self.command_only:
+            return registers
+        return {register: value for register, value in registers.items() if register not in HEARTBEAT_REGISTERS}
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "schedules": {str(slave_id): schedule.as_dict() for slave_id, schedule in self.schedules.items()}
+        }
+
+    @callback
+    def _arm(self, slave_id: int) -> None:
+        """Arm the timer for the next slot boundary of a charger."""
+        if (cancel := self._timers.pop(slave_id, None)) is not None:
+            cancel()
+        if (schedule := self.schedules.get(slave_id)) is None:
+            return
+        if (next_start := schedule.next_start(dt_util.utcnow())) is not None:
+            self._timers[slave_id] = async_track_point_in_time(
+                self.hass, partial(self._handle_boundary, slave_id), next_start
+            )
+
+    @callback
+    def _handle_boundary(self, slave_id: int, _now: datetime) -> None:
+        """Write the slot that starts now and arm the timer for the next one."""
+        self._timers.pop(slave_id, None)
+        self._arm(slave_id)
+        self._async_write_active(slave_id)
+
+    @callback
+    def _async_write_active(self, slave_id: int, skip: tuple[int, ...] = ()) -> None:
+        """Write the slot in effect of a charger in the background, except the registers skipped."""
+        if slave_id in self._writing:
+            # Written once the write in flight finished, with the slot in effect then
+            self._rerun.add(slave_id)
+            return
+        if (schedule := self.schedules.get(slave_id)) is None:
+            return
+        if (slot := schedule.active(dt_util.utcnow())) is None:
+            return
+        values = {register: value for register, value in self._writable(slot.registers).items() if register not in skip}
+        if not values:
+            return
+        self.hass.async_create_background_task(
+            self._async_write(slave_id, values), f"{DOMAIN}_schedule_{slave_id}"
+        )
+
+    async def _async_write(self, slave_id: int, registers: dict[int, int]) -> None:
+        """Write register values of a slot, remembering a failure for a retry."""
+        self._writing.add(slave_id)
+        try:
+            ok, _ = await self._coordinator.async_write_register_map(registers, slave_id)
+        finally:
+            self._writing.discard(slave_id)
+        if ok:
+            self._retry.discard(slave_id)
+        else:
+            _LOGGER.debug(
+                "Schedule write to %s (slave %s) failed, retrying after the next poll", self._coordinator.host, slave_id
+            )
+            self._retry.add(slave_id)
+        if slave_id in self._rerun:
+            # A slot boundary or retry came up while writing
+            self._rerun.discard(slave_id)
+            self._async_write_active(slave_id)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Retry failed writes and re-assert the charging command after a reconnect."""
+        if not self._coordinator.last_update_success:
+            return
+        reconnected = self._coordinator.stats.connects != self._connects
+        self._connects = self._coordinator.stats.connects
+        for slave_id in self.schedules:
+            if slave_id in self._retry:
+                self._async_write_active(slave_id)
+            elif reconnected:
+                # The heartbeat already re-asserts the current limit and phases
+                self._async_write_active(slave_id, skip=HEARTBEAT_REGISTERS)
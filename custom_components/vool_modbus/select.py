@@ -17,6 +17,7 @@ from .const import (
 )
 from .coordinator import VoolModbusCoordinator
 from .entity import VoolModbusEntity
+from .snapshot import field_index
 
 
 # Phase options mapping (binary representation)
@@ -62,7 +63,8 @@ async def async_setup_entry(
     coordinator: VoolModbusCoordinator = hass.data[DOMAIN][entry.entry_id]
 
     async_add_entities(
-        VoolSelect(coordinator, description)
+        VoolSelect(coordinator, description, slave_id)
+        for slave_id in coordinator.slave_ids
         for description in CHARGER_SELECTS
     )
 
@@ -76,19 +78,21 @@ class VoolSelect(VoolModbusEntity, SelectEntity):
         self,
         coordinator: VoolModbusCoordinator,
         description: VoolSelectEntityDescription,
+        slave_id: int,
     ) -> None:
         """Initialize the select."""
-        super().__init__(coordinator, description.key)
+        super().__init__(coordinator, description.key, slave_id)
         self.entity_description = description
         self._attr_options = description.options
+        self._index = field_index(description.data_key)
 
     @property
     def current_option(self) -> str | None:
         """Return the current selected option."""
-        if self.coordinator.data is None:
+        if (data := self.device_data) is None:
             return None
         
-        value = self.coordinator.data.get(self.entity_description.data_key)
+        value = data.at(self._index)
         if value is None:
             return None
         
@@ -102,5 +106,5 @@ class VoolSelect(VoolModbusEntity, SelectEntity):
         
         if value is not None:
             await self.coordinator.async_write_register(
-                self.entity_description.register, value
+                self.entity_description.register, value, self._slave_id
             )
@@ -12,27 +12,42 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    EntityCategory,
+    UnitOfApparentPower,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
+    PERCENTAGE,
     UnitOfPower,
+    UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
     CHARGER_STATE_MAP,
+    DATA_SITE,
+    DEVICE_TYPE_CHARGER,
+    DEVICE_TYPE_LMC,
+    LMC_MAX_CHARGERS,
 )
 from .coordinator import VoolModbusCoordinator
 from .entity import VoolModbusEntity
+from .site import VoolSiteAggregator
+from .snapshot import DeviceSnapshot, field_index
 
 
 @dataclass(frozen=True, kw_only=True)
 class VoolSensorEntityDescription(SensorEntityDescription):
     """Describes a VOOL sensor entity."""
 
-    value_fn: Callable[[dict[str, Any]], Any] | None = None
+    # Snapshot field holding the value, defaults to the key
+    field: str | None = None
+    value_fn: Callable[[DeviceSnapshot], Any] | None = None
+    attrs_fn: Callable[[DeviceSnapshot], dict[str, Any]] | None = None
 
 
 # =============================================================================
@@ -43,7 +58,7 @@ CHARGER_SENSORS: tuple[VoolSensorEntityDescription, ...] = (
         key="charger_state",
         translation_key="charger_state",
         icon="mdi:ev-station",
-        value_fn=lambda data: CHARGER_STATE_MAP.get(data.get("charger_state", 0), "Unknown"),
+        field="charger_state_label",
     ),
     VoolSensorEntityDescription(
         key="active_power",
@@ -51,7 +66,6 @@ CHARGER_SENSORS: tuple[VoolSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.POWER,
         native_unit_of_measurement=UnitOfPower.KILO_WATT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("active_power"),
     ),
     VoolSensorEntityDescription(
         key="l1_power",
@@ -59,7 +73,6 @@ CHARGER_SENSORS: tuple[VoolSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.POWER,
         native_unit_of_measurement=UnitOfPower.KILO_WATT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("l1_power"),
     ),
     VoolSensorEntityDescription(
         key="l2_power",
@@ -67,7 +80,6 @@ CHARGER_SENSORS: tuple[VoolSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.POWER,
         native_unit_of_measurement=UnitOfPower.KILO_WATT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("l2_power"),
     ),
     VoolSensorEntityDescription(
         key="l3_power",
@@ -75,7 +87,6 @@ CHARGER_SENSORS: tuple[VoolSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.POWER,
         native_unit_of_measurement=UnitOfPower.KILO_WATT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("l3_power"),
     ),
     VoolSensorEntityDescription(
         key="current_l1",
@@ -83,7 +94,6 @@ CHARGER_SENSORS: tuple[VoolSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.CURRENT,
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("current_l1"),
     ),
     VoolSensorEntityDescription(
         key="current_l2",
@@ -91,7 +101,6 @@ CHARGER_SENSORS: tuple[VoolSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.CURRENT,
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("current_l2"),
     ),
     VoolSensorEntityDescription(
         key="current_l3",
@@ -99,7 +108,6 @@ CHARGER_SENSORS: tuple[VoolSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.CURRENT,
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("current_l3"),
     ),
     VoolSensorEntityDescription(
         key="voltage_l1",
@@ -107,7 +115,6 @@ CHARGER_SENSORS: tuple[VoolSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.VOLTAGE,
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("voltage_l1"),
     ),
     VoolSensorEntityDescription(
         key="voltage_l2",
@@ -115,7 +122,6 @@ CHARGER_SENSORS: tuple[VoolSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.VOLTAGE,
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("voltage_l2"),
     ),
     VoolSensorEntityDescription(
         key="voltage_l3",
@@ -123,7 +129,6 @@ CHARGER_SENSORS: tuple[VoolSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.VOLTAGE,
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("voltage_l3"),
     ),
     VoolSensorEntityDescription(
         key="energy_imported",
@@ -131,7 +136,6 @@ CHARGER_SENSORS: tuple[VoolSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.ENERGY,
         native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         state_class=SensorStateClass.TOTAL_INCREASING,
-        value_fn=lambda data: data.get("energy_imported"),
     ),
     VoolSensorEntityDescription(
         key="external_current_limit",
@@ -139,17 +143,267 @@ CHARGER_SENSORS: tuple[VoolSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.CURRENT,
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("external_current_limit"),
     ),
     VoolSensorEntityDescription(
         key="requested_phases",
         translation_key="requested_phases",
         icon="mdi:sine-wave",
-        value_fn=lambda data: data.get("requested_phases"),
+    ),
+    VoolSensorEntityDescription(
+        key="limit_drift_events",
+        translation_key="limit_drift_events",
+        icon="mdi:sync-alert",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
     ),
 )
 
 
+# =============================================================================
+# Derived Sensors
+# Computed once per poll by the coordinator from the phase values, so no
+# template sensors are needed. Disabled by default.
+# =============================================================================
+DERIVED_SENSORS: tuple[VoolSensorEntityDescription, ...] = (
+    VoolSensorEntityDescription(
+        key="total_current",
+        translation_key="total_current",
+        device_class=SensorDeviceClass.CURRENT,
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    VoolSensorEntityDescription(
+        key="apparent_power",
+        translation_key="apparent_power",
+        device_class=SensorDeviceClass.APPARENT_POWER,
+        native_unit_of_measurement=UnitOfApparentPower.VOLT_AMPERE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda data: _kva_to_va(data.get("apparent_power")),
+    ),
+    *(
+        VoolSensorEntityDescription(
+            key=f"apparent_power_{phase}",
+            translation_key=f"apparent_power_{phase}",
+            device_class=SensorDeviceClass.APPARENT_POWER,
+            native_unit_of_measurement=UnitOfApparentPower.VOLT_AMPERE,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_registry_enabled_default=False,
+            value_fn=lambda data, phase=phase: _kva_to_va(data.get(f"apparent_power_{phase}")),
+        )
+        for phase in ("l1", "l2", "l3")
+    ),
+    VoolSensorEntityDescription(
+        key="power_factor",
+        translation_key="power_factor",
+        device_class=SensorDeviceClass.POWER_FACTOR,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    VoolSensorEntityDescription(
+        key="current_imbalance",
+        translation_key="current_imbalance",
+        icon="mdi:scale-unbalanced",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    VoolSensorEntityDescription(
+        key="energy_power",
+        translation_key="energy_power",
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+)
+
+
+def _kva_to_va(value: float | None) -> float | None:
+    """Convert kVA to VA."""
+    return None if value is None else round(value * 1000)
+
+
+# =============================================================================
+# Charging Session Sensors
+# Running aggregates of the current session, or of the last one while no
+# vehicle is connected. Computed by the coordinator on every poll.
+# =============================================================================
+SESSION_SENSORS: tuple[VoolSensorEntityDescription, ...] = (
+    VoolSensorEntityDescription(
+        key="session_energy",
+        translation_key="session_energy",
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    VoolSensorEntityDescription(
+        key="session_time",
+        translation_key="session_time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.MINUTES,
+        attrs_fn=lambda data: {
+            "active": data.get("session_active"),
+            "time_in_state": data.get("session_state_time"),
+        },
+    ),
+    VoolSensorEntityDescription(
+        key="session_charging_time",
+        translation_key="session_charging_time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.MINUTES,
+    ),
+    VoolSensorEntityDescription(
+        key="session_average_power",
+        translation_key="session_average_power",
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        attrs_fn=lambda data: {"min_power": data.get("session_min_power")},
+    ),
+    VoolSensorEntityDescription(
+        key="session_peak_power",
+        translation_key="session_peak_power",
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+    ),
+    VoolSensorEntityDescription(
+        key="session_average_current",
+        translation_key="session_average_current",
+        device_class=SensorDeviceClass.CURRENT,
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        attrs_fn=lambda data: {
+            "current_l1": data.get("session_current_l1"),
+            "current_l2": data.get("session_current_l2"),
+            "current_l3": data.get("session_current_l3"),
+        },
+    ),
+    VoolSensorEntityDescription(
+        key="session_phase_imbalance",
+        translation_key="session_phase_imbalance",
+        icon="mdi:scale-unbalanced",
+        native_unit_of_measurement=PERCENTAGE,
+    ),
+    VoolSensorEntityDescription(
+        key="last_session_energy",
+        translation_key="last_session_energy",
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+    ),
+)
+
+
+# =============================================================================
+# Load Management Controller Sensors
+# Site-level values come from the same registers as a charger. The allocation
+# table, read only when enabled, adds totals and one set of sensors per
+# managed charger.
+# =============================================================================
+LMC_SENSORS: tuple[VoolSensorEntityDescription, ...] = tuple(
+    description for description in CHARGER_SENSORS if description.key != "requested_phases"
+)
+
+LMC_ALLOCATION_SENSORS: tuple[VoolSensorEntityDescription, ...] = (
+    VoolSensorEntityDescription(
+        key="lmc_active_chargers",
+        translation_key="lmc_active_chargers",
+        icon="mdi:ev-station",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    VoolSensorEntityDescription(
+        key="lmc_allocated_current",
+        translation_key="lmc_allocated_current",
+        device_class=SensorDeviceClass.CURRENT,
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+)
+
+
+def lmc_allocation_sensors(slot: int) -> tuple[VoolSensorEntityDescription, ...]:
+    """Return the sensors of one charger managed by a Load Management Controller."""
+    prefix = f"charger_{slot}"
+    return (
+        VoolSensorEntityDescription(
+            key=f"{prefix}_state",
+            name=f"Charger {slot} State",
+            icon="mdi:ev-station",
+            value_fn=lambda data: CHARGER_STATE_MAP.get(data.get(f"{prefix}_state", 0), "Unknown"),
+        ),
+        VoolSensorEntityDescription(
+            key=f"{prefix}_allocated_current",
+            name=f"Charger {slot} Allocated Current",
+            device_class=SensorDeviceClass.CURRENT,
+            native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        VoolSensorEntityDescription(
+            key=f"{prefix}_allocated_phases",
+            name=f"Charger {slot} Allocated Phases",
+            icon="mdi:sine-wave",
+        ),
+        VoolSensorEntityDescription(
+            key=f"{prefix}_power",
+            name=f"Charger {slot} Power",
+            device_class=SensorDeviceClass.POWER,
+            native_unit_of_measurement=UnitOfPower.KILO_WATT,
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+    )
+
+
+# =============================================================================
+# Site Sensors
+# Totals over every charger with aligned polling, one set per installation.
+# =============================================================================
+SITE_SENSORS: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="site_power",
+        translation_key="site_power",
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    *(
+        SensorEntityDescription(
+            key=f"site_current_{phase}",
+            translation_key=f"site_current_{phase}",
+            device_class=SensorDeviceClass.CURRENT,
+            native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+            state_class=SensorStateClass.MEASUREMENT,
+        )
+        for phase in ("l1", "l2", "l3")
+    ),
+    SensorEntityDescription(
+        key="site_charging",
+        translation_key="site_charging",
+        icon="mdi:ev-station",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+)
+
+
+def _descriptions(
+    coordinator: VoolModbusCoordinator, slave_id: int
+) -> tuple[VoolSensorEntityDescription, ...]:
+    """Return the sensor descriptions for one device."""
+    if coordinator.device_type != DEVICE_TYPE_LMC:
+        descriptions = CHARGER_SENSORS + DERIVED_SENSORS + SESSION_SENSORS
+    else:
+        descriptions = LMC_SENSORS + DERIVED_SENSORS
+        if coordinator.lmc_allocations:
+            # Only chargers present in the allocation table get sensors
+            data = (coordinator.data or {}).get(slave_id, {})
+            descriptions += LMC_ALLOCATION_SENSORS
+            for slot in range(1, LMC_MAX_CHARGERS + 1):
+                if f"charger_{slot}_state" in data:
+                    descriptions += lmc_allocation_sensors(slot)
+
+    return descriptions
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -159,10 +413,20 @@ async def async_setup_entry(
     coordinator: VoolModbusCoordinator = hass.data[DOMAIN][entry.entry_id]
 
     async_add_entities(
-        VoolSensor(coordinator, description)
-        for description in CHARGER_SENSORS
+        VoolSensor(coordinator, description, slave_id)
+        for slave_id in coordinator.slave_ids
+        for description in _descriptions(coordinator, slave_id)
     )
 
+    if coordinator.aligned and coordinator.device_type == DEVICE_TYPE_CHARGER:
+        site: VoolSiteAggregator = hass.data[DATA_SITE]
+
+        @callback
+        def add_site_sensors() -> None:
+            async_add_entities(VoolSiteSensor(site, description) for description in SITE_SENSORS)
+
+        entry.async_on_unload(site.async_add_platform(entry.entry_id, add_site_sensors))
+
 
 class VoolSensor(VoolModbusEntity, SensorEntity):
     """Representation of a VOOL sensor."""
@@ -173,18 +437,80 @@ class VoolSensor(VoolModbusEntity, SensorEntity):
         self,
         coordinator: VoolModbusCoordinator,
         description: VoolSensorEntityDescription,
+        slave_id: int,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator, description.key)
+        super().__init__(coordinator, description.key, slave_id)
         self.entity_description = description
+        # Resolved once, fields outside the snapshot layout are read by key
+        self._index = (
+            None if description.value_fn is not None else field_index(description.field or description.key)
+        )
 
     @property
     def native_value(self) -> Any:
         """Return the state of the sensor."""
-        if self.coordinator.data is None:
+        if (data := self.device_data) is None:
             return None
 
+        if self._index is not None:
+            return data.at(self._index)
+
         if self.entity_description.value_fn is not None:
-            return self.entity_description.value_fn(self.coordinator.data)
+            return self.entity_description.value_fn(data)
+
+        return data.get(self.entity_description.field or self.entity_description.key)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return additional attributes of the sensor."""
+        if self.entity_description.attrs_fn is None or (data := self.device_data) is None:
+            return None
+        return self.entity_description.attrs_fn(data)
+
 
-        return self.coordinator.data.get(self.entity_description.key)
+class VoolSiteSensor(SensorEntity):
+    """Representation of a site total over the aligned chargers."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(self, site: VoolSiteAggregator, description: SensorEntityDescription) -> None:
+        """Initialize the sensor."""
+        self._site = site
+        self.entity_description = description
+        self._attr_unique_id = f"{DOMAIN}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, "site")},
+            name="VOOL Site",
+            manufacturer="VOOL",
+            model="Site",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the site totals."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._site.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def available(self) -> bool:
+        """Return True once the first aligned cycle was aggregated."""
+        return self._site.values is not None
+
+    @property
+    def native_value(self) -> Any:
+        """Return the state of the sensor."""
+        if self._site.values is None:
+            return None
+        return self._site.values.get(self.entity_description.key.removeprefix("site_"))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the sample instant and how many chargers contributed."""
+        if self._site.values is None or self._site.sample_time is None:
+            return None
+        return {
+            "sample_time": dt_util.utc_from_timestamp(self._site.sample_time).isoformat(),
+            "chargers": self._site.values["chargers"],
+            "missing_chargers": self._site.missing,
+        }
@@ -0,0 +1,554 @@
+"""Services for VOOL Modbus integration."""
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Mapping
+from functools import partial
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .allocator import VoolCurrentAllocator
+from .const import (
+    CAPTURE_DEFAULT_INTERVAL,
+    CAPTURE_DEFAULT_SIZE,
+    CAPTURE_DIRECTORY,
+    CAPTURE_MAX_SIZE,
+    CAPTURE_MIN_INTERVAL,
+    CHARGING_CMD_START,
+    CHARGING_CMD_STOP,
+    CYCLE_TRACE_MAX_EVERY,
+    DATA_ALLOCATOR,
+    DEFAULT_SCAN_INTERVAL,
+    DEVICE_TYPE_CHARGER,
+    DOMAIN,
+    GROUP_DEFAULT_CONCURRENCY,
+    GROUP_MAX_CONCURRENCY,
+    GROUP_MAX_STAGGER,
+    PHASES_L1,
+    PHASES_L1_L2,
+    PHASES_L1_L2_L3,
+    PROFILE_DEFAULT_CYCLES,
+    PROFILE_MAX_CYCLES,
+    PROFILE_TIMEOUT_MARGIN,
+    REG_CHARGING_COMMAND,
+    REG_EXTERNAL_ALLOWED_PHASES,
+    REG_EXTERNAL_CURRENT_LIMIT,
+    SCHEDULE_MAX_SLOTS,
+)
+from .coordinator import VoolModbusCoordinator
+from .group import GroupTarget, async_group_command
+from .profiling import VoolProfiler
+from .schedule import ChargingSchedule, ScheduleSlot, VoolScheduleExecutor
+from .spans import MAX_READ_COUNT, coalesce, parse_addresses
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_SET_SITE_CURRENT_BUDGET = "set_site_current_budget"
+SERVICE_CLEAR_SITE_CURRENT_BUDGET = "clear_site_current_budget"
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+SERVICE_START_TRACE = "start_trace"
+SERVICE_STOP_TRACE = "stop_trace"
+SERVICE_READ_REGISTERS = "read_registers"
+SERVICE_WRITE_REGISTERS = "write_registers"
+SERVICE_GROUP_COMMAND = "group_command"
+SERVICE_PROFILE = "profile"
+SERVICE_TRACE_CYCLES = "trace_cycles"
+SERVICE_SET_CHARGING_SCHEDULE = "set_charging_schedule"
+SERVICE_CLEAR_CHARGING_SCHEDULE = "clear_charging_schedule"
+
+ATTR_CURRENT = "current"
+ATTR_CURRENT_L1 = "current_l1"
+ATTR_CURRENT_L2 = "current_l2"
+ATTR_CURRENT_L3 = "current_l3"
+ATTR_ENTRY_ID = "entry_id"
+ATTR_SLAVE_ID = "slave_id"
+ATTR_INTERVAL = "interval"
+ATTR_MAX_SIZE = "max_size"
+ATTR_REGISTERS = "registers"
+ATTR_INPUT_REGISTERS = "input_registers"
+ATTR_MAX_GAP = "max_gap"
+ATTR_COMMAND = "command"
+ATTR_PHASES = "phases"
+ATTR_MAX_CONCURRENCY = "max_concurrency"
+ATTR_STAGGER = "stagger"
+ATTR_CYCLES = "cycles"
+ATTR_CPROFILE = "cprofile"
+ATTR_EVERY = "every"
+ATTR_SLOTS = "slots"
+ATTR_START = "start"
+
+GROUP_COMMANDS: dict[str, int] = {"start": CHARGING_CMD_START, "stop": CHARGING_CMD_STOP}
+PHASES_BY_COUNT: dict[int, int] = {1: PHASES_L1, 2: PHASES_L1_L2, 3: PHASES_L1_L2_L3}
+
+# Upper bound of registers in one bulk service call
+MAX_BULK_REGISTERS = 4096
+
+_CURRENT = vol.All(vol.Coerce(float), vol.Range(min=0, max=2000))
+
+SET_SITE_CURRENT_BUDGET_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CURRENT): _CURRENT,
+        vol.Optional(ATTR_CURRENT_L1): _CURRENT,
+        vol.Optional(ATTR_CURRENT_L2): _CURRENT,
+        vol.Optional(ATTR_CURRENT_L3): _CURRENT,
+    }
+)
+
+START_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): str,
+        vol.Optional(ATTR_SLAVE_ID): vol.Coerce(int),
+        vol.Optional(ATTR_INTERVAL, default=CAPTURE_DEFAULT_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=CAPTURE_MIN_INTERVAL, max=60)
+        ),
+        vol.Optional(ATTR_MAX_SIZE, default=CAPTURE_DEFAULT_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=CAPTURE_MAX_SIZE)
+        ),
+    }
+)
+
+ENTRY_SCHEMA = vol.Schema({vol.Required(ATTR_ENTRY_ID): str})
+
+STOP_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): str,
+        vol.Optional(ATTR_SLAVE_ID): vol.Coerce(int),
+    }
+)
+
+READ_REGISTERS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): str,
+        vol.Optional(ATTR_SLAVE_ID): vol.Coerce(int),
+        vol.Required(ATTR_REGISTERS): vol.All(cv.ensure_list, [vol.Any(int, str)]),
+        vol.Optional(ATTR_INPUT_REGISTERS, default=False): bool,
+        vol.Optional(ATTR_MAX_GAP): vol.All(vol.Coerce(int), vol.Range(min=0, max=16)),
+    }
+)
+
+WRITE_REGISTERS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): str,
+        vol.Optional(ATTR_SLAVE_ID): vol.Coerce(int),
+        vol.Required(ATTR_REGISTERS): vol.All(
+            {
+                vol.All(vol.Coerce(int), vol.Range(min=0, max=0xFFFF)): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=0xFFFF)
+                )
+            },
+            vol.Length(min=1, max=MAX_BULK_REGISTERS),
+        ),
+    }
+)
+
+CONTROL_FIELDS = {
+    vol.Optional(ATTR_COMMAND): vol.In(GROUP_COMMANDS),
+    # Same range as the external current limit number
+    vol.Optional(ATTR_CURRENT): vol.All(vol.Coerce(float), vol.Range(min=6, max=32)),
+    vol.Optional(ATTR_PHASES): vol.All(vol.Coerce(int), vol.In(PHASES_BY_COUNT)),
+}
+
+GROUP_COMMAND_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **cv.TARGET_SERVICE_FIELDS,
+            **CONTROL_FIELDS,
+            vol.Optional(ATTR_MAX_CONCURRENCY, default=GROUP_DEFAULT_CONCURRENCY): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=GROUP_MAX_CONCURRENCY)
+            ),
+            vol.Optional(ATTR_STAGGER, default=0): vol.All(
+                vol.Coerce(float), vol.Range(min=0, max=GROUP_MAX_STAGGER)
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_COMMAND, ATTR_CURRENT, ATTR_PHASES),
+)
+
+SCHEDULE_SLOT_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            # A time of day repeats daily, a date and time runs once
+            vol.Required(ATTR_START): vol.Any(cv.time, cv.datetime),
+            **CONTROL_FIELDS,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_COMMAND, ATTR_CURRENT, ATTR_PHASES),
+)
+
+SET_CHARGING_SCHEDULE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): str,
+        vol.Optional(ATTR_SLAVE_ID): vol.Coerce(int),
+        vol.Required(ATTR_SLOTS): vol.All(
+            cv.ensure_list, vol.Length(min=1, max=SCHEDULE_MAX_SLOTS), [SCHEDULE_SLOT_SCHEMA]
+        ),
+    }
+)
+
+CLEAR_CHARGING_SCHEDULE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): str,
+        vol.Optional(ATTR_SLAVE_ID): vol.Coerce(int),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): str,
+        vol.Optional(ATTR_CYCLES, default=PROFILE_DEFAULT_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=PROFILE_MAX_CYCLES)
+        ),
+        vol.Optional(ATTR_CPROFILE, default=False): bool,
+    }
+)
+
+TRACE_CYCLES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTRY_ID): str,
+        vol.Optional(ATTR_EVERY, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=CYCLE_TRACE_MAX_EVERY)
+        ),
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, call: ServiceCall) -> VoolModbusCoordinator:
+    """Return the coordinator of the config entry a service call targets."""
+    coordinator: VoolModbusCoordinator | None = hass.data.get(DOMAIN, {}).get(call.data[ATTR_ENTRY_ID])
+    if coordinator is None:
+        raise ServiceValidationError(f"Config entry {call.data[ATTR_ENTRY_ID]} is not loaded")
+    slave_id = call.data.get(ATTR_SLAVE_ID)
+    if slave_id is not None and slave_id not in coordinator.slave_ids:
+        raise ServiceValidationError(f"Unknown slave ID {slave_id}")
+    return coordinator
+
+
+def _get_scheduler(hass: HomeAssistant, call: ServiceCall) -> tuple[VoolScheduleExecutor, int]:
+    """Return the schedule executor and slave ID of the charger a service call targets."""
+    coordinator = _get_coordinator(hass, call)
+    if coordinator.scheduler is None:
+        raise ServiceValidationError("Charging schedules are only supported by chargers")
+    return coordinator.scheduler, call.data.get(ATTR_SLAVE_ID, coordinator.slave_id)
+
+
+def _group_targets(hass: HomeAssistant, call: ServiceCall) -> list[GroupTarget]:
+    """Return the chargers a group command targets, all chargers without a target."""
+    chargers: dict[str, tuple[VoolModbusCoordinator, int]] = {
+        coordinator.device_key(slave_id): (coordinator, slave_id)
+        for coordinator in hass.data.get(DOMAIN, {}).values()
+        if coordinator.device_type == DEVICE_TYPE_CHARGER
+        for slave_id in coordinator.slave_ids
+    }
+    device_registry = dr.async_get(hass)
+
+    if not any(call.data.get(str(key)) for key in cv.TARGET_SERVICE_FIELDS):
+        device_ids = {
+            device.id
+            for key in chargers
+            if (device := device_registry.async_get_device(identifiers={(DOMAIN, key)})) is not None
+        }
+    else:
+        selected = async_extract_referenced_entity_ids(hass, call)
+        entity_registry = er.async_get(hass)
+        device_ids = set(selected.referenced_devices)
+        for entity_id in selected.referenced | selected.indirectly_referenced:
+            if (entity := entity_registry.async_get(entity_id)) is not None and entity.device_id:
+                device_ids.add(entity.device_id)
+
+    targets: list[GroupTarget] = []
+    for device_id in sorted(device_ids):
+        if (device := device_registry.async_get(device_id)) is None:
+            continue
+        for domain, key in device.identifiers:
+            if domain == DOMAIN and key in chargers:
+                targets.append(GroupTarget(device_id, *chargers[key]))
+                break
+
+    if not targets:
+        raise ServiceValidationError("No loaded VOOL chargers are targeted")
+    return targets
+
+
+def _control_registers(data: Mapping[str, Any]) -> dict[int, int]:
+    """Return the control register values of a command, current and phases."""
+    registers: dict[int, int] = {}
+    if ATTR_COMMAND in data:
+        registers[REG_CHARGING_COMMAND] = GROUP_COMMANDS[data[ATTR_COMMAND]]
+    if ATTR_CURRENT in data:
+        registers[REG_EXTERNAL_CURRENT_LIMIT] = round(data[ATTR_CURRENT] * 100)
+    if ATTR_PHASES in data:
+        registers[REG_EXTERNAL_ALLOWED_PHASES] = PHASES_BY_COUNT[data[ATTR_PHASES]]
+    return registers
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def handle_set_site_current_budget(call: ServiceCall) -> None:
+        """Set the per-phase current budget shared by all chargers."""
+        current = call.data[ATTR_CURRENT]
+        budget = (
+            call.data.get(ATTR_CURRENT_L1, current),
+            call.data.get(ATTR_CURRENT_L2, current),
+            call.data.get(ATTR_CURRENT_L3, current),
+        )
+        allocator: VoolCurrentAllocator = hass.data[DATA_ALLOCATOR]
+        allocator.async_set_budget(budget)
+
+    async def handle_clear_site_current_budget(call: ServiceCall) -> None:
+        """Stop allocating a site budget."""
+        allocator: VoolCurrentAllocator = hass.data[DATA_ALLOCATOR]
+        allocator.async_set_budget(None)
+
+    async def handle_start_capture(call: ServiceCall) -> ServiceResponse:
+        """Start a high-rate capture of a device into a ring file."""
+        coordinator = _get_coordinator(hass, call)
+        slave_id = call.data.get(ATTR_SLAVE_ID, coordinator.slave_id)
+        path = await coordinator.capture.async_start(
+            slave_id, call.data[ATTR_INTERVAL], call.data[ATTR_MAX_SIZE] * 1024 * 1024
+        )
+        return {"path": path}
+
+    async def handle_stop_capture(call: ServiceCall) -> None:
+        """Stop the capture of a device, or of every device of the entry."""
+        coordinator = _get_coordinator(hass, call)
+        await coordinator.capture.async_stop(call.data.get(ATTR_SLAVE_ID))
+
+    async def handle_start_trace(call: ServiceCall) -> ServiceResponse:
+        """Record the Modbus traffic of a config entry into a trace file."""
+        coordinator = _get_coordinator(hass, call)
+        name = slugify(f"{coordinator.host}_{dt_util.now().strftime('%Y%m%d_%H%M%S')}")
+        path = hass.config.path(CAPTURE_DIRECTORY, f"trace_{name}.jsonl")
+        await hass.async_add_executor_job(partial(os.makedirs, os.path.dirname(path), exist_ok=True))
+        await coordinator.async_start_trace(path)
+        return {"path": path}
+
+    async def handle_stop_trace(call: ServiceCall) -> ServiceResponse:
+        """Stop recording a trace."""
+        coordinator = _get_coordinator(hass, call)
+        if (trace := await coordinator.async_stop_trace()) is None:
+            raise ServiceValidationError("No trace is being recorded")
+        return {"path": trace.path, "entries": trace.entries}
+
+    async def handle_read_registers(call: ServiceCall) -> ServiceResponse:
+        """Read raw registers, coalesced into as few requests as possible."""
+        coordinator = _get_coordinator(hass, call)
+        slave_id = call.data.get(ATTR_SLAVE_ID, coordinator.slave_id)
+        try:
+            addresses = parse_addresses(call.data[ATTR_REGISTERS])
+        except ValueError as err:
+            raise ServiceValidationError(str(err)) from err
+        if len(addresses) > MAX_BULK_REGISTERS:
+            raise ServiceValidationError(f"At most {MAX_BULK_REGISTERS} registers can be read at once")
+
+        wanted = set(addresses)
+        spans = coalesce(addresses, MAX_READ_COUNT, call.data.get(ATTR_MAX_GAP, coordinator.read_gap))
+        values: dict[str, int] = {}
+        errors: dict[str, str] = {}
+        for span in spans:
+            # Every span is queued separately, so polling can run in between
+            result = await coordinator.async_forward_read(
+                slave_id, call.data[ATTR_INPUT_REGISTERS], span.address, span.count
+            )
+            if result is None:
+                errors[str(span)] = "No response"
+            elif result.isError():
+                errors[str(span)] = str(result)
+            else:
+                for register, value in enumerate(result.registers[: span.count], start=span.address):
+                    if register in wanted:
+                        values[str(register)] = value
+
+        return {"registers": values, "requests": len(spans), "errors": errors}
+
+    async def handle_write_registers(call: ServiceCall) -> ServiceResponse:
+        """Write raw registers, consecutive ones in a single request."""
+        coordinator = _get_coordinator(hass, call)
+        slave_id = call.data.get(ATTR_SLAVE_ID, coordinator.slave_id)
+        if slave_id not in coordinator.slave_ids:
+            raise ServiceValidationError(f"Slave ID {slave_id} is not configured on this entry")
+
+        ok, requests = await coordinator.async_write_register_map(call.data[ATTR_REGISTERS], slave_id)
+        await coordinator.async_request_refresh()
+        result: dict[str, Any] = {"success": ok, "requests": requests}
+        if not ok:
+            result["error"] = f"Write failed at request {requests}"
+        return result
+
+    async def handle_group_command(call: ServiceCall) -> ServiceResponse:
+        """Write a command, current limit and phases to many chargers at once."""
+        targets = _group_targets(hass, call)
+        registers = _control_registers(call.data)
+
+        return await async_group_command(
+            targets, registers, call.data[ATTR_MAX_CONCURRENCY], call.data[ATTR_STAGGER]
+        )
+
+    async def handle_profile(call: ServiceCall) -> ServiceResponse:
+        """Time a number of polling cycles and write the results to the config directory."""
+        coordinator = _get_coordinator(hass, call)
+        if coordinator.profiler is not None:
+            raise ServiceValidationError("A profile of this config entry is already running")
+
+        name = slugify(f"{coordinator.host}_{dt_util.now().strftime('%Y%m%d_%H%M%S')}")
+        directory = hass.config.path(CAPTURE_DIRECTORY)
+        await hass.async_add_executor_job(partial(os.makedirs, directory, exist_ok=True))
+
+        cycles = call.data[ATTR_CYCLES]
+        interval = (
+            coordinator.update_interval.total_seconds() if coordinator.update_interval else DEFAULT_SCAN_INTERVAL
+        )
+        profiler = coordinator.profiler = VoolProfiler(coordinator, cycles, call.data[ATTR_CPROFILE])
+        profiler.install()
+        try:
+            complete = await profiler.async_wait(cycles * interval * 2 + PROFILE_TIMEOUT_MARGIN)
+        finally:
+            profiler.finish()
+            coordinator.profiler = None
+
+        summary = await hass.async_add_executor_job(
+            profiler.write,
+            os.path.join(directory, f"profile_{name}.json"),
+            os.path.join(directory, f"profile_{name}.pstats") if call.data[ATTR_CPROFILE] else None,
+        )
+        summary["complete"] = complete
+        return summary
+
+    async def handle_set_charging_schedule(call: ServiceCall) -> ServiceResponse:
+        """Replace the charging schedule of a charger and write the slot in effect."""
+        scheduler, slave_id = _get_scheduler(hass, call)
+        try:
+            schedule = ChargingSchedule.from_slots(
+                [ScheduleSlot(slot[ATTR_START], _control_registers(slot)) for slot in call.data[ATTR_SLOTS]]
+            )
+        except ValueError as err:
+            raise ServiceValidationError(str(err)) from err
+        if scheduler.command_only and any(
+            ATTR_CURRENT in slot or ATTR_PHASES in slot for slot in call.data[ATTR_SLOTS]
+        ):
+            raise ServiceValidationError(
+                "Load balancing or solar charging controls the current limit and phases "
+                "of this charger; its schedule can only start and stop charging"
+            )
+        await scheduler.async_set(slave_id, schedule)
+        next_start = schedule.next_start(dt_util.utcnow())
+        return {
+            "daily": schedule.daily,
+            "slots": len(schedule.slots),
+            "next_start": None if next_start is None else next_start.isoformat(),
+        }
+
+    async def handle_clear_charging_schedule(call: ServiceCall) -> None:
+        """Remove the charging schedule of a charger."""
+        scheduler, slave_id = _get_scheduler(hass, call)
+        await scheduler.async_clear(slave_id)
+
+    async def handle_trace_cycles(call: ServiceCall) -> None:
+        """Log a trace record for every Nth polling cycle of an entry, 0 stops."""
+        coordinator = _get_coordinator(hass, call)
+        coordinator.tracer.enable(call.data[ATTR_EVERY])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_SITE_CURRENT_BUDGET,
+        handle_set_site_current_budget,
+        schema=SET_SITE_CURRENT_BUDGET_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CLEAR_SITE_CURRENT_BUDGET,
+        handle_clear_site_current_budget,
+        schema=vol.Schema({}),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_CAPTURE,
+        handle_start_capture,
+        schema=START_CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_CAPTURE,
+        handle_stop_capture,
+        schema=STOP_CAPTURE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_TRACE,
+        handle_start_trace,
+        schema=ENTRY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_TRACE,
+        handle_stop_trace,
+        schema=ENTRY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_READ_REGISTERS,
+        handle_read_registers,
+        schema=READ_REGISTERS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_WRITE_REGISTERS,
+        handle_write_registers,
+        schema=WRITE_REGISTERS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GROUP_COMMAND,
+        handle_group_command,
+        schema=GROUP_COMMAND_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_TRACE_CYCLES,
+        handle_trace_cycles,
+        schema=TRACE_CYCLES_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_CHARGING_SCHEDULE,
+        handle_set_charging_schedule,
+        schema=SET_CHARGING_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CLEAR_CHARGING_SCHEDULE,
+        handle_clear_charging_schedule,
+        schema=CLEAR_CHARGING_SCHEDULE_SCHEMA,
+    )
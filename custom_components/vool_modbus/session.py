@@ -0,0 +1,208 @@
+"""Charging session statistics for VOOL Modbus integration.
+
+A session starts when a vehicle is connected and ends when it is unplugged.
+Every poll updates running aggregates of the session in constant time, so
+energy, duration, power and per-phase current statistics need no recorder
+queries. The aggregates are stored so that a session in progress survives a
+restart of Home Assistant.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    CHARGER_STATE_MAP,
+    DOMAIN,
+    SESSION_END_STATES,
+    SESSION_MAX_GAP,
+    SESSION_SAVE_DELAY,
+    SESSION_UNKNOWN_STATE,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Charger state while the vehicle draws current
+STATE_CHARGING = 3
+
+PHASE_KEYS = ("current_l1", "current_l2", "current_l3")
+
+
+@dataclass
+class SessionStats:
+    """Running aggregates of one charging session.
+
+    Each poll accounts for the time since the previous poll with the values it
+    read, so every update is O(1) regardless of the session length. Only the
+    time in each state is attributed to the state of the previous poll.
+    """
+
+    started: float
+    last_sample: float
+    last_state: int = SESSION_UNKNOWN_STATE
+    last_energy: float | None = None
+    energy: float = 0.0
+    charging_time: float = 0.0
+    power_min: float | None = None
+    power_max: float | None = None
+    # Time integrals while charging, kW·s and A·s
+    power_integral: float = 0.0
+    current_integrals: list[float] = field(default_factory=lambda: [0.0, 0.0, 0.0])
+    state_time: dict[str, float] = field(default_factory=dict)
+
+    def update(self, now: float, data: dict[str, Any]) -> None:
+        """Add one poll to the aggregates."""
+        dt = max(now - self.last_sample, 0.0)
+        self.last_sample = now
+        state = data.get("charger_state", SESSION_UNKNOWN_STATE)
+        power = data.get("active_power", 0.0)
+
+        name = CHARGER_STATE_MAP.get(self.last_state, str(self.last_state))
+        self.state_time[name] = self.state_time.get(name, 0.0) + dt
+        self.last_state = state
+
+        energy = data.get("energy_imported")
+        if energy is not None:
+            if self.last_energy is not None and energy >= self.last_energy:
+                self.energy += energy - self.last_energy
+            # A counter that went backwards was reset, continue from its new value
+            self.last_energy = energy
+        elif dt <= SESSION_MAX_GAP:
+            # No energy counter: integrate the power instead
+            self.energy += max(power, 0.0) * dt / 3600
+
+        if state != STATE_CHARGING:
+            return
+        self.power_min = power if self.power_min is None else min(self.power_min, power)
+        self.power_max = power if self.power_max is None else max(self.power_max, power)
+        if dt > SESSION_MAX_GAP:
+            # Home Assistant was not running, the values in between are unknown
+            return
+        self.charging_time += dt
+        self.power_integral += power * dt
+        for index, key in enumerate(PHASE_KEYS):
+            self.current_integrals[index] += data.get(key, 0.0) * dt
+
+    def summary(self, now: float) -> dict[str, Any]:
+        """Return the session statistics."""
+        mean_currents = [
+            round(integral / self.charging_time, 2) if self.charging_time else None
+            for integral in self.current_integrals
+        ]
+        used = [current for current in mean_currents if current]
+        imbalance = None
+        if used:
+            imbalance = round((max(mean_currents) - min(mean_currents)) / max(mean_currents) * 100, 1)
+
+        return {
+            "session_energy": round(self.energy, 3),
+            "session_time": round(now - self.started),
+            "session_charging_time": round(self.charging_time),
+            "session_average_power": (
+                round(self.power_integral / self.charging_time, 2) if self.charging_time else None
+            ),
+            "session_min_power": self.power_min,
+            "session_peak_power": self.power_max,
+            "session_average_current": round(sum(used) / len(used), 2) if used else None,
+            "session_current_l1": mean_currents[0],
+            "session_current_l2": mean_currents[1],
+            "session_current_l3": mean_currents[2],
+            "session_phase_imbalance": imbalance,
+            "session_state_time": {name: round(seconds) for name, seconds in self.state_time.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SessionStats:
+        """Create session statistics from stored data."""
+        return cls(**data)
+
+
+class VoolSessionTracker:
+    """Track the charging sessions of the chargers behind a config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the tracker."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.sessions"
+        )
+        self._active: dict[int, SessionStats] = {}
+        # Summary of the last finished session per slave
+        self._last: dict[int, dict[str, Any]] = {}
+        self._previous_energy: dict[int, float] = {}
+        self.loaded = False
+
+    async def async_load(self) -> None:
+        """Load sessions in progress and the last finished sessions."""
+        data = await self._store.async_load() or {}
+        self._active = {
+            int(slave_id): SessionStats.from_dict(stats)
+            for slave_id, stats in data.get("active", {}).items()
+        }
+        self._last = {int(slave_id): summary for slave_id, summary in data.get("last", {}).items()}
+        self.loaded = True
+
+    async def async_remove(self) -> None:
+        """Remove the stored sessions."""
+        await self._store.async_remove()
+
+    def update(
+        self, slave_id: int, data: dict[str, Any], now: float
+    ) -> dict[str, Any] | None:
+        """Feed one poll of a charger and add the session values to its data.
+
+        Return the summary of the session if this poll ended it.
+        """
+        state = data.get("charger_state", SESSION_UNKNOWN_STATE)
+        energy = data.get("energy_imported")
+        previous_energy = self._previous_energy.get(slave_id)
+        if energy is not None:
+            self._previous_energy[slave_id] = energy
+
+        finished: dict[str, Any] | None = None
+        session = self._active.get(slave_id)
+
+        if session is not None and state in SESSION_END_STATES:
+            session.update(now, data)
+            finished = session.summary(now)
+            self._last[slave_id] = finished
+            del self._active[slave_id]
+        elif session is None and self._is_start(state, energy, previous_energy):
+            session = SessionStats(started=now, last_sample=now, last_state=state, last_energy=energy)
+            self._active[slave_id] = session
+        elif session is not None:
+            session.update(now, data)
+
+        if session is not None and slave_id in self._active:
+            data.update(session.summary(now))
+            data["session_active"] = True
+        else:
+            # Between sessions the last finished session stays visible
+            data.update(self._last.get(slave_id, {}))
+            data["session_active"] = False
+        if slave_id in self._last:
+            data["last_session_energy"] = self._last[slave_id]["session_energy"]
+
+        if session is not None or finished is not None:
+            self._store.async_delay_save(self._data_to_save, SESSION_SAVE_DELAY)
+        return finished
+
+    @staticmethod
+    def _is_start(state: int, energy: float | None, previous_energy: float | None) -> bool:
+        """Return True if a poll shows a session that is not tracked yet."""
+        if state in SESSION_END_STATES:
+            return False
+        if state != SESSION_UNKNOWN_STATE:
+            return True
+        # With an unknown state, energy flowing into a vehicle still means a session
+        return energy is not None and previous_energy is not None and energy > previous_energy
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "active": {str(slave_id): asdict(stats) for slave_id, stats in self._active.items()},
+            "last": {str(slave_id): summary for slave_id, summary in self._last.items()},
+        }
@@ -0,0 +1,180 @@
+"""Site aggregates across VOOL chargers.
+
+Chargers of entries with aligned polling are all sampled on the same
+wall-clock boundaries. The aggregator waits until every member reported the
+snapshot of a boundary (or a short grace period passed) and computes the
+site totals once per cycle from snapshots of that instant only, so a total
+never mixes a fresh reading of one charger with a stale one of another.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import SITE_CHARGING_STATE, SITE_GRACE
+
+if TYPE_CHECKING:
+    from .coordinator import VoolModbusCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def aggregate(snapshots: list[dict[str, Any]]) -> dict[str, Any]:
+    """Return the site totals of charger snapshots taken at the same instant."""
+    totals: dict[str, Any] = {
+        "power": 0.0,
+        "current_l1": 0.0,
+        "current_l2": 0.0,
+        "current_l3": 0.0,
+        "charging": 0,
+        "chargers": len(snapshots),
+    }
+    for data in snapshots:
+        totals["power"] += data.get("active_power") or 0.0
+        totals["current_l1"] += data.get("current_l1") or 0.0
+        totals["current_l2"] += data.get("current_l2") or 0.0
+        totals["current_l3"] += data.get("current_l3") or 0.0
+        if data.get("charger_state") == SITE_CHARGING_STATE:
+            totals["charging"] += 1
+    for key in ("power", "current_l1", "current_l2", "current_l3"):
+        totals[key] = round(totals[key], 2)
+    return totals
+
+
+class VoolSiteAggregator:
+    """Compute site totals once per aligned polling cycle."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the aggregator."""
+        self.hass = hass
+        self._members: dict[VoolModbusCoordinator, CALLBACK_TYPE] = {}
+        # Latest aligned snapshots per member and the instant they were taken
+        self._snapshots: dict[VoolModbusCoordinator, tuple[float, list[dict[str, Any]]]] = {}
+        self._unsub_grace: CALLBACK_TYPE | None = None
+        self._listeners: set[CALLBACK_TYPE] = set()
+        # Entity factories of the sensor platforms that can host the site sensors
+        self._platforms: dict[str, Callable[[], None]] = {}
+        self._owner: str | None = None
+        self.values: dict[str, Any] | None = None
+        self.sample_time: float | None = None
+        self.missing = 0
+
+    @callback
+    def async_add_coordinator(self, coordinator: VoolModbusCoordinator) -> CALLBACK_TYPE:
+        """Add the chargers of an aligned coordinator. Return a callback to remove them."""
+
+        @callback
+        def handle_update() -> None:
+            self._async_collect(coordinator)
+
+        self._members[coordinator] = coordinator.async_add_listener(handle_update)
+
+        @callback
+        def remove() -> None:
+            if (unsub := self._members.pop(coordinator, None)) is not None:
+                unsub()
+            self._snapshots.pop(coordinator, None)
+
+        return remove
+
+    @callback
+    def async_add_platform(self, entry_id: str, add_entities: Callable[[], None]) -> CALLBACK_TYPE:
+        """Offer a sensor platform to host the site sensors.
+
+        The first platform adds them. When its entry unloads, the next one
+        takes over, so the sensors stay while any aligned charger is loaded.
+        """
+        self._platforms[entry_id] = add_entities
+        if self._owner is None:
+            self._owner = entry_id
+            add_entities()
+
+        @callback
+        def remove() -> None:
+            self._platforms.pop(entry_id, None)
+            if self._owner != entry_id:
+                return
+            self._owner = next(iter(self._platforms), None)
+            if self._owner is not None:
+                self._platforms[self._owner]()
+
+        return remove
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for new totals. Return a callback to stop listening."""
+        self._listeners.add(update_callback)
+
+        @callback
+        def remove() -> None:
+            self._listeners.discard(update_callback)
+
+        return remove
+
+    @callback
+    def async_shutdown(self, _event: Event | None = None) -> None:
+        """Stop all listeners and timers, called when Home Assistant stops."""
+        for unsub in self._members.values():
+            unsub()
+        self._members.clear()
+        self._snapshots.clear()
+        if self._unsub_grace is not None:
+            self._unsub_grace()
+            self._unsub_grace = None
+
+    @callback
+    def _async_collect(self, coordinator: VoolModbusCoordinator) -> None:
+        """Take the snapshot of an aligned cycle of one coordinator."""
+        if not coordinator.sample_aligned or coordinator.sample_time is None:
+            return
+        sample_time = coordinator.sample_time
+        previous = self._snapshots.get(coordinator)
+        if previous is not None and previous[0] == sample_time:
+            # Listeners also fire when a write updates the snapshot in place
+            return
+        self._snapshots[coordinator] = (sample_time, list((coordinator.data or {}).values()))
+
+        if all(
+            coordinator in self._snapshots and self._snapshots[coordinator][0] == sample_time
+            for coordinator in self._members
+        ):
+            self._async_publish(sample_time)
+        elif self._unsub_grace is None:
+            self._unsub_grace = async_call_later(self.hass, SITE_GRACE, self._async_grace_expired)
+
+    @callback
+    def _async_grace_expired(self, _now: Any = None) -> None:
+        """Publish the newest cycle without the members that did not report it."""
+        self._unsub_grace = None
+        if self._snapshots:
+            self._async_publish(max(sample_time for sample_time, _ in self._snapshots.values()))
+
+    @callback
+    def _async_publish(self, sample_time: float) -> None:
+        """Compute the totals of one cycle and notify the site sensors."""
+        if self._unsub_grace is not None:
+            self._unsub_grace()
+            self._unsub_grace = None
+        if self.sample_time is not None and sample_time <= self.sample_time:
+            return
+
+        snapshots: list[dict[str, Any]] = []
+        self.missing = 0
+        for coordinator in self._members:
+            taken, devices = self._snapshots.get(coordinator, (None, []))
+            if taken == sample_time:
+                snapshots.extend(data for data in devices if data.get("sample_time") == sample_time)
+                self.missing += len(coordinator.slave_ids) - len(devices)
+            else:
+                self.missing += len(coordinator.slave_ids)
+
+        self.values = aggregate(snapshots)
+        self.sample_time = sample_time
+        if self.missing:
+            _LOGGER.debug("Site totals of %s computed without %d chargers", sample_time, self.missing)
+        for update_callback in list(self._listeners):
+            update_callback()
@@ -0,0 +1,179 @@
+"""Device snapshot for VOOL Modbus integration.
+
+A snapshot holds the decoded values of one device from one poll. Fields the
+integration knows about live in a fixed-layout list, so entities resolve the
+index of their field once when they are created and read it with ``at()``
+instead of hashing a key on every state write. Keys outside the layout, such
+as the LMC allocation table, go to an overflow dict.
+
+Snapshots implement the mapping interface, so code that treats them as the
+``dict`` they replace keeps working.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, MutableMapping
+from typing import Any
+
+from .const import CHARGER_STATE_MAP
+
+FIELDS: tuple[str, ...] = (
+    # Status registers 100-111
+    "charger_state",
+    "requested_phases",
+    "current_l1",
+    "current_l2",
+    "current_l3",
+    "voltage_l1",
+    "voltage_l2",
+    "voltage_l3",
+    "active_power",
+    "l1_power",
+    "l2_power",
+    "l3_power",
+    # Energy and control registers
+    "energy_imported",
+    "charging_command",
+    "external_current_limit",
+    "external_allowed_phases",
+    # Load Management Controller totals
+    "lmc_active_chargers",
+    "lmc_allocated_current",
+    # Derived once per poll
+    "charger_state_label",
+    "apparent_power_l1",
+    "apparent_power_l2",
+    "apparent_power_l3",
+    "total_current",
+    "apparent_power",
+    "power_factor",
+    "current_imbalance",
+    "energy_power",
+    "limit_drift_events",
+    "sample_time",
+    # Charging session statistics
+    "session_active",
+    "session_energy",
+    "session_time",
+    "session_charging_time",
+    "session_average_power",
+    "session_min_power",
+    "session_peak_power",
+    "session_average_current",
+    "session_current_l1",
+    "session_current_l2",
+    "session_current_l3",
+    "session_phase_imbalance",
+    "session_state_time",
+    "last_session_energy",
+)
+FIELD_INDEX: dict[str, int] = {key: index for index, key in enumerate(FIELDS)}
+
+_STATE = FIELD_INDEX["charger_state"]
+_STATE_LABEL = FIELD_INDEX["charger_state_label"]
+_MISSING: Any = object()
+
+
+def field_index(key: str) -> int | None:
+    """Return the index of a field in the snapshot layout, None if it has none."""
+    return FIELD_INDEX.get(key)
+
+
+class DeviceSnapshot(MutableMapping[str, Any]):
+    """Decoded values of one device from one poll."""
+
+    __slots__ = ("_extra", "_values")
+
+    def __init__(self, values: Mapping[str, Any] | None = None) -> None:
+        """Initialize the snapshot, optionally from a mapping."""
+        self._values: list[Any] = [_MISSING] * len(FIELDS)
+        self._extra: dict[str, Any] | None = None
+        if values:
+            self.update(values)
+
+    def at(self, index: int) -> Any:
+        """Return the value of a field by index, None if it is not set."""
+        value = self._values[index]
+        return None if value is _MISSING else value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value of a key, or the default."""
+        index = FIELD_INDEX.get(key)
+        if index is None:
+            return default if self._extra is None else self._extra.get(key, default)
+        value = self._values[index]
+        return default if value is _MISSING else value
+
+    def update(self, other: Any = (), /, **kwargs: Any) -> None:
+        """Set the values of a mapping or iterable of pairs."""
+        values = self._values
+        index_of = FIELD_INDEX.get
+        items = other.items() if isinstance(other, Mapping) else other
+        for key, value in (*items, *kwargs.items()):
+            index = index_of(key)
+            if index is None:
+                if self._extra is None:
+                    self._extra = {}
+                self._extra[key] = value
+                continue
+            values[index] = value
+            if index == _STATE:
+                values[_STATE_LABEL] = CHARGER_STATE_MAP.get(value, "Unknown")
+
+    def copy(self) -> DeviceSnapshot:
+        """Return a shallow copy."""
+        snapshot = DeviceSnapshot()
+        snapshot._values = list(self._values)
+        snapshot._extra = None if self._extra is None else dict(self._extra)
+        return snapshot
+
+    def __getitem__(self, key: str) -> Any:
+        index = FIELD_INDEX.get(key)
+        if index is None:
+            if self._extra is None:
+                raise KeyError(key)
+            return self._extra[key]
+        value = self._values[index]
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        index = FIELD_INDEX.get(key)
+        if index is None:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+            return
+        self._values[index] = value
+        if index == _STATE:
+            self._values[_STATE_LABEL] = CHARGER_STATE_MAP.get(value, "Unknown")
+
+    def __delitem__(self, key: str) -> None:
+        index = FIELD_INDEX.get(key)
+        if index is None:
+            if self._extra is None:
+                raise KeyError(key)
+            del self._extra[key]
+        elif self._values[index] is _MISSING:
+            raise KeyError(key)
+        else:
+            self._values[index] = _MISSING
+
+    def __contains__(self, key: object) -> bool:
+        index = FIELD_INDEX.get(key) if isinstance(key, str) else None
+        if index is None:
+            return self._extra is not None and key in self._extra
+        return self._values[index] is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        for key, value in zip(FIELDS, self._values):
+            if value is not _MISSING:
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return len(self._values) - self._values.count(_MISSING) + len(self._extra or ())
+
+    def __repr__(self) -> str:
+        return f"DeviceSnapshot({dict(self.items())!r})"
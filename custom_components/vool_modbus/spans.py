@@ -0,0 +1,66 @@
+"""Register span helpers for VOOL Modbus integration.
+
+Bulk register access coalesces requested addresses into as few Modbus
+requests as possible, within the protocol's per-request register limits.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import NamedTuple
+
+# Protocol limits per request
+MAX_READ_COUNT = 125
+MAX_WRITE_COUNT = 123
+MAX_ADDRESS = 0xFFFF
+
+
+class Span(NamedTuple):
+    """A run of consecutive registers."""
+
+    address: int
+    count: int
+
+    @property
+    def end(self) -> int:
+        """Return the last register of the span."""
+        return self.address + self.count - 1
+
+    def __str__(self) -> str:
+        return str(self.address) if self.count == 1 else f"{self.address}-{self.end}"
+
+
+def parse_addresses(items: Iterable[int | str]) -> list[int]:
+    """Expand addresses and "first-last" ranges into sorted unique addresses."""
+    addresses: set[int] = set()
+    for item in items:
+        if isinstance(item, int):
+            first = last = item
+        else:
+            first_text, _, last_text = str(item).strip().partition("-")
+            first = int(first_text)
+            last = int(last_text) if last_text else first
+        if not 0 <= first <= last <= MAX_ADDRESS:
+            raise ValueError(f"Invalid register address or range: {item}")
+        addresses.update(range(first, last + 1))
+    return sorted(addresses)
+
+
+def coalesce(addresses: Iterable[int], max_count: int = MAX_READ_COUNT, max_gap: int = 0) -> list[Span]:
+    """Group sorted addresses into spans.
+
+    Addresses at most ``max_gap`` registers apart share a span, so a read may
+    include a few unrequested registers to save a round trip.
+    """
+    spans: list[Span] = []
+    start = previous = None
+    for address in sorted(set(addresses)):
+        if start is None:
+            start = previous = address
+            continue
+        if address - previous - 1 > max_gap or address - start + 1 > max_count:
+            spans.append(Span(start, previous - start + 1))
+            start = address
+        previous = address
+    if start is not None:
+        spans.append(Span(start, previous - start + 1))
+    return spans
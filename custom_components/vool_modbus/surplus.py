@@ -0,0 +1,248 @@
+"""Solar surplus charging for VOOL Modbus integration.
+
+The controller charges from surplus power only. It chooses between one and
+three phases and a current limit from a smoothed surplus estimate, using
+hysteresis bands and minimum dwell times so that clouds passing by do not
+make the charger switch phases back and forth. Phase and current changes are
+written together in one request.
+
+The grid meter sees the charger's own draw, so the surplus is the exported
+power plus what the charger takes. The smoothed estimate is only fed when
+the meter reports a new reading, paired with the charger's latest power:
+sampling a stale meter reading against a fresher charger power on every
+poll would count a change of the charger's own draw as a change in surplus
+while the meter catches up.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import time
+from typing import Any
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN, UnitOfPower
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    PHASES_L1,
+    PHASES_L1_L2_L3,
+    REG_EXTERNAL_CURRENT_LIMIT,
+    SURPLUS_CURRENT_DEADBAND,
+    SURPLUS_HYSTERESIS,
+    SURPLUS_MAX_CURRENT,
+    SURPLUS_MIN_CURRENT,
+    SURPLUS_PHASE_DWELL,
+    SURPLUS_SMOOTHING,
+    SURPLUS_START_DWELL,
+    SURPLUS_VOLTAGE,
+)
+from .coordinator import VoolModbusCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Power needed to charge at the minimum current on one and on three phases
+MIN_POWER_1P = SURPLUS_MIN_CURRENT * SURPLUS_VOLTAGE
+MIN_POWER_3P = 3 * SURPLUS_MIN_CURRENT * SURPLUS_VOLTAGE
+
+
+class VoolSurplusController:
+    """Charge a vehicle from solar surplus with minimal phase switching."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: VoolModbusCoordinator,
+        grid_power_entity: str,
+    ) -> None:
+        """Initialize the controller."""
+        self.hass = hass
+        self._coordinator = coordinator
+        self._slave_id = coordinator.slave_id
+        self._grid_power_entity = grid_power_entity
+        self.enabled = False
+        self.smoothed_surplus: float | None = None
+        self._surplus: float | None = None
+        self.phase_switches = 0
+        self.switches_avoided = 0
+        self._phases = PHASES_L1
+        self._current = 0.0
+        # Set when the last write failed, the next evaluation writes again
+        self._retry = False
+        # Bumped for every write, a failure of an older one does not ask for a retry
+        self._generation = 0
+        self._last_sample: float | None = None
+        self._last_phase_switch = 0.0
+        self._naive_phases: int | None = None
+        # Since when the smoothed surplus has been asking for a change
+        self._pending_since: dict[str, float] = {}
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the controller state for the solar mode switch."""
+        return {
+            "smoothed_surplus": None if self.smoothed_surplus is None else round(self.smoothed_surplus),
+            "phases": 3 if self._phases == PHASES_L1_L2_L3 else 1,
+            "current_limit": self._current,
+            "phase_switches": self.phase_switches,
+            "switches_avoided": self.switches_avoided,
+        }
+
+    @callback
+    def async_start(self) -> None:
+        """Sample every meter reading, evaluate on every coordinator update."""
+        self._unsubs = [
+            async_track_state_change_event(self.hass, [self._grid_power_entity], self._async_meter_changed),
+            self._coordinator.async_add_listener(self._async_evaluate),
+        ]
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop evaluating."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @callback
+    def async_set_enabled(self, enabled: bool) -> None:
+        """Enable or disable surplus charging."""
+        self.enabled = enabled
+        self.smoothed_surplus = None
+        self._surplus = None
+        self._last_sample = None
+        self._pending_since.clear()
+        self._retry = False
+        data = (self._coordinator.data or {}).get(self._slave_id, {})
+        if data.get("external_allowed_phases") in (PHASES_L1, PHASES_L1_L2_L3):
+            self._phases = data["external_allowed_phases"]
+        self._current = data.get("external_current_limit", 0.0)
+
+    def _grid_power(self) -> float | None:
+        """Return the grid power in W, positive when importing."""
+        state = self.hass.states.get(self._grid_power_entity)
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return None
+        try:
+            value = float(state.state)
+        except ValueError:
+            return None
+        if state.attributes.get("unit_of_measurement") == UnitOfPower.KILO_WATT:
+            value *= 1000
+        return value
+
+    def _held(self, key: str, condition: bool, now: float, dwell: float) -> bool:
+        """Return True once a condition has held for the dwell time."""
+        if not condition:
+            self._pending_since.pop(key, None)
+            return False
+        since = self._pending_since.setdefault(key, now)
+        return now - since >= dwell
+
+    @callback
+    def _async_meter_changed(self, event: Event) -> None:
+        """Feed a new meter reading into the surplus estimate."""
+        if self.enabled:
+            self._sample()
+
+    def _sample(self) -> None:
+        """Smooth the surplus of the current meter reading."""
+        data = (self._coordinator.data or {}).get(self._slave_id)
+        grid_power = self._grid_power()
+        if data is None or grid_power is None:
+            return
+
+        # The grid meter includes the charger, add its own draw back before smoothing
+        surplus = (data.get("active_power") or 0.0) * 1000 - grid_power
+        now = time.monotonic()
+        if self.smoothed_surplus is None or self._last_sample is None:
+            self.smoothed_surplus = surplus
+        else:
+            alpha = 1 - math.exp(-(now - self._last_sample) / SURPLUS_SMOOTHING)
+            self.smoothed_surplus += alpha * (surplus - self.smoothed_surplus)
+        self._surplus = surplus
+        self._last_sample = now
+
+    @callback
+    def _async_evaluate(self) -> None:
+        """Adjust the charger to the surplus estimate if needed."""
+        if not self.enabled:
+            return
+        if self.smoothed_surplus is None:
+            # First evaluation after enabling, start from the current reading
+            self._sample()
+        if self.smoothed_surplus is None or self._surplus is None:
+            return
+        surplus = self._surplus
+        smoothed = self.smoothed_surplus
+        now = time.monotonic()
+
+        # What a naive threshold automation would do with the raw surplus
+        naive = PHASES_L1_L2_L3 if surplus >= MIN_POWER_3P else PHASES_L1
+        if self._naive_phases is not None and naive != self._naive_phases and naive != self._phases:
+            self.switches_avoided += 1
+        self._naive_phases = naive
+
+        phases = self._phases
+        dwell_over = now - self._last_phase_switch >= SURPLUS_PHASE_DWELL
+        if phases == PHASES_L1 and self._held(
+            "up", smoothed >= MIN_POWER_3P + SURPLUS_HYSTERESIS, now, SURPLUS_START_DWELL
+        ) and dwell_over:
+            phases = PHASES_L1_L2_L3
+        elif phases == PHASES_L1_L2_L3 and self._held(
+            "down", smoothed < MIN_POWER_3P - SURPLUS_HYSTERESIS, now, SURPLUS_START_DWELL
+        ) and dwell_over:
+            phases = PHASES_L1
+
+        phase_count = 3 if phases == PHASES_L1_L2_L3 else 1
+        current = math.floor(min(smoothed / (phase_count * SURPLUS_VOLTAGE), SURPLUS_MAX_CURRENT) * 10) / 10
+        if current < SURPLUS_MIN_CURRENT:
+            # Pause only when the surplus stays too low, start only when it stays high enough
+            self._pending_since.pop("start", None)
+            if self._current > 0 and not self._held(
+                "stop", smoothed < MIN_POWER_1P - SURPLUS_HYSTERESIS, now, SURPLUS_START_DWELL
+            ):
+                current = SURPLUS_MIN_CURRENT
+            else:
+                current = 0.0
+        else:
+            self._pending_since.pop("stop", None)
+            if self._current == 0 and not self._held("start", True, now, SURPLUS_START_DWELL):
+                current = 0.0
+
+        phase_changed = phases != self._phases
+        if (
+            not phase_changed
+            and not self._retry
+            and abs(current - self._current) < SURPLUS_CURRENT_DEADBAND
+            and (current == 0) == (self._current == 0)
+        ):
+            return
+
+        if phase_changed:
+            self.phase_switches += 1
+            self._last_phase_switch = now
+            self._pending_since.pop("up", None)
+            self._pending_since.pop("down", None)
+        self._phases = phases
+        self._current = current
+        self._retry = False
+        self._generation += 1
+        self.hass.async_create_task(self._async_apply(phases, current, self._generation))
+
+    async def _async_apply(self, phases: int, current: float, generation: int) -> None:
+        """Write current limit (501) and phases (502) in a single request."""
+        _LOGGER.debug(
+            "Surplus charging %s: %.1f A on %s phase(s)",
+            self._coordinator.host,
+            current,
+            3 if phases == PHASES_L1_L2_L3 else 1,
+        )
+        ok = await self._coordinator.async_write_registers(
+            REG_EXTERNAL_CURRENT_LIMIT,
+            [round(current * 100), phases],
+            self._slave_id,
+            refresh=False,
+        )
+        if not ok and generation == self._generation:
+            # Write the target again on the next evaluation
+            self._retry = True
@@ -6,11 +6,14 @@ from typing import Any
 
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_ON
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
 
 from .const import (
     DOMAIN,
+    DEVICE_TYPE_LMC,
     REG_CHARGING_COMMAND,
 )
 from .coordinator import VoolModbusCoordinator
@@ -53,10 +56,19 @@ async def async_setup_entry(
     """Set up VOOL Modbus switches."""
     coordinator: VoolModbusCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities(
-        VoolSwitch(coordinator, description)
+    if coordinator.device_type == DEVICE_TYPE_LMC:
+        # Charging session controls and states only exist on chargers
+        return
+
+    entities: list[SwitchEntity] = [
+        VoolSwitch(coordinator, description, slave_id)
+        for slave_id in coordinator.slave_ids
         for description in CHARGER_SWITCHES
-    )
+    ]
+    if coordinator.surplus is not None:
+        entities.append(VoolSolarModeSwitch(coordinator))
+
+    async_add_entities(entities)
 
 
 class VoolSwitch(VoolModbusEntity, SwitchEntity):
@@ -68,19 +80,20 @@ class VoolSwitch(VoolModbusEntity, SwitchEntity):
         self,
         coordinator: VoolModbusCoordinator,
         description: VoolSwitchEntityDescription,
+        slave_id: int,
     ) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator, description.key)
+        super().__init__(coordinator, description.key, slave_id)
         self.entity_description = description
 
     @property
     def is_on(self) -> bool | None:
         """Return true if the switch is on (charging started)."""
-        if self.coordinator.data is None:
+        if (data := self.device_data) is None:
             return None
         
         # Check if charging command was set to START
-        cmd_value = self.coordinator.data.get(self.entity_description.data_key)
+        cmd_value = data.get(self.entity_description.data_key)
         if cmd_value is None:
             return None
         return cmd_value == self.entity_description.on_value
@@ -88,11 +101,49 @@ class VoolSwitch(VoolModbusEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on (start charging)."""
         await self.coordinator.async_write_register(
-            self.entity_description.register, self.entity_description.on_value
+            self.entity_description.register, self.entity_description.on_value, self._slave_id
         )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the switch off (stop charging)."""
         await self.coordinator.async_write_register(
-            self.entity_description.register, self.entity_description.off_value
+            self.entity_description.register, self.entity_description.off_value, self._slave_id
         )
+
+
+class VoolSolarModeSwitch(VoolModbusEntity, SwitchEntity, RestoreEntity):
+    """Switch that turns solar surplus charging on and off."""
+
+    _attr_translation_key = "solar_mode"
+    _attr_icon = "mdi:solar-power"
+
+    def __init__(self, coordinator: VoolModbusCoordinator) -> None:
+        """Initialize the switch."""
+        super().__init__(coordinator, "solar_mode")
+        self._surplus = coordinator.surplus
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the previous mode."""
+        await super().async_added_to_hass()
+        if (last_state := await self.async_get_last_state()) is not None:
+            self._surplus.async_set_enabled(last_state.state == STATE_ON)
+
+    @property
+    def is_on(self) -> bool:
+        """Return true if surplus charging is enabled."""
+        return self._surplus.enabled
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the surplus controller state."""
+        return self._surplus.extra_state_attributes
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Enable surplus charging."""
+        self._surplus.async_set_enabled(True)
+        self.async_write_ha_state()
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Disable surplus charging, leaving the last limit in place."""
+        self._surplus.async_set_enabled(False)
+        self.async_write_ha_state()
@@ -0,0 +1,131 @@
+"""Live telemetry stream for VOOL Modbus integration.
+
+Subscribers receive decoded status frames at up to a few Hz without going
+through entity states, so the recorder and state machine are never touched.
+The fast polling loop only runs while at least one subscription exists.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .const import TELEMETRY_FIELDS, TELEMETRY_MAX_RATE
+
+if TYPE_CHECKING:
+    from .coordinator import VoolModbusCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _Subscription:
+    """A single telemetry subscriber."""
+
+    slave_id: int
+    fields: tuple[str, ...]
+    interval: float
+    send: Callable[[dict[str, Any]], None]
+    last_sent: float = field(default=0.0)
+
+
+class VoolTelemetryStream:
+    """Poll the fast register group of a coordinator for live subscribers."""
+
+    def __init__(self, coordinator: VoolModbusCoordinator) -> None:
+        """Initialize the stream."""
+        self._coordinator = coordinator
+        self._subscriptions: dict[int, _Subscription] = {}
+        self._ids = itertools.count()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        """Return the number of active subscriptions."""
+        return len(self._subscriptions)
+
+    @callback
+    def async_subscribe(
+        self,
+        slave_id: int,
+        fields: tuple[str, ...],
+        max_rate: float,
+        send: Callable[[dict[str, Any]], None],
+    ) -> CALLBACK_TYPE:
+        """Subscribe to frames of one device. Return a callback to unsubscribe."""
+        sub_id = next(self._ids)
+        rate = min(max(max_rate, 0.1), TELEMETRY_MAX_RATE)
+        self._subscriptions[sub_id] = _Subscription(slave_id, fields, 1 / rate, send)
+
+        if self._task is None or self._task.done():
+            self._task = self._coordinator.hass.async_create_background_task(
+                self._async_run(), f"{self._coordinator.name}_telemetry"
+            )
+
+        @callback
+        def unsubscribe() -> None:
+            self._subscriptions.pop(sub_id, None)
+
+        return unsubscribe
+
+    async def async_stop(self) -> None:
+        """Drop all subscriptions and stop polling."""
+        self._subscriptions.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _async_run(self) -> None:
+        """Poll while there are subscribers."""
+        loop = asyncio.get_running_loop()
+
+        while self._subscriptions:
+            started = loop.time()
+            interval = min(sub.interval for sub in self._subscriptions.values())
+            now = time.time()
+
+            # Only read devices with a subscriber that is due
+            due = {
+                sub.slave_id
+                for sub in self._subscriptions.values()
+                if now - sub.last_sent >= sub.interval * 0.9
+            }
+            for slave_id in due:
+                values = await self._coordinator.async_read_status(slave_id)
+                if values is not None:
+                    self._dispatch(slave_id, values, time.time())
+
+            await asyncio.sleep(max(0.0, interval - (loop.time() - started)))
+
+    def _dispatch(self, slave_id: int, values: dict[str, Any], timestamp: float) -> None:
+        """Send a compact frame to every due subscriber of a device."""
+        for sub in list(self._subscriptions.values()):
+            if sub.slave_id != slave_id or timestamp - sub.last_sent < sub.interval * 0.9:
+                continue
+            sub.last_sent = timestamp
+            # Values are sent in the field order returned on subscribe
+            sub.send({"t": round(timestamp, 3), "v": [_round(values.get(key)) for key in sub.fields]})
+
+
+def _round(value: Any) -> Any:
+    """Trim float noise from decoded values to keep frames small."""
+    if isinstance(value, float):
+        return round(value, 3)
+    return value
+
+
+def validate_fields(fields: list[str] | None) -> tuple[str, ...]:
+    """Return the requested telemetry fields, or all of them."""
+    if not fields:
+        return TELEMETRY_FIELDS
+    return tuple(dict.fromkeys(key for key in fields if key in TELEMETRY_FIELDS))
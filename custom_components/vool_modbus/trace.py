@@ -0,0 +1,291 @@
+"""Modbus trace recording and replay for VOOL Modbus integration.
+
+A recording client wraps the live pymodbus client of a coordinator and logs
+every request, its response and timing. A trace is a JSON Lines file: a
+header line followed by one line per request, for example
+
+    {"t": 0.412, "dt": 0.018, "op": "read_holding_registers", "slave": 1,
+     "address": 100, "count": 12, "registers": [3, 7, ...]}
+
+The replay client answers the same sequence of requests from a trace, either
+in real time, scaled, or as fast as possible. It implements the client calls
+used by pymodbus_compat, so a coordinator created with a replay client
+factory runs its normal decode and update path against recorded traffic.
+A recording starts mid-session, so the header carries the capabilities the
+coordinator had probed and the replay coordinator is seeded with them
+instead of probing.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from pymodbus.exceptions import ModbusException
+
+from .capabilities import DeviceCapabilities
+from .pymodbus_compat import (
+    async_read_holding_registers,
+    async_read_input_registers,
+    async_write_register,
+    async_write_registers,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACE_VERSION = 1
+# Entries are appended to the file in batches of this size
+TRACE_FLUSH_SIZE = 100
+
+
+class TraceMismatchError(ModbusException):
+    """Raised when a replayed request differs from the recorded one."""
+
+
+@dataclass
+class TraceResponse:
+    """A recorded response, shaped like a pymodbus response."""
+
+    registers: list[int] = field(default_factory=list)
+    exception_code: int | None = None
+    error: str | None = None
+
+    def isError(self) -> bool:  # pymodbus API name
+        """Return True if the device answered with an error."""
+        return self.exception_code is not None or self.error is not None
+
+    def __str__(self) -> str:
+        if self.exception_code is not None:
+            return f"Exception Response (code {self.exception_code})"
+        return self.error or f"Response {self.registers}"
+
+
+def _result_fields(result: Any) -> dict[str, Any]:
+    """Return the trace fields of a pymodbus response."""
+    if result.isError():
+        if (code := getattr(result, "exception_code", None)) is not None:
+            return {"exception_code": code}
+        return {"error": str(result)}
+    return {"registers": list(getattr(result, "registers", None) or [])}
+
+
+class TraceRecorder:
+    """Collect trace entries and append them to a file."""
+
+    def __init__(self, path: str, header: dict[str, Any]) -> None:
+        """Initialize the recorder."""
+        self.path = path
+        self._start = time.monotonic()
+        self._pending: list[str] = [json.dumps({"version": TRACE_VERSION, **header})]
+        self.entries = 0
+        self._first_write = True
+
+    def add(self, started: float, **entry: Any) -> None:
+        """Add an entry for a request that started at the monotonic time given."""
+        entry = {
+            "t": round(started - self._start, 4),
+            "dt": round(time.monotonic() - started, 4),
+            **entry,
+        }
+        self._pending.append(json.dumps(entry, separators=(",", ":")))
+        self.entries += 1
+
+    @property
+    def needs_flush(self) -> bool:
+        """Return True once a batch of entries is waiting."""
+        return len(self._pending) >= TRACE_FLUSH_SIZE
+
+    def take(self) -> list[str]:
+        """Return the pending entries and start a new batch."""
+        lines, self._pending = self._pending, []
+        return lines
+
+    def write(self, lines: list[str]) -> None:
+        """Append entries taken from the recorder to the file. Runs in the executor."""
+        if not lines:
+            return
+        with open(self.path, "w" if self._first_write else "a", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+        self._first_write = False
+
+
+class RecordingClient:
+    """Forward requests to a pymodbus client and record them."""
+
+    def __init__(self, client: Any, recorder: TraceRecorder) -> None:
+        """Initialize the recording client."""
+        self.client = client
+        self._recorder = recorder
+
+    async def connect(self) -> bool:
+        """Connect the wrapped client."""
+        started = time.monotonic()
+        connected = await self.client.connect()
+        self._recorder.add(started, op="connect", connected=bool(connected))
+        return connected
+
+    def close(self) -> None:
+        """Close the wrapped client."""
+        self.client.close()
+
+    async def _call(self, op: str, request: dict[str, Any], call: Any) -> Any:
+        started = time.monotonic()
+        try:
+            result = await call
+        except ModbusException as err:
+            self._recorder.add(started, op=op, **request, raised=str(err))
+            raise
+        self._recorder.add(started, op=op, **request, **_result_fields(result))
+        return result
+
+    async def read_holding_registers(self, address: int, count: int = 1, slave: int = 1) -> Any:
+        """Read holding registers."""
+        return await self._call(
+            "read_holding_registers",
+            {"slave": slave, "address": address, "count": count},
+            async_read_holding_registers(self.client, address, count, slave),
+        )
+
+    async def read_input_registers(self, address: int, count: int = 1, slave: int = 1) -> Any:
+        """Read input registers."""
+        return await self._call(
+            "read_input_registers",
+            {"slave": slave, "address": address, "count": count},
+            async_read_input_registers(self.client, address, count, slave),
+        )
+
+    async def write_register(self, address: int, value: int, slave: int = 1) -> Any:
+        """Write a holding register."""
+        return await self._call(
+            "write_register",
+            {"slave": slave, "address": address, "value": value},
+            async_write_register(self.client, address, value, slave),
+        )
+
+    async def write_registers(self, address: int, values: list[int], slave: int = 1) -> Any:
+        """Write consecutive holding registers."""
+        return await self._call(
+            "write_registers",
+            {"slave": slave, "address": address, "values": list(values)},
+            async_write_registers(self.client, address, values, slave),
+        )
+
+
+def load_trace(path: str) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Load a trace file. Return its header and entries."""
+    with open(path, encoding="utf-8") as file:
+        lines = [json.loads(line) for line in file if line.strip()]
+    if not lines or lines[0].get("version") != TRACE_VERSION:
+        raise ValueError(f"{path} is not a VOOL Modbus trace")
+    return lines[0], lines[1:]
+
+
+def trace_capabilities(header: dict[str, Any]) -> dict[int, DeviceCapabilities]:
+    """Return the capabilities recorded in a trace header.
+
+    Probe times are shifted by the age of the trace, so a device is re-probed
+    in the replay exactly when it was due during the recording.
+    """
+    created = header.get("created")
+    age = time.time() - datetime.fromisoformat(created).timestamp() if created else 0.0
+    capabilities: dict[int, DeviceCapabilities] = {}
+    for slave_id, data in header.get("capabilities", {}).items():
+        device = DeviceCapabilities.from_dict(data)
+        device.probed_at += age
+        capabilities[int(slave_id)] = device
+    return capabilities
+
+
+class ReplayClient:
+    """Answer requests from a recorded trace.
+
+    ``speed`` 1.0 replays in real time, larger values replay faster and None
+    replays as fast as possible. Requests must arrive in the recorded order;
+    any difference raises TraceMismatchError, which makes replays usable as
+    regression checks.
+
+    Reconnects continue the replay where it stopped, so the client factory of
+    a coordinator must return one shared instance.
+    """
+
+    def __init__(self, entries: list[dict[str, Any]], speed: float | None = 1.0) -> None:
+        """Initialize the replay client."""
+        self._entries = entries
+        self._position = 0
+        self._speed = speed
+        self._start: float | None = None
+        self.connected = False
+
+    @property
+    def finished(self) -> bool:
+        """Return True once every recorded request was replayed."""
+        return self._position >= len(self._entries)
+
+    async def _next(self, op: str, **request: Any) -> dict[str, Any]:
+        """Return the next recorded entry after checking it matches the request."""
+        if self.finished:
+            raise TraceMismatchError(f"Trace ended, unexpected {op} {request}")
+        entry = self._entries[self._position]
+        recorded = {key: entry.get(key) for key in request}
+        if entry["op"] != op or recorded != request:
+            raise TraceMismatchError(
+                f"Request {self._position} differs from the trace: {op} {request}, recorded {entry['op']} {recorded}"
+            )
+        self._position += 1
+
+        if self._speed:
+            loop = asyncio.get_running_loop()
+            if self._start is None:
+                self._start = loop.time() - entry["t"] / self._speed
+            delay = self._start + (entry["t"] + entry.get("dt", 0.0)) / self._speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        if "raised" in entry:
+            raise ModbusException(entry["raised"])
+        return entry
+
+    async def connect(self) -> bool:
+        """Replay a connection attempt."""
+        if not self.finished and self._entries[self._position]["op"] == "connect":
+            self.connected = (await self._next("connect"))["connected"]
+        else:
+            self.connected = True
+        return self.connected
+
+    def close(self) -> None:
+        """Close the replay client."""
+        self.connected = False
+
+    def _response(self, entry: dict[str, Any]) -> TraceResponse:
+        return TraceResponse(
+            registers=entry.get("registers", []),
+            exception_code=entry.get("exception_code"),
+            error=entry.get("error"),
+        )
+
+    async def read_holding_registers(self, address: int, count: int = 1, slave: int = 1) -> TraceResponse:
+        """Replay a holding register read."""
+        return self._response(
+            await self._next("read_holding_registers", slave=slave, address=address, count=count)
+        )
+
+    async def read_input_registers(self, address: int, count: int = 1, slave: int = 1) -> TraceResponse:
+        """Replay an input register read."""
+        return self._response(
+            await self._next("read_input_registers", slave=slave, address=address, count=count)
+        )
+
+    async def write_register(self, address: int, value: int, slave: int = 1) -> TraceResponse:
+        """Replay a register write."""
+        return self._response(await self._next("write_register", slave=slave, address=address, value=value))
+
+    async def write_registers(self, address: int, values: list[int], slave: int = 1) -> TraceResponse:
+        """Replay a multiple register write."""
+        return self._response(
+            await self._next("write_registers", slave=slave, address=address, values=list(values))
+        )
@@ -0,0 +1,107 @@
+"""Modbus transports for VOOL Modbus integration.
+
+A device is reached over Modbus TCP, or through an RS-485 to Ethernet
+converter that forwards Modbus RTU frames over a TCP socket (RTU-over-TCP).
+On the second transport pymodbus' RTU framer builds the frames: slave ID,
+PDU and CRC-16 instead of the MBAP header.
+
+Behind such a converter every device shares one half-duplex serial bus.
+Requests are already serialised by the coordinator's bus lock; a paced
+client additionally keeps the bus silent for 3.5 character times plus the
+converter's turnaround between frames, and longer after a request that went
+unanswered, so a late response is not taken for the answer to the next
+request, which carries no transaction ID to tell them apart.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from typing import Any
+
+from .const import (
+    RTU_CHARACTER_BITS,
+    RTU_FIXED_GAP,
+    RTU_FIXED_GAP_BAUDRATE,
+    RTU_MAX_FRAME,
+    RTU_MAX_READ_GAP,
+    RTU_TURNAROUND,
+    TRANSPORT_RTU_OVER_TCP,
+)
+from .pymodbus_compat import MODBUS_CALLS, rtu_framer
+
+# Bytes of a read request, and of a read response besides the registers
+RTU_READ_REQUEST = 8
+RTU_READ_RESPONSE = 5
+
+
+def character_time(baudrate: int) -> float:
+    """Return the seconds one character takes on the serial bus."""
+    return RTU_CHARACTER_BITS / baudrate
+
+
+def frame_gap(baudrate: int) -> float:
+    """Return the silence in seconds to keep between two frames."""
+    if baudrate > RTU_FIXED_GAP_BAUDRATE:
+        return RTU_FIXED_GAP + RTU_TURNAROUND
+    return 3.5 * character_time(baudrate) + RTU_TURNAROUND
+
+
+def read_gap(baudrate: int) -> int:
+    """Return how many unrequested registers are cheaper to read than a frame.
+
+    A separate read costs a request, a response header and CRC and two gaps
+    on the bus, each register read along costs two bytes.
+    """
+    overhead = RTU_READ_REQUEST + RTU_READ_RESPONSE + 2 * frame_gap(baudrate) / character_time(baudrate)
+    return min(int(overhead // 2), RTU_MAX_READ_GAP)
+
+
+def create_client(host: str, port: int, timeout: float, transport: str, baudrate: int) -> Any:
+    """Create the pymodbus client of a transport."""
+    from pymodbus.client import AsyncModbusTcpClient
+
+    if transport != TRANSPORT_RTU_OVER_TCP:
+        return AsyncModbusTcpClient(host=host, port=port, timeout=timeout)
+    client = AsyncModbusTcpClient(host=host, port=port, timeout=timeout, framer=rtu_framer())
+    return PacedClient(client, baudrate)
+
+
+class PacedClient:
+    """Keep the serial bus silent between frames, delegate everything else."""
+
+    def __init__(self, client: Any, baudrate: int) -> None:
+        """Initialize the paced client."""
+        self.client = client
+        self._gap = frame_gap(baudrate)
+        # Long enough for the largest frame to arrive late and be discarded
+        self._recovery = self._gap + RTU_MAX_FRAME * character_time(baudrate)
+        # Monotonic time the next frame may be sent at
+        self._ready = 0.0
+        for name in MODBUS_CALLS:
+            if (method := getattr(client, name, None)) is not None:
+                setattr(self, name, self._pace(method))
+
+    def _pace(self, method: Callable[..., Any]) -> Callable[..., Any]:
+        """Return a version of a pymodbus client call that waits for the bus."""
+
+        async def paced(*args: Any, **kwargs: Any) -> Any:
+            if (delay := self._ready - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            try:
+                result = await method(*args, **kwargs)
+            except TypeError:
+                # Signature probing of pymodbus_compat, nothing was sent
+                raise
+            except Exception:
+                self._ready = time.monotonic() + self._recovery
+                raise
+            # An error without exception code is a timeout or a garbled frame
+            answered = not result.isError() or getattr(result, "exception_code", None) is not None
+            self._ready = time.monotonic() + (self._gap if answered else self._recovery)
+            return result
+
+        return paced
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
@@ -0,0 +1,115 @@
+"""Websocket API for VOOL Modbus integration."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    HISTORY_FIELDS,
+    HISTORY_TIERS,
+    TELEMETRY_FIELDS,
+    TELEMETRY_MAX_RATE,
+)
+from .coordinator import VoolModbusCoordinator
+from .history import TIER_RAW
+from .telemetry import validate_fields
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe_telemetry)
+    websocket_api.async_register_command(hass, ws_history)
+
+
+def _get_coordinator(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> VoolModbusCoordinator | None:
+    """Return the coordinator of the requested entry or send an error."""
+    coordinator: VoolModbusCoordinator | None = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not loaded")
+        return None
+
+    slave_id = msg.get("slave_id", coordinator.slave_id)
+    if slave_id not in coordinator.slave_ids:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, f"Unknown slave ID {slave_id}")
+        return None
+
+    return coordinator
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_telemetry",
+        vol.Required("entry_id"): str,
+        vol.Optional("slave_id"): vol.Coerce(int),
+        vol.Optional("fields"): [vol.In(TELEMETRY_FIELDS)],
+        vol.Optional("max_rate", default=2.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=TELEMETRY_MAX_RATE)
+        ),
+    }
+)
+@callback
+def ws_subscribe_telemetry(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Stream live status frames of a device.
+
+    The result lists the fields; every event carries a timestamp ``t`` and the
+    values ``v`` in that order.
+    """
+    if (coordinator := _get_coordinator(hass, connection, msg)) is None:
+        return
+
+    fields = validate_fields(msg.get("fields"))
+
+    @callback
+    def send_frame(frame: dict[str, Any]) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], frame))
+
+    connection.subscriptions[msg["id"]] = coordinator.telemetry.async_subscribe(
+        msg.get("slave_id", coordinator.slave_id),
+        fields,
+        msg["max_rate"],
+        send_frame,
+    )
+    connection.send_result(msg["id"], {"fields": list(fields)})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/history",
+        vol.Required("entry_id"): str,
+        vol.Optional("slave_id"): vol.Coerce(int),
+        vol.Optional("fields"): [vol.In(HISTORY_FIELDS)],
+        vol.Optional("resolution"): vol.In([TIER_RAW, *(name for name, _, _ in HISTORY_TIERS)]),
+        # Unix timestamps in seconds
+        vol.Optional("start"): vol.Coerce(float),
+        vol.Optional("end"): vol.Coerce(float),
+    }
+)
+@callback
+def ws_history(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return the in-memory history of a device.
+
+    Without a resolution the finest one still reaching back to ``start`` is
+    used. The result has the bucket start times ``t`` and per field the
+    samples (raw) or ``min``, ``max`` and ``avg`` lists in the same order.
+    """
+    if (coordinator := _get_coordinator(hass, connection, msg)) is None:
+        return
+
+    history = coordinator.history[msg.get("slave_id", coordinator.slave_id)]
+    end = msg.get("end", dt_util.utcnow().timestamp())
+    start = msg.get("start", end - 3600)
+    fields = tuple(dict.fromkeys(msg.get("fields") or HISTORY_FIELDS))
+    resolution = msg.get("resolution") or history.resolution(start)
+    connection.send_result(msg["id"], history.query(resolution, fields, start, end))